@@ -0,0 +1,250 @@
+"""
+Synthetic ActiGraph RAW.csv files at realistic sizes.
+
+Files follow the ActiLife "RAW with timestamps" export that GGIR reads: a
+10-line header (sample rate in the first line, start time/date, serial),
+a column line, then one `M/d/yyyy HH:MM:SS.fff,x,y,z` row per sample in g
+with three decimals.
+
+Rows are produced one block (default one hour) at a time without a Python
+loop per sample: every field is looked up in a NUL-padded byte table, the
+fields are stacked into a 2-D uint8 array and the padding is dropped, which
+leaves ordinary variable-width CSV text. A week at 100 Hz (~60M rows, ~2.5 GB)
+writes in about half a minute on one core.
+"""
+import argparse
+import functools
+import hashlib
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+
+HEADER_LINES = 10
+COLUMNS = ("Timestamp", "Accelerometer X", "Accelerometer Y", "Accelerometer Z")
+DYNAMIC_RANGE_MG = 8000
+DEFAULT_SAMPLE_RATE = 30
+DEFAULT_BLOCK_SECONDS = 3600
+_VALUE_WIDTH = 6  # "-7.999"
+_COMMA = ord(",")
+_NEWLINE = ord("\n")
+
+
+def actigraph_header(start, sample_rate, serial="MOS2E22180349", download=None):
+    """Return the 10 ActiLife header lines plus the column line as text."""
+    download = download or start
+    return "\n".join(
+        [
+            "------------ Data File Created By ActiGraph GT3X+ ActiLife v6.13.4 "
+            f"Firmware v1.9.2 date format M/d/yyyy at {sample_rate} Hz  Filter Normal -----------",
+            f"Serial Number: {serial}",
+            f"Start Time {start:%H:%M:%S}",
+            f"Start Date {start.month}/{start.day}/{start.year}",
+            "Epoch Period (hh:mm:ss) 00:00:00",
+            f"Download Time {download:%H:%M:%S}",
+            f"Download Date {download.month}/{download.day}/{download.year}",
+            "Current Memory Address: 0",
+            "Current Battery Voltage: 4.22     Mode = 12",
+            "--------------------------------------------------",
+            ",".join(COLUMNS),
+        ]
+    ) + "\n"
+
+
+@functools.lru_cache(maxsize=1)
+def _value_table():
+    """uint8[n, 6] of NUL-padded "%.3f" strings for every milli-g value in range."""
+    values = np.arange(-DYNAMIC_RANGE_MG, DYNAMIC_RANGE_MG + 1)
+    text = np.array([f"{value / 1000:.3f}" for value in values], dtype=f"S{_VALUE_WIDTH}")
+    return text.view(np.uint8).reshape(len(values), _VALUE_WIDTH)
+
+
+def _fraction_table(sample_rate):
+    text = np.array(
+        [f".{round(index * 1000 / sample_rate):03d}" for index in range(sample_rate)], dtype="S4"
+    )
+    return text.view(np.uint8).reshape(sample_rate, 4)
+
+
+def _second_table(start, n_seconds):
+    # One strftime per second rather than per sample; the width varies with
+    # M/d, so NUL padding is stripped with the rest.
+    text = np.array(
+        [
+            f"{moment.month}/{moment.day}/{moment.year} {moment:%H:%M:%S}"
+            for moment in (start + timedelta(seconds=offset) for offset in range(n_seconds))
+        ],
+        dtype="S19",
+    )
+    return text.view(np.uint8).reshape(n_seconds, 19)
+
+
+def random_nonwear(days, count=2, min_hours=1.0, max_hours=6.0, seed=0):
+    """Non-overlapping (offset_hours, duration_hours) gaps spread across the recording."""
+    rng = np.random.default_rng(seed)
+    span = days * 24.0
+    slots = np.linspace(0.0, span, count + 1)
+    gaps = []
+    for low, high in zip(slots[:-1], slots[1:]):
+        duration = float(min(rng.uniform(min_hours, max_hours), (high - low) / 2))
+        offset = float(rng.uniform(low, high - duration))
+        gaps.append((round(offset, 3), round(duration, 3)))
+    return tuple(gaps)
+
+
+def _block_signal(rng, block_start_s, n_samples, sample_rate, start, nonwear_s, offset, scale):
+    """Return int16[n, 3] milli-g samples for one block."""
+    t = block_start_s + np.arange(n_samples) / sample_rate
+
+    # Posture: a gravity direction held for a minute at a time.
+    minutes = (t // 60).astype(np.int64)
+    first_minute = minutes[0]
+    n_minutes = int(minutes[-1] - first_minute) + 1
+    posture = rng.normal(0.0, 0.5, size=(n_minutes, 3)) + (0.0, 0.0, 1.0)
+    posture /= np.linalg.norm(posture, axis=1, keepdims=True)
+    signal = posture[minutes - first_minute]
+
+    # Activity: movement during the day, near-still at night.
+    hours = (start.hour + start.minute / 60 + t / 3600) % 24
+    amplitude = np.where((hours >= 7) & (hours < 22), 0.25, 0.02)
+    signal += rng.standard_normal((n_samples, 3)) * amplitude[:, None]
+
+    # Non-wear: device lies flat with only sensor noise (below GGIR's SD threshold).
+    worn = np.ones(n_samples, dtype=bool)
+    for gap_start, gap_end in nonwear_s:
+        worn &= ~((t >= gap_start) & (t < gap_end))
+    if not worn.all():
+        idle = ~worn
+        signal[idle] = (0.0, 0.0, 1.0)
+        signal[idle] += rng.normal(0.0, 0.003, size=(int(idle.sum()), 3))
+
+    signal = signal * scale + offset
+    milli_g = np.rint(signal * 1000.0)
+    np.clip(milli_g, -DYNAMIC_RANGE_MG, DYNAMIC_RANGE_MG, out=milli_g)
+    return milli_g.astype(np.int16)
+
+
+def _format_block(milli_g, seconds, second_index, fractions, sub_index):
+    n_samples = len(milli_g)
+    table = _value_table()
+    comma = np.full((n_samples, 1), _COMMA, dtype=np.uint8)
+    newline = np.full((n_samples, 1), _NEWLINE, dtype=np.uint8)
+    rows = np.concatenate(
+        [
+            seconds[second_index],
+            fractions[sub_index],
+            comma,
+            table[milli_g[:, 0] + DYNAMIC_RANGE_MG],
+            comma,
+            table[milli_g[:, 1] + DYNAMIC_RANGE_MG],
+            comma,
+            table[milli_g[:, 2] + DYNAMIC_RANGE_MG],
+            newline,
+        ],
+        axis=1,
+    ).ravel()
+    return rows[rows != 0].tobytes()
+
+
+def write_raw_csv(
+    path,
+    start=datetime(2025, 3, 1, 10, 0, 0),
+    days=7,
+    sample_rate=DEFAULT_SAMPLE_RATE,
+    nonwear=(),
+    calibration_offset=(0.0, 0.0, 0.0),
+    calibration_scale=(1.0, 1.0, 1.0),
+    seed=0,
+    block_seconds=DEFAULT_BLOCK_SECONDS,
+    digest=False,
+):
+    """
+    Write an ActiGraph RAW.csv.
+
+    Args:
+        days (float): recording length; fractional days are allowed for small fixtures.
+        sample_rate (int): samples per second (ActiGraph devices record at 30-100 Hz).
+        nonwear: (offset_hours, duration_hours) gaps from the start, see random_nonwear().
+        calibration_offset/calibration_scale: per-axis error applied as
+            scale * true + offset, for exercising GGIR auto-calibration.
+        digest (bool): also return the SHA-256 of the written file.
+
+    Returns:
+        dict: {"path", "samples", "bytes", "sample_rate", "sha256"}
+    """
+    sample_rate = int(sample_rate)
+    if sample_rate <= 0:
+        raise ValueError("sample_rate must be positive")
+    total_seconds = int(round(days * 86400))
+    nonwear_s = [
+        (offset_h * 3600.0, (offset_h + duration_h) * 3600.0) for offset_h, duration_h in nonwear
+    ]
+    offset = np.asarray(calibration_offset, dtype=float)
+    scale = np.asarray(calibration_scale, dtype=float)
+    rng = np.random.default_rng(seed)
+    fractions = _fraction_table(sample_rate)
+    hasher = hashlib.sha256() if digest else None
+
+    written = 0
+    directory = os.path.dirname(os.fspath(path))
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as handle:
+        header = actigraph_header(start, sample_rate).encode("ascii")
+        handle.write(header)
+        written += len(header)
+        if hasher is not None:
+            hasher.update(header)
+
+        for block_start in range(0, total_seconds, block_seconds):
+            n_seconds = min(block_seconds, total_seconds - block_start)
+            n_samples = n_seconds * sample_rate
+            sample = np.arange(n_samples)
+            milli_g = _block_signal(
+                rng, block_start, n_samples, sample_rate, start, nonwear_s, offset, scale
+            )
+            chunk = _format_block(
+                milli_g,
+                _second_table(start + timedelta(seconds=block_start), n_seconds),
+                sample // sample_rate,
+                fractions,
+                sample % sample_rate,
+            )
+            handle.write(chunk)
+            written += len(chunk)
+            if hasher is not None:
+                hasher.update(chunk)
+
+    return {
+        "path": os.fspath(path),
+        "samples": total_seconds * sample_rate,
+        "bytes": written,
+        "sample_rate": sample_rate,
+        "sha256": hasher.hexdigest() if hasher is not None else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--days", type=float, default=7)
+    parser.add_argument("--sample-rate", type=int, default=DEFAULT_SAMPLE_RATE)
+    parser.add_argument("--nonwear-gaps", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    result = write_raw_csv(
+        args.path,
+        days=args.days,
+        sample_rate=args.sample_rate,
+        nonwear=random_nonwear(args.days, args.nonwear_gaps, seed=args.seed)
+        if args.nonwear_gaps
+        else (),
+        seed=args.seed,
+    )
+    print(f"{result['path']}: {result['samples']} samples, {result['bytes']} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
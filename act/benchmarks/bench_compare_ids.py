@@ -0,0 +1,118 @@
+"""
+Benchmark the REDCap<->RDSS join in ID_COMPARISONS.compare_ids.
+
+Usage:
+    python -m act.benchmarks.bench_compare_ids --files 10000 --subjects 2500
+
+Builds a synthetic report and RDSS listing, runs the previous per-row
+iterrows() scan and the merge-based join, checks both produce identical
+matches, and prints the timings.
+"""
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+from act.utils.comparison_utils import ID_COMPARISONS
+
+
+def build_inputs(n_files, n_subjects, seed=0):
+    """Return (report, rdss) DataFrames shaped like _return_report/_rdss_file_list output."""
+    rng = random.Random(seed)
+    lab_ids = [str(1000 + index) for index in range(n_subjects)]
+    report = pd.DataFrame(
+        {
+            "lab_id": [int(lab_id) for lab_id in lab_ids],
+            "boost_id": [
+                (8000 if index % 2 else 7000) + index for index in range(n_subjects)
+            ],
+        }
+    )
+
+    start = date(2024, 8, 5)
+    rows = []
+    for index in range(n_files):
+        # ~10% of files belong to lab IDs absent from the report.
+        if rng.random() < 0.1:
+            lab_id = str(90000 + index)
+        else:
+            lab_id = rng.choice(lab_ids)
+        file_date = start + timedelta(days=rng.randrange(600))
+        rows.append(
+            {
+                "ID": lab_id,
+                "Date": file_date.isoformat(),
+                "filename": f"{lab_id} ({file_date.isoformat()})RAW.csv",
+            }
+        )
+    rdss = pd.DataFrame(rows)
+    rdss["Date"] = pd.to_datetime(rdss["Date"])
+    return report, rdss
+
+
+def legacy_match(report, rdss):
+    """The pre-vectorization compare_ids loop, kept verbatim for comparison."""
+    result = {}
+    for _, row in report.iterrows():
+        boost_id = str(row["boost_id"])
+        lab_id = str(row["lab_id"])
+        rdss_matches = rdss[rdss["ID"] == lab_id]
+        if not rdss_matches.empty:
+            if boost_id not in result:
+                result[boost_id] = []
+            for _, match_row in rdss_matches.iterrows():
+                result[boost_id].append(
+                    {
+                        "filename": match_row["filename"],
+                        "labID": lab_id,
+                        "date": match_row["Date"],
+                    }
+                )
+    return result
+
+
+def _time(func, *args):
+    start = time.perf_counter()
+    value = func(*args)
+    return value, time.perf_counter() - start
+
+
+def run_benchmark(n_files, n_subjects, seed=0):
+    report, rdss = build_inputs(n_files, n_subjects, seed=seed)
+    legacy, legacy_seconds = _time(legacy_match, report, rdss)
+    vectorized, vectorized_seconds = _time(
+        ID_COMPARISONS._match_report_to_rdss, report, rdss
+    )
+    identical = list(legacy.items()) == list(vectorized.items())
+    if not identical:
+        raise AssertionError("vectorized compare_ids join diverged from legacy output")
+
+    return {
+        "files": n_files,
+        "subjects": n_subjects,
+        "matched_subjects": len(vectorized),
+        "legacy_seconds": round(legacy_seconds, 4),
+        "vectorized_seconds": round(vectorized_seconds, 4),
+        "speedup": round(legacy_seconds / vectorized_seconds, 1)
+        if vectorized_seconds
+        else None,
+        "identical": identical,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--subjects", type=int, default=2500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run_benchmark(args.files, args.subjects, args.seed), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
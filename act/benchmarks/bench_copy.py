@@ -0,0 +1,131 @@
+"""
+Throughput benchmark for the RDSS->LSS copy engine.
+
+Usage:
+    python -m act.benchmarks.bench_copy --size-mb 2048 --repeat 3 --workdir /mnt/lss/scratch
+    python -m act.benchmarks.bench_copy --raw-days 7 --sample-rate 100 --workdir /mnt/lss/scratch
+
+Point --workdir (and optionally --dest-dir) at the mounts you care about;
+copy_file_range only turns into an NFSv4.2 server-side copy when both ends
+live on the same NFS export. --raw-days copies a synthetic ActiGraph RAW.csv
+(see act.benchmarks.actigraph_raw) instead of random bytes.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from act.benchmarks.actigraph_raw import DEFAULT_SAMPLE_RATE, write_raw_csv
+from act.utils.copy_engine import available_strategies, copy_file
+
+_BLOCK = 4 * 1024 * 1024
+
+
+def write_synthetic_file(path, size_bytes):
+    """Write size_bytes of incompressible data so page-cache tricks don't flatter results."""
+    block = os.urandom(_BLOCK)
+    remaining = size_bytes
+    with open(path, "wb") as handle:
+        while remaining > 0:
+            chunk = block[: min(remaining, _BLOCK)]
+            handle.write(chunk)
+            remaining -= len(chunk)
+    return path
+
+
+def _drop_page_cache(path):
+    if not hasattr(os, "posix_fadvise"):
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def run_benchmark(
+    size_mb,
+    repeat,
+    workdir=None,
+    dest_dir=None,
+    strategies=None,
+    raw_days=None,
+    sample_rate=DEFAULT_SAMPLE_RATE,
+):
+    strategies = tuple(strategies or available_strategies())
+    source_dir = tempfile.mkdtemp(prefix="bench-copy-src-", dir=workdir)
+    target_dir = tempfile.mkdtemp(prefix="bench-copy-dst-", dir=dest_dir or workdir)
+
+    results = []
+    try:
+        source_path = os.path.join(source_dir, "9999 (2025-01-01)RAW.csv")
+        if raw_days:
+            size_bytes = write_raw_csv(source_path, days=raw_days, sample_rate=sample_rate)["bytes"]
+        else:
+            size_bytes = int(size_mb * 1024 * 1024)
+            write_synthetic_file(source_path, size_bytes)
+        size_mb = size_bytes / (1024 * 1024)
+        for strategy in strategies + ("shutil.copy2",):
+            timings = []
+            for attempt in range(repeat):
+                destination_path = os.path.join(target_dir, f"{attempt}-{strategy}.csv")
+                _drop_page_cache(source_path)
+                start = time.perf_counter()
+                if strategy == "shutil.copy2":
+                    shutil.copy2(source_path, destination_path)
+                else:
+                    copy_file(source_path, destination_path, strategy=strategy)
+                timings.append(time.perf_counter() - start)
+                os.remove(destination_path)
+
+            best = min(timings)
+            results.append(
+                {
+                    "strategy": strategy,
+                    "size_bytes": size_bytes,
+                    "best_seconds": round(best, 4),
+                    "mean_seconds": round(sum(timings) / len(timings), 4),
+                    "best_mb_per_s": round(size_mb / best, 1) if best else None,
+                }
+            )
+    finally:
+        shutil.rmtree(source_dir, ignore_errors=True)
+        shutil.rmtree(target_dir, ignore_errors=True)
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=512)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workdir", default=None)
+    parser.add_argument("--dest-dir", default=None)
+    parser.add_argument("--json", dest="json_path", default=None)
+    parser.add_argument("--raw-days", type=float, default=None)
+    parser.add_argument("--sample-rate", type=int, default=DEFAULT_SAMPLE_RATE)
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(
+        args.size_mb,
+        args.repeat,
+        args.workdir,
+        args.dest_dir,
+        raw_days=args.raw_days,
+        sample_rate=args.sample_rate,
+    )
+    for row in results:
+        print(
+            f"{row['strategy']:>16}  best={row['best_seconds']:.3f}s  "
+            f"mean={row['mean_seconds']:.3f}s  {row['best_mb_per_s']} MB/s"
+        )
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
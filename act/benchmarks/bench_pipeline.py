@@ -0,0 +1,360 @@
+"""
+Scaling benchmarks for the ingest pipeline on synthetic RDSS/LSS trees.
+
+Usage:
+    python -m act.benchmarks.bench_pipeline --subjects 100 1000 10000
+    python -m act.benchmarks.bench_pipeline --subjects 1000 --stages compare_ids discover \\
+        --workdir /mnt/lss/scratch --fail-on-regression
+
+For every scale a fresh tree is generated (see act.benchmarks.synthetic) and
+each stage is timed against it: compare_ids (cold and with the RDSS listing
+cache), Save.save (cold ingest and a no-op re-run), discover_lss_sessions
+(cold and with the LSS index), rebuild_manifest_payload_from_lss,
+reconcile_manifest (stat and full tiers) and QC.qc. REDCap is served from a
+seeded offline report cache, so no network access is needed.
+
+Each run is appended as one JSON line to --results and compared with the
+most recent earlier run of the same host and parameters; stages that slowed
+down by more than --regression-threshold are reported.
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from act.benchmarks import synthetic
+from act.utils.comparison_utils import ID_COMPARISONS
+from act.utils.report_cache import ReportCache
+from act.utils.save import Save
+
+STAGES = (
+    "compare_ids",
+    "save",
+    "discover",
+    "rebuild",
+    "reconcile",
+    "qc",
+)
+DEFAULT_RESULTS_PATH = os.path.join("act", "benchmarks", "results", "pipeline.jsonl")
+DEFAULT_REGRESSION_THRESHOLD = 1.25
+# Stages faster than this are too noisy to flag.
+REGRESSION_NOISE_FLOOR_SECONDS = 0.05
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    value = func(*args, **kwargs)
+    return value, round(time.perf_counter() - start, 4)
+
+
+def _make_save(tree, ingest_workers=1):
+    return Save(
+        intdir=tree["int_dir"],
+        obsdir=tree["obs_dir"],
+        rdssdir=tree["rdss_dir"],
+        token=synthetic.BENCH_TOKEN,
+        daysago=None,
+        symlink=False,
+        manifest_path=tree["manifest_path"],
+        ingest_workers=ingest_workers,
+        offline=True,
+    )
+
+
+def bench_compare_ids(tree):
+    def compare():
+        return ID_COMPARISONS(
+            rdss_dir=tree["rdss_dir"],
+            token=synthetic.BENCH_TOKEN,
+            daysago=None,
+            listing_cache_path=os.path.join(tree["res_dir"], "rdss_listing.json"),
+            report_cache=ReportCache(cache_dir=tree["res_dir"]),
+            offline=True,
+        ).compare_ids()
+
+    result, cold = _timed(compare)
+    _, warm = _timed(compare)
+    return {
+        "compare_ids": {"seconds": cold, "matched_subjects": len(result["matches"])},
+        "compare_ids_warm": {"seconds": warm},
+    }
+
+
+def bench_save(tree, ingest_workers=1):
+    save, init_seconds = _timed(_make_save, tree, ingest_workers)
+    matched, cold = _timed(save.save)
+    _, noop = _timed(_make_save(tree, ingest_workers).save)
+    return {
+        "save_init": {"seconds": init_seconds},
+        "save": {
+            "seconds": cold,
+            "subjects": len(matched),
+            "sessions": sum(len(records) for records in matched.values()),
+        },
+        "save_noop": {"seconds": noop},
+    }
+
+
+def bench_discover(tree):
+    save = _make_save(tree)
+    (discovered, conflicts), cold = _timed(save.discover_lss_sessions)
+    _, warm = _timed(save.discover_lss_sessions)
+    return {
+        "discover": {
+            "seconds": cold,
+            "subjects": len(discovered),
+            "conflicts": len(conflicts),
+        },
+        "discover_warm": {"seconds": warm},
+    }
+
+
+def bench_rebuild(tree):
+    payload, seconds = _timed(_make_save(tree).rebuild_manifest_payload_from_lss)
+    return {"rebuild": {"seconds": seconds, "subjects": len(payload)}}
+
+
+def bench_reconcile(tree, workers=1):
+    results = {}
+    for verify in ("stat", "full"):
+        report, seconds = _timed(
+            _make_save(tree).reconcile_manifest, verify=verify, workers=workers
+        )
+        results[f"reconcile_{verify}"] = {
+            "seconds": seconds,
+            "records": report["total_records"],
+            "bytes_read": report["bytes_read"],
+            "errors": len(report.get("errors", [])),
+        }
+    return results
+
+
+def bench_qc(tree):
+    try:
+        from act.utils.qc import QC
+    except ImportError as exc:
+        return {"qc": {"skipped": f"{type(exc).__name__}: {exc}"}}
+
+    derivatives_root = os.path.join(tree["root"], "ggir", "obs", synthetic.GGIR_DERIVATIVES)
+    sessions = synthetic.write_ggir_outputs(derivatives_root, tree["subjects"], "obs")
+    runner = QC("obs", system="local")
+    runner.base_dir = derivatives_root
+    runner.csv_path = os.path.join(tree["root"], "act", "logs", "GGIR_QC_errs.csv")
+    os.makedirs(os.path.dirname(runner.csv_path), exist_ok=True)
+
+    # QC writes plots and the plot index relative to the working directory.
+    previous_cwd = os.getcwd()
+    os.chdir(tree["root"])
+    try:
+        _, seconds = _timed(runner.qc)
+    finally:
+        os.chdir(previous_cwd)
+    return {"qc": {"seconds": seconds, "sessions": sessions}}
+
+
+def run_scale(n_subjects, stages=STAGES, workdir=None, sessions_per_subject=2, file_bytes=synthetic.DEFAULT_FILE_BYTES, workers=1, seed=0):
+    """Build trees for one scale, time the selected stages and clean up."""
+    root = tempfile.mkdtemp(prefix=f"bench-pipeline-{n_subjects}-", dir=workdir)
+    results = {}
+    try:
+        started = time.perf_counter()
+        tree = synthetic.build_tree(
+            os.path.join(root, "ingested"),
+            n_subjects,
+            sessions_per_subject=sessions_per_subject,
+            file_bytes=file_bytes,
+            seed=seed,
+        )
+        results["generate"] = {
+            "seconds": round(time.perf_counter() - started, 4),
+            "rdss_files": tree["rdss_files"],
+        }
+
+        if "compare_ids" in stages:
+            results.update(bench_compare_ids(tree))
+        if "save" in stages:
+            cold_tree = synthetic.build_tree(
+                os.path.join(root, "cold"),
+                n_subjects,
+                sessions_per_subject=sessions_per_subject,
+                file_bytes=file_bytes,
+                seed=seed,
+                ingested=False,
+            )
+            results.update(bench_save(cold_tree, ingest_workers=workers))
+        if "discover" in stages:
+            results.update(bench_discover(tree))
+        if "rebuild" in stages:
+            results.update(bench_rebuild(tree))
+        if "reconcile" in stages:
+            results.update(bench_reconcile(tree, workers=workers))
+        if "qc" in stages:
+            results.update(bench_qc(tree))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    return {"subjects": n_subjects, "stages": results}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=10,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmark(scales, stages=STAGES, workdir=None, sessions_per_subject=2, file_bytes=synthetic.DEFAULT_FILE_BYTES, workers=1, seed=0):
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "host": socket.gethostname(),
+        "python": platform.python_version(),
+        "parameters": {
+            "sessions_per_subject": sessions_per_subject,
+            "file_bytes": file_bytes,
+            "workers": workers,
+            "seed": seed,
+        },
+        "scales": [
+            run_scale(
+                n_subjects,
+                stages=stages,
+                workdir=workdir,
+                sessions_per_subject=sessions_per_subject,
+                file_bytes=file_bytes,
+                workers=workers,
+                seed=seed,
+            )
+            for n_subjects in scales
+        ],
+    }
+
+
+def load_history(path):
+    runs = []
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    runs.append(json.loads(line))
+    except FileNotFoundError:
+        pass
+    return runs
+
+
+def append_result(path, run):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write(json.dumps(run) + "\n")
+    return path
+
+
+def find_regressions(run, history, threshold=DEFAULT_REGRESSION_THRESHOLD):
+    """
+    Compare run with the latest earlier run on the same host and parameters.
+
+    Returns:
+        tuple: (baseline run or None, [{"subjects", "stage", "baseline_s", "current_s", "ratio"}])
+    """
+    baseline = next(
+        (
+            previous
+            for previous in reversed(history)
+            if previous.get("host") == run.get("host")
+            and previous.get("parameters") == run.get("parameters")
+        ),
+        None,
+    )
+    if baseline is None:
+        return None, []
+
+    baseline_scales = {entry["subjects"]: entry["stages"] for entry in baseline.get("scales", [])}
+    regressions = []
+    for entry in run["scales"]:
+        previous_stages = baseline_scales.get(entry["subjects"], {})
+        for stage, current in entry["stages"].items():
+            previous = previous_stages.get(stage, {})
+            current_s, baseline_s = current.get("seconds"), previous.get("seconds")
+            if current_s is None or not baseline_s:
+                continue
+            if current_s < REGRESSION_NOISE_FLOOR_SECONDS:
+                continue
+            ratio = current_s / baseline_s
+            if ratio > threshold:
+                regressions.append(
+                    {
+                        "subjects": entry["subjects"],
+                        "stage": stage,
+                        "baseline_s": baseline_s,
+                        "current_s": current_s,
+                        "ratio": round(ratio, 2),
+                    }
+                )
+    return baseline, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--subjects", type=int, nargs="+", default=list(synthetic.SCALES))
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--sessions-per-subject", type=int, default=2)
+    parser.add_argument("--file-bytes", type=int, default=synthetic.DEFAULT_FILE_BYTES)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", default=None)
+    parser.add_argument("--results", default=DEFAULT_RESULTS_PATH)
+    parser.add_argument("--regression-threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+
+    # Per-subject INFO logging would otherwise dominate the timings.
+    logging.basicConfig(level=args.log_level.upper(), format="[%(levelname)s] %(message)s")
+
+    run = run_benchmark(
+        args.subjects,
+        stages=args.stages,
+        workdir=args.workdir,
+        sessions_per_subject=args.sessions_per_subject,
+        file_bytes=args.file_bytes,
+        workers=args.workers,
+        seed=args.seed,
+    )
+    baseline, regressions = find_regressions(
+        run, load_history(args.results), args.regression_threshold
+    )
+    append_result(args.results, run)
+
+    for entry in run["scales"]:
+        for stage, values in entry["stages"].items():
+            timing = values.get("seconds")
+            shown = f"{timing:.3f}s" if timing is not None else values.get("skipped")
+            print(f"{entry['subjects']:>6} subjects  {stage:<18} {shown}")
+    if baseline is not None:
+        print(f"compared with {baseline.get('commit')} ({baseline.get('timestamp')})")
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['subjects']} subjects {regression['stage']}: "
+            f"{regression['baseline_s']:.3f}s -> {regression['current_s']:.3f}s "
+            f"(x{regression['ratio']})",
+            file=sys.stderr,
+        )
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
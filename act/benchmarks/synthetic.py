@@ -0,0 +1,247 @@
+"""
+Synthetic RDSS drop folders, LSS study trees and GGIR outputs for benchmarks.
+
+The layout mirrors production: RDSS holds flat `#### (YYYY-MM-DD)RAW.csv`
+drops, and each study root holds `sub-<boost_id>/accel/ses-<run>/` folders
+with one canonical `sub-<id>_ses-<run>_accel.csv`. Subjects alternate between
+the observational (6001-7999) and intervention (8000+) ID ranges, so both
+study roots are populated at every scale.
+"""
+import hashlib
+import json
+import os
+import random
+import tempfile
+from datetime import date, datetime, timedelta
+
+from act.utils.report_cache import ReportCache
+
+SCALES = (100, 1000, 10000)
+BENCH_TOKEN = "benchmark-token"
+DEFAULT_FILE_BYTES = 4096
+# GGIR-3.2.6 derivatives live under each study root.
+GGIR_DERIVATIVES = os.path.join("derivatives", "GGIR-3.2.6")
+
+_OBS_FIRST_ID = 6001
+_OBS_LAST_ID = 7999
+_INT_FIRST_ID = 8000
+
+
+def synthetic_subjects(n_subjects, sessions_per_subject=2, seed=0, start=date(2024, 9, 2)):
+    """
+    Return subject descriptors [{"subject_id", "lab_id", "study", "dates"}].
+
+    Session dates are about 90 days apart (never on the same day) and fall
+    after the default RDSS date threshold, so every drop is eligible for ingest.
+    """
+    rng = random.Random(seed)
+    n_obs = min(n_subjects // 2, _OBS_LAST_ID - _OBS_FIRST_ID + 1)
+    subjects = []
+    for index in range(n_subjects):
+        if index < n_obs:
+            subject_id, study = _OBS_FIRST_ID + index, "obs"
+        else:
+            subject_id, study = _INT_FIRST_ID + index - n_obs, "int"
+        first = start + timedelta(days=rng.randrange(300))
+        dates = [
+            (first + timedelta(days=90 * session + rng.randrange(14))).isoformat()
+            for session in range(sessions_per_subject)
+        ]
+        subjects.append(
+            {
+                "subject_id": str(subject_id),
+                "lab_id": str(1000 + index),
+                "study": study,
+                "dates": dates,
+            }
+        )
+    return subjects
+
+
+def rdss_filename(lab_id, date_value):
+    return f"{lab_id} ({date_value})RAW.csv"
+
+
+def _backdate(path, date_value):
+    """Stamp path with its session date; freshly written trees would otherwise
+    sit inside the racy-mtime window and defeat the listing and LSS caches."""
+    stamp = datetime.combine(date.fromisoformat(date_value), datetime.min.time()).timestamp()
+    os.utime(path, (stamp, stamp))
+
+
+def _payload(name, size):
+    """Deterministic per-file bytes so digests differ between files."""
+    seed = hashlib.sha256(name.encode("utf-8")).digest()
+    header = f"synthetic accelerometer drop {name}\n".encode("utf-8")
+    body = seed * (max(0, size - len(header)) // len(seed) + 1)
+    return (header + body)[:size]
+
+
+def write_rdss_tree(rdss_dir, subjects, file_bytes=DEFAULT_FILE_BYTES):
+    """Write one RAW.csv drop per subject session; returns the number of files."""
+    os.makedirs(rdss_dir, exist_ok=True)
+    count = 0
+    latest = None
+    for subject in subjects:
+        for date_value in subject["dates"]:
+            name = rdss_filename(subject["lab_id"], date_value)
+            path = os.path.join(rdss_dir, name)
+            with open(path, "wb") as handle:
+                handle.write(_payload(name, file_bytes))
+            _backdate(path, date_value)
+            latest = max(latest or date_value, date_value)
+            count += 1
+    if latest is not None:
+        _backdate(rdss_dir, latest)
+    return count
+
+
+def report_csv(subjects):
+    """REDCap report body (lab_id,boost_id) covering every subject."""
+    lines = ["lab_id,boost_id"]
+    lines.extend(f"{subject['lab_id']},{subject['subject_id']}" for subject in subjects)
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def seed_report_cache(cache_dir, subjects, token=BENCH_TOKEN):
+    """Store the synthetic report where an offline ID_COMPARISONS will find it."""
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=".redcap-report-", suffix=".csv", dir=cache_dir)
+    with os.fdopen(fd, "wb") as handle:
+        handle.write(report_csv(subjects))
+    return ReportCache(cache_dir=cache_dir).store_file(temp_path, token=token)
+
+
+def study_root(int_dir, obs_dir, study):
+    return int_dir if study == "int" else obs_dir
+
+
+def session_csv_path(root, subject_id, run):
+    return os.path.join(
+        root,
+        f"sub-{subject_id}",
+        "accel",
+        f"ses-{run}",
+        f"sub-{subject_id}_ses-{run}_accel.csv",
+    )
+
+
+def write_lss_tree(int_dir, obs_dir, subjects, file_bytes=DEFAULT_FILE_BYTES):
+    """
+    Write the canonical LSS sessions for every subject (as a completed ingest
+    would) and return the matching manifest payload {subject_id: [record]}.
+    """
+    manifest = {}
+    for subject in subjects:
+        root = study_root(int_dir, obs_dir, subject["study"])
+        records = []
+        for run, date_value in enumerate(sorted(subject["dates"]), start=1):
+            filename = rdss_filename(subject["lab_id"], date_value)
+            data = _payload(filename, file_bytes)
+            file_path = session_csv_path(root, subject["subject_id"], run)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "wb") as handle:
+                handle.write(data)
+            _backdate(file_path, date_value)
+            _backdate(os.path.dirname(file_path), date_value)
+            records.append(
+                {
+                    "filename": filename,
+                    "labID": subject["lab_id"],
+                    "date": date_value,
+                    "run": run,
+                    "study": subject["study"],
+                    "file_path": file_path,
+                    "sha256": hashlib.sha256(data).hexdigest(),
+                    "size": len(data),
+                }
+            )
+        accel_dir = os.path.join(root, f"sub-{subject['subject_id']}", "accel")
+        _backdate(accel_dir, max(subject["dates"]))
+        _backdate(os.path.dirname(accel_dir), max(subject["dates"]))
+        manifest[subject["subject_id"]] = records
+    return manifest
+
+
+def write_manifest(path, manifest):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2)
+    return path
+
+
+def write_ggir_outputs(derivatives_root, subjects, study, days_worn=7, seed=0):
+    """
+    Write the three per-session GGIR results QC reads (QC report, part5
+    person and day summaries) for every session of the given study.
+    """
+    rng = random.Random(seed)
+    weekdays = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+    sessions = 0
+    for subject in subjects:
+        if subject["study"] != study:
+            continue
+        for run, date_value in enumerate(sorted(subject["dates"]), start=1):
+            sub = f"sub-{subject['subject_id']}"
+            ses = f"ses-{run}"
+            results_dir = os.path.join(
+                derivatives_root, sub, "accel", ses, f"output_{ses}", "results"
+            )
+            os.makedirs(os.path.join(results_dir, "QC"), exist_ok=True)
+            stem = f"{sub}_{ses}_accel.csv"
+            with open(
+                os.path.join(results_dir, "QC", "data_quality_report.csv"), "w", encoding="utf-8"
+            ) as handle:
+                handle.write("filename,cal.error.end,n.hours.considered\n")
+                handle.write(f"{stem},{rng.uniform(0.0, 0.02):.4f},{days_worn * 24}\n")
+            with open(
+                os.path.join(results_dir, "part5_personsummary_MM_L40M100V400_T5A5.csv"),
+                "w",
+                encoding="utf-8",
+            ) as handle:
+                handle.write("filename,Nvaliddays\n")
+                handle.write(f"{stem},{days_worn}\n")
+            first = date.fromisoformat(date_value)
+            with open(
+                os.path.join(results_dir, "part5_daysummary_MM_L40M100V400_T5A5.csv"),
+                "w",
+                encoding="utf-8",
+            ) as handle:
+                handle.write("filename,calendar_date,weekday,cleaningcode\n")
+                for offset in range(days_worn):
+                    day = first + timedelta(days=offset)
+                    handle.write(
+                        f"{stem},{day.isoformat()},{weekdays[day.weekday()]},{rng.choice((0, 1))}\n"
+                    )
+            sessions += 1
+    return sessions
+
+
+def build_tree(root, n_subjects, sessions_per_subject=2, file_bytes=DEFAULT_FILE_BYTES, seed=0, ingested=True):
+    """
+    Build a complete synthetic deployment under root.
+
+    Returns a dict with the int/obs/rdss/res paths, the manifest path and the
+    subject descriptors. With ingested=True the LSS trees and manifest
+    reflect a finished ingest of every RDSS drop; otherwise the study roots
+    are left empty for a cold ingest.
+    """
+    paths = {
+        "root": os.fspath(root),
+        "int_dir": os.path.join(root, "int"),
+        "obs_dir": os.path.join(root, "obs"),
+        "rdss_dir": os.path.join(root, "rdss"),
+        "res_dir": os.path.join(root, "res"),
+    }
+    paths["manifest_path"] = os.path.join(paths["res_dir"], "data.json")
+    for key in ("int_dir", "obs_dir", "res_dir"):
+        os.makedirs(paths[key], exist_ok=True)
+
+    subjects = synthetic_subjects(n_subjects, sessions_per_subject, seed=seed)
+    paths["subjects"] = subjects
+    paths["rdss_files"] = write_rdss_tree(paths["rdss_dir"], subjects, file_bytes)
+    seed_report_cache(paths["res_dir"], subjects)
+    if ingested:
+        manifest = write_lss_tree(paths["int_dir"], paths["obs_dir"], subjects, file_bytes)
+        write_manifest(paths["manifest_path"], manifest)
+    return paths
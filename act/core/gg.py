@@ -1,15 +1,60 @@
-import subprocess
+import contextvars
+import glob
 import logging
+import os
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from act.core.ggir_cache import (
+    DEFAULT_MAX_AGE_SECONDS,
+    GGIROutputCache,
+    file_sha256,
+    ggir_parameters_hash,
+    ggir_version,
+    session_name,
+    unshare_tree,
+)
+from act.core.ggir_params import (
+    PROJECT_RECORD_FILENAME,
+    RECORD_FILENAME,
+    milestones_present,
+    parse_ggir_parameters,
+    read_record,
+    start_part,
+    write_record,
+)
+from act.core.ggir_memory import MemoryBudget, MemoryHistory, default_budget, wait_with_peak_rss
+from act.core.ggir_worker import RWorkerPool, WorkerError
+from act.utils import metrics
 
 logger = logging.getLogger(__name__)
 
+GGIR_SCRIPT = "act/core/acc_new.R"
+
 
 class GG:
     """
     Class to execute GGIR processing for matched subject records.
     """
 
-    def __init__(self, matched, intdir, obsdir, system):
+    def __init__(
+        self,
+        matched,
+        intdir,
+        obsdir,
+        system,
+        changed_sessions=None,
+        ggir_workers=1,
+        memory_budget=None,
+        memory_history_path="res/ggir_memory.json",
+        output_cache=True,
+        output_cache_max_bytes=None,
+        output_cache_max_age=DEFAULT_MAX_AGE_SECONDS,
+        digest_index=None,
+        staged=True,
+        persistent_workers=False,
+    ):
         """
         Initialize the GG instance.
 
@@ -17,63 +62,629 @@ class GG:
             matched (dict): Mapping of subject IDs to their records.
             intdir (str): Path to the internal directory.
             obsdir (str): Path to the observational directory.
+            changed_sessions (list | None): Session CSVs Save.save() copied or
+                renamed in this run. When given, GGIR only processes these plus
+                sessions that have no GGIR results yet; None processes every
+                session under each project.
+            ggir_workers (int): Concurrent R processes. Above 1, GGIR runs once
+                per session on a pool shared by both projects; outputs land in
+                the same per-session derivative folders either way.
+            memory_budget (int | None): Bytes of RAM the concurrent sessions
+                may use together, judged by each session's estimated peak RSS.
+                Defaults to a share of physical memory.
+            memory_history_path (str): JSON file of measured peaks that
+                future estimates are based on.
+            output_cache (bool): Reuse GGIR outputs from the content-addressed
+                cache under each project's derivatives folder, so a renamed or
+                re-ingested session with identical input is relinked instead
+                of recomputed.
+            output_cache_max_bytes (int | None): After each run, evict the
+                least recently used cache entries until the outputs only the
+                cache still holds fit in this many bytes. None means no cap.
+            output_cache_max_age (float | None): Seconds after which an
+                unused cache entry is evicted. None means no cap. Entries
+                for other GGIR parameters or versions are always evicted.
+            digest_index (DigestIndex | None): Stat-keyed SHA-256 cache
+                (res/digest_index.json) consulted before an input CSV is
+                hashed for the output cache; digests computed here are added
+                to it and saved at the end of the run.
+            staged (bool): Compare each processed session's recorded GGIR
+                parameters with the current acc_new.R call and rerun only the
+                affected parts (mode = k:6) on top of the existing milestones.
+            persistent_workers (bool): Dispatch sessions to ggir_workers
+                long-lived R processes (ggir_worker.R) that load GGIR once,
+                instead of starting Rscript per session. Falls back to
+                per-session Rscript if the workers cannot be started.
         """
         self.matched = matched
         self.INTDIR = intdir.rstrip("/") + "/"
         self.OBSDIR = obsdir.rstrip("/") + "/"
         self.DERIVATIVES = "derivatives/GGIR-3.2.6/"  # Defined within the class
         self.system = system
+        self.changed_sessions = changed_sessions
+        self.ggir_workers = max(1, int(ggir_workers or 1))
+        self.memory_budget = memory_budget or default_budget()
+        self.memory_history_path = memory_history_path
+        self.output_cache = output_cache
+        self.output_cache_max_bytes = output_cache_max_bytes
+        self.output_cache_max_age = output_cache_max_age
+        self.digest_index = digest_index
+        self.staged = staged
+        self.persistent_workers = persistent_workers
+        self._configuration = None
+        self._caches = {}
+        # (project_dir, relative_path) -> first GGIR part to rerun
+        self._start_parts = {}
+        self._digests = {
+            os.path.abspath(record["file_path"]): record["sha256"]
+            for records in (matched or {}).values()
+            for record in records or []
+            if isinstance(record, dict) and record.get("file_path") and record.get("sha256")
+        }
 
     def run_gg(self):
         """
         Run GGIR for both the internal and observational project directories.
         After each GGIR run, invoke the QC pipeline for that project.
+        With ggir_workers > 1 or persistent_workers the sessions of both
+        projects share one pool.
         """
         # Assume QC is available at this import path
         from act.utils.qc import QC
 
-        for project_dir in [self.INTDIR, self.OBSDIR]:
-            command = f"Rscript act/core/acc_new.R --project_dir {project_dir} --deriv_dir {self.DERIVATIVES}"
+        if self.ggir_workers > 1 or self.persistent_workers:
+            self._run_parallel(QC)
+        else:
+            for project_dir in [self.INTDIR, self.OBSDIR]:
+                with metrics.span("ggir.project", project_dir=project_dir):
+                    self._run_project(QC, project_dir)
+        self._save_digest_index()
+        self._prune_output_caches()
+
+    def _output_dir(self, project_dir, relative_path):
+        """GGIR's outputdir for a session CSV: <project>/<derivatives>/sub-*/accel/ses-*."""
+        return os.path.join(project_dir, self.DERIVATIVES, os.path.dirname(relative_path))
+
+    def _has_ggir_outputs(self, project_dir, relative_path):
+        """True when GGIR part 5 results exist for the session CSV at relative_path."""
+        output_dir = self._output_dir(project_dir, relative_path)
+        results_dir = os.path.join(
+            output_dir, f"output_{os.path.basename(output_dir)}", "results"
+        )
+        try:
+            with os.scandir(results_dir) as entries:
+                return any(entry.name.startswith("part5_personsummary") for entry in entries)
+        except OSError:
+            return False
+
+    def work_list(self, project_dir):
+        """
+        Return the session CSVs (relative to project_dir) GGIR should process:
+        sessions changed by this run, manifest sessions without results and,
+        in staged mode, sessions whose results predate a GGIR parameter change.
+        """
+        root = os.path.abspath(project_dir)
+
+        def relative(path):
+            return os.path.relpath(os.path.abspath(path), root)
+
+        changed = {relative(path) for path in self.changed_sessions or []}
+        recorded = {
+            relative(record["file_path"])
+            for records in (self.matched or {}).values()
+            for record in records or []
+            if isinstance(record, dict) and record.get("file_path")
+        }
 
+        work = []
+        up_to_date = []
+        for relative_path in changed | recorded:
+            if relative_path.startswith(os.pardir):
+                continue
+            if not os.path.isfile(os.path.join(root, relative_path)):
+                continue
+            if relative_path in changed or not self._has_ggir_outputs(project_dir, relative_path):
+                work.append(relative_path)
+            elif self.staged:
+                up_to_date.append(relative_path)
+        work.extend(self._stage_parameter_changes(project_dir, up_to_date))
+        return sorted(work)
+
+    def _ggir_configuration(self):
+        """(parameters, parameters hash, GGIR version) for the GGIR call in acc_new.R."""
+        if self._configuration is None:
             try:
-                # Execute the command in a new subprocess
-                logger.info("Running GGIR for project directory %s", project_dir)
-                process = subprocess.Popen(
-                    command,
-                    shell=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    bufsize=1,
-                    universal_newlines=True,
+                parameters = parse_ggir_parameters(GGIR_SCRIPT)
+                parameters_hash = ggir_parameters_hash(GGIR_SCRIPT)
+            except (OSError, ValueError) as exc:
+                logger.warning("Unable to read GGIR parameters from %s (%s).", GGIR_SCRIPT, exc)
+                parameters = parameters_hash = None
+            version = ggir_version() if parameters_hash else None
+            self._configuration = (parameters, parameters_hash, version)
+        return self._configuration
+
+    def _project_record_path(self, project_dir):
+        return os.path.join(project_dir, self.DERIVATIVES, PROJECT_RECORD_FILENAME)
+
+    def _stage_parameter_changes(self, project_dir, sessions):
+        """
+        Return the sessions among `sessions` (all with results) whose GGIR
+        parameters differ from the current ones, remembering the part each
+        must rerun from.
+
+        Sessions without their own record fall back to the project record,
+        which is created from the current parameters the first time, so a
+        deploy does not reprocess the archive. While the project record is
+        marked consistent and matches, no per-session records are read.
+        """
+        parameters, _, version = self._ggir_configuration()
+        if not self.staged or parameters is None:
+            return []
+        project_record_path = self._project_record_path(project_dir)
+        baseline = read_record(project_record_path)
+        if baseline is None:
+            write_record(project_record_path, parameters, version)
+            return []
+        if baseline.get("consistent", True) and start_part(baseline, parameters, version) is None:
+            return []
+
+        staged = []
+        for relative_path in sessions:
+            record = read_record(
+                os.path.join(self._output_dir(project_dir, relative_path), RECORD_FILENAME)
+            ) or baseline
+            part = start_part(record, parameters, version)
+            if part is None:
+                continue
+            output_dir = self._output_dir(project_dir, relative_path)
+            session_output = os.path.join(output_dir, f"output_{os.path.basename(output_dir)}")
+            # Milestones relinked from another session still carry its name.
+            if part > 1 and (
+                record.get("relinked_from") or not milestones_present(session_output, part)
+            ):
+                part = 1
+            self._start_parts[(project_dir, relative_path)] = part
+            staged.append(relative_path)
+        if not staged:
+            write_record(project_record_path, parameters, version)
+        else:
+            # Until every staged session has rerun, the fast path above is unsafe.
+            write_record(
+                project_record_path, baseline["parameters"], baseline.get("ggir_version"), consistent=False
+            )
+            logger.info(
+                "ggir_staged project_dir=%s sessions=%s first_parts=%s",
+                project_dir,
+                len(staged),
+                sorted({self._start_parts[(project_dir, path)] for path in staged}),
+            )
+        return staged
+
+    def _settle_parameters(self, project_dir):
+        """Mark the project record current once no staged session is still behind."""
+        parameters, _, version = self._ggir_configuration()
+        if not self.staged or parameters is None:
+            return
+        pending = [path for (project, path) in self._start_parts if project == project_dir]
+        for relative_path in pending:
+            record = read_record(
+                os.path.join(self._output_dir(project_dir, relative_path), RECORD_FILENAME)
+            )
+            if record is None or start_part(record, parameters, version) is not None:
+                return
+        if pending:
+            write_record(self._project_record_path(project_dir), parameters, version)
+
+    def _results_signature(self, project_dir, relative_path):
+        """{name: mtime_ns} of the session's results folder, to tell whether GGIR rewrote it."""
+        output_dir = self._output_dir(project_dir, relative_path)
+        results_dir = os.path.join(output_dir, f"output_{os.path.basename(output_dir)}", "results")
+        try:
+            with os.scandir(results_dir) as entries:
+                return {entry.name: entry.stat().st_mtime_ns for entry in entries if entry.is_file()}
+        except OSError:
+            return {}
+
+    def _finish_session(self, project_dir, relative_path, before):
+        """
+        Record parameters and cache the outputs of a session GGIR just rewrote.
+        acc_new.R wraps each GGIR call in try(), so a zero exit status alone
+        does not mean the session's results were produced.
+        """
+        after = self._results_signature(project_dir, relative_path)
+        if not after or after == before or not self._has_ggir_outputs(project_dir, relative_path):
+            logger.warning("ggir_no_new_results session=%s", relative_path)
+            return False
+        parameters, _, version = self._ggir_configuration()
+        if parameters is not None:
+            write_record(
+                os.path.join(self._output_dir(project_dir, relative_path), RECORD_FILENAME),
+                parameters,
+                version,
+            )
+        self._store_outputs(project_dir, relative_path)
+        return True
+
+    def all_sessions(self, project_dir):
+        """Every session CSV under the project's sub-* folders, relative to project_dir."""
+        root = os.path.abspath(project_dir)
+        pattern = os.path.join(glob.escape(root), "sub-*", "**", "*accel.csv")
+        return sorted(
+            os.path.relpath(path, root) for path in glob.glob(pattern, recursive=True)
+        )
+
+    def _write_work_list(self, project_dir, sessions):
+        """One session per line; staged sessions add a tab and the GGIR part to start from."""
+        lines = []
+        for relative_path in sessions:
+            part = self._start_parts.get((project_dir, relative_path), 1)
+            lines.append(f"{relative_path}\t{part}" if part > 1 else relative_path)
+        with tempfile.NamedTemporaryFile(
+            "w", prefix="ggir-work-list-", suffix=".txt", delete=False, encoding="utf-8"
+        ) as handle:
+            handle.write("\n".join(lines) + "\n")
+            return handle.name
+
+    def _command(self, project_dir, work_list_path=None):
+        command = f"Rscript {GGIR_SCRIPT} --project_dir {project_dir} --deriv_dir {self.DERIVATIVES}"
+        if work_list_path is not None:
+            command += f" --work_list {work_list_path}"
+        return command
+
+    def _output_cache(self, project_dir):
+        """The project's GGIR output cache, or None when caching is off or unkeyable."""
+        if not self.output_cache:
+            return None
+        _, parameters_hash, version = self._ggir_configuration()
+        if parameters_hash is None or version is None:
+            return None
+        if project_dir not in self._caches:
+            self._caches[project_dir] = GGIROutputCache(
+                os.path.join(project_dir, self.DERIVATIVES), parameters_hash, version
+            )
+        return self._caches[project_dir]
+
+    def _prune_output_caches(self):
+        """Evict cache entries this configuration can no longer hit, then apply the caps."""
+        for project_dir, cache in self._caches.items():
+            try:
+                pruned = cache.prune(
+                    max_bytes=self.output_cache_max_bytes,
+                    max_age_seconds=self.output_cache_max_age,
                 )
+            except OSError as exc:
+                logger.warning("ggir_cache_prune_failed project_dir=%s error=%s", project_dir, exc)
+                continue
+            logger.info(
+                "ggir_cache_prune project_dir=%s removed=%s freed_bytes=%s kept=%s kept_bytes=%s",
+                project_dir,
+                pruned["removed"],
+                pruned["freed_bytes"],
+                pruned["kept"],
+                pruned["kept_bytes"],
+            )
+
+    def _mark_relinked(self, project_dir, relative_path, entry):
+        """
+        Record that a session's outputs were relinked from another session.
+        Their RData milestones still name that session, so a later staged
+        rerun of this one has to start again from part 1.
+        """
+        origin = f"{entry['subject']}_{entry['session']}"
+        if origin == "_".join(session_name(relative_path)):
+            return
+        parameters, _, version = self._ggir_configuration()
+        write_record(
+            os.path.join(self._output_dir(project_dir, relative_path), RECORD_FILENAME),
+            parameters,
+            version,
+            relinked_from=origin,
+        )
+
+    def _input_digest(self, project_dir, relative_path):
+        path = os.path.abspath(os.path.join(project_dir, relative_path))
+        if path not in self._digests:
+            index = self.digest_index
+            digest = index.lookup(path) if index is not None else None
+            if digest is None:
+                stat = os.stat(path)
+                digest = file_sha256(path)
+                if index is not None:
+                    index.update(path, digest, stat)
+            self._digests[path] = digest
+        return self._digests[path]
+
+    def _save_digest_index(self):
+        """Persist digests hashed for the output cache so later runs reuse them."""
+        if self.digest_index is None:
+            return
+        try:
+            self.digest_index.save()
+        except OSError as exc:
+            logger.warning("Unable to save digest index %s (%s).", self.digest_index.path, exc)
+
+    def _store_outputs(self, project_dir, relative_path):
+        """Add a session's fresh GGIR outputs to the cache."""
+        cache = self._output_cache(project_dir)
+        if cache is None or not self._has_ggir_outputs(project_dir, relative_path):
+            return
+        try:
+            key = cache.key(self._input_digest(project_dir, relative_path))
+            cache.store(key, self._output_dir(project_dir, relative_path), relative_path)
+        except (OSError, ValueError) as exc:
+            logger.warning("ggir_cache_store_failed session=%s error=%s", relative_path, exc)
+
+    def _reuse_cached_outputs(self, project_dir, sessions):
+        """
+        Relink cached outputs for sessions whose input is already cached and
+        return (sessions still needing GGIR, number relinked).
+
+        Manifest sessions that already have results (and a recorded digest)
+        are added to the cache first, so outputs computed before a rename can
+        be relinked into the session's new folder.
+        """
+        cache = self._output_cache(project_dir)
+        if cache is None:
+            return sessions, 0
+
+        pending = set(sessions)
+        root = os.path.abspath(project_dir)
+        for path, digest in self._digests.items():
+            relative_path = os.path.relpath(path, root)
+            if relative_path.startswith(os.pardir) or relative_path in pending:
+                continue
+            if cache.lookup(cache.key(digest)) is None:
+                self._store_outputs(project_dir, relative_path)
+
+        remaining = []
+        relinked = 0
+        for relative_path in sessions:
+            output_dir = self._output_dir(project_dir, relative_path)
+            try:
+                key = cache.key(self._input_digest(project_dir, relative_path))
+                entry = cache.lookup(key)
+                if entry is not None and cache.restore(key, output_dir, relative_path):
+                    self._mark_relinked(project_dir, relative_path, entry)
+                    relinked += 1
+                    logger.info("ggir_cache_hit session=%s key=%s", relative_path, key[:12])
+                    continue
+                # GGIR rewrites outputs in place; keep cached copies intact.
+                if os.path.isdir(output_dir):
+                    unshare_tree(output_dir)
+            except (OSError, ValueError) as exc:
+                logger.warning("ggir_cache_restore_failed session=%s error=%s", relative_path, exc)
+            remaining.append(relative_path)
+        metrics.add(ggir_cache_hits=relinked)
+        return remaining, relinked
+
+    def _stream_ggir(self, command, prefix=""):
+        """
+        Run one acc_new.R command, logging its output. Returns the peak RSS of
+        the R process in bytes (None if unknown); raises CalledProcessError on failure.
+        """
+        process = subprocess.Popen(
+            command,
+            shell=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=1,
+            universal_newlines=True,
+        )
+
+        # Stream output line-by-line
+        output_lines = 0
+        for line in process.stdout:
+            logger.info("%s%s", prefix, line.rstrip())
+            output_lines += 1
+        metrics.add(ggir_output_lines=output_lines)
 
-                # Stream output line-by-line
-                for line in process.stdout:
-                    logger.info(line.rstrip())
+        process.stdout.close()
+        peak_rss = wait_with_peak_rss(process)
 
-                process.stdout.close()
-                process.wait()
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, command)
+        return peak_rss
 
-                if process.returncode != 0:
-                    raise subprocess.CalledProcessError(process.returncode, command)
+    def _run_qc(self, QC, project_dir):
+        # Determine project type for QC ('int' for internal, 'obs' for observational)
+        if project_dir.rstrip("/") == self.INTDIR.rstrip("/"):
+            project_type = "int"
+        else:
+            project_type = "obs"
 
-                logger.info("GGIR completed successfully for %s.", project_dir)
+        # Run QC for this project
+        logger.info("Starting QC pipeline for %s project.", project_type)
+        with metrics.span("qc", project=project_type):
+            qc_runner = QC(project_type, system=self.system)
+            qc_runner.qc()
+        logger.info("QC pipeline finished for %s project.", project_type)
 
-                # Determine project type for QC ('int' for internal, 'obs' for observational)
-                if project_dir.rstrip("/") == self.INTDIR.rstrip("/"):
-                    project_type = "int"
-                else:
-                    project_type = "obs"
+    def _run_project(self, QC, project_dir):
+        """Run GGIR and then QC for one project directory, logging any failure."""
+        work_list_path = None
+        if self.changed_sessions is not None:
+            sessions = self.work_list(project_dir)
+            sessions, relinked = self._reuse_cached_outputs(project_dir, sessions)
+            metrics.add(ggir_sessions=len(sessions))
+            if not sessions:
+                logger.info("ggir_skip project_dir=%s reason=no_new_or_changed_sessions", project_dir)
+                if relinked:
+                    self._run_qc(QC, project_dir)
+                return
+            logger.info("ggir_work_list project_dir=%s sessions=%s", project_dir, len(sessions))
+            work_list_path = self._write_work_list(project_dir, sessions)
+            before = {path: self._results_signature(project_dir, path) for path in sessions}
+        command = self._command(project_dir, work_list_path)
 
-                # Run QC for this project
-                logger.info("Starting QC pipeline for %s project.", project_type)
-                qc_runner = QC(project_type, system=self.system)
-                qc_runner.qc()
-                logger.info("QC pipeline finished for %s project.", project_type)
+        try:
+            # Execute the command in a new subprocess
+            logger.info("Running GGIR for project directory %s", project_dir)
+            self._stream_ggir(command)
+            logger.info("GGIR completed successfully for %s.", project_dir)
+            if work_list_path is not None:
+                for relative_path in sessions:
+                    self._finish_session(project_dir, relative_path, before[relative_path])
+                self._settle_parameters(project_dir)
+            self._run_qc(QC, project_dir)
 
-            except subprocess.CalledProcessError:
-                logger.exception("Error running GGIR for %s", project_dir)
-                # optionally continue or break…
+        except subprocess.CalledProcessError:
+            logger.exception("Error running GGIR for %s", project_dir)
+            metrics.add(failures=1)
+            # optionally continue or break…
+        except Exception:
+            logger.exception("Unexpected error when processing %s", project_dir)
+            metrics.add(failures=1)
+            # Optionally, continue to next project or break
+        finally:
+            if work_list_path is not None:
+                os.remove(work_list_path)
+
+    def _run_session(self, project_dir, relative_path, budget, history, workers=None):
+        """
+        Run GGIR for a single session CSV once its estimated peak fits in the
+        memory budget, then record the measured peak; returns True on success.
+        With `workers` (an RWorkerPool) the session runs in a persistent R
+        worker instead of a new Rscript process.
+        """
+        path = os.path.abspath(os.path.join(project_dir, relative_path))
+        input_bytes = self._session_bytes(project_dir, relative_path)
+        estimate = history.estimate(path, input_bytes)
+        with metrics.span("ggir.session", session=relative_path) as span:
+            span.set(estimated_rss=estimate)
+            with budget.reserve(estimate):
+                before = self._results_signature(project_dir, relative_path)
+                try:
+                    if workers is None:
+                        peak_rss = self._run_session_process(project_dir, relative_path)
+                    else:
+                        peak_rss = self._run_session_worker(workers, project_dir, relative_path, span)
+                except Exception:
+                    logger.exception("Error running GGIR for %s%s", project_dir, relative_path)
+                    span.set(outcome="failed")
+                    metrics.add(failures=1)
+                    return False
+            history.observe(path, input_bytes, peak_rss)
+            self._finish_session(project_dir, relative_path, before)
+            span.set(outcome="ok", peak_rss=peak_rss)
+            logger.info(
+                "ggir_session session=%s input_bytes=%s estimated_rss=%s peak_rss=%s",
+                relative_path,
+                input_bytes,
+                estimate,
+                peak_rss,
+            )
+            return True
+
+    def _run_session_process(self, project_dir, relative_path):
+        """Run one session in its own acc_new.R process; returns its peak RSS."""
+        work_list_path = self._write_work_list(project_dir, [relative_path])
+        try:
+            return self._stream_ggir(
+                self._command(project_dir, work_list_path), prefix=f"[{relative_path}] "
+            )
+        finally:
+            os.remove(work_list_path)
+
+    def _run_session_worker(self, workers, project_dir, relative_path, span):
+        """Run one session on a persistent R worker; returns the job's peak RSS."""
+        part = self._start_parts.get((project_dir, relative_path), 1)
+        result = workers.run(project_dir, self.DERIVATIVES, relative_path, part)
+        span.set(
+            worker=result["worker"],
+            r_seconds=result["r_seconds"],
+            dispatch_overhead_s=round(result["wall_seconds"] - (result["r_seconds"] or 0.0), 3),
+        )
+        if not result["ok"]:
+            raise RuntimeError(f"GGIR failed on {result['worker']}: {result['message']}")
+        return result["peak_rss"]
+
+    def _start_workers(self, count):
+        """Start a pool of persistent R workers, or return None to fall back to Rscript."""
+        workers = RWorkerPool(count)
+        try:
+            with metrics.span("ggir.workers_start", workers=count):
+                workers.start()
+        except (OSError, WorkerError) as exc:
+            logger.warning("ggir_workers_unavailable error=%s; running Rscript per session", exc)
+            return None
+        return workers
+
+    def _session_bytes(self, project_dir, relative_path):
+        try:
+            return os.path.getsize(os.path.join(project_dir, relative_path))
+        except OSError:
+            return 0
+
+    def _run_parallel(self, QC):
+        """
+        Run each session on a pool of ggir_workers (an acc_new.R process per
+        session, or persistent R workers), then QC for every project that had
+        at least one successful or relinked session. The
+        largest recordings start first so a long one does not finish last,
+        and sessions only start while their estimated peaks fit in the
+        memory budget.
+        """
+        jobs = []
+        succeeded = {}
+        for project_dir in [self.INTDIR, self.OBSDIR]:
+            if self.changed_sessions is not None:
+                sessions = self.work_list(project_dir)
+            else:
+                sessions = self.all_sessions(project_dir)
+            sessions, succeeded[project_dir] = self._reuse_cached_outputs(project_dir, sessions)
+            if not sessions:
+                logger.info("ggir_skip project_dir=%s reason=no_new_or_changed_sessions", project_dir)
+            jobs.extend((project_dir, relative_path) for relative_path in sessions)
+        jobs.sort(key=lambda job: self._session_bytes(*job), reverse=True)
+
+        budget = MemoryBudget(self.memory_budget)
+        history = MemoryHistory(self.memory_history_path)
+        workers = None
+        if self.persistent_workers and jobs:
+            workers = self._start_workers(min(self.ggir_workers, len(jobs)))
+        with metrics.span(
+            "ggir.sessions", workers=self.ggir_workers, persistent=workers is not None
+        ) as span:
+            span.add(ggir_sessions=len(jobs))
+            logger.info(
+                "ggir_pool workers=%s sessions=%s memory_budget=%s",
+                self.ggir_workers,
+                len(jobs),
+                self.memory_budget,
+            )
+            try:
+                with ThreadPoolExecutor(max_workers=self.ggir_workers) as pool:
+                    futures = {
+                        pool.submit(
+                            contextvars.copy_context().run,
+                            self._run_session,
+                            project_dir,
+                            relative_path,
+                            budget,
+                            history,
+                            workers,
+                        ): project_dir
+                        for project_dir, relative_path in jobs
+                    }
+                    for future in as_completed(futures):
+                        if future.result():
+                            succeeded[futures[future]] += 1
+            finally:
+                if workers is not None:
+                    workers.close()
+                    span.set(worker_restarts=workers.restarts)
+            span.set(
+                memory_peak_reserved=budget.peak_in_use,
+                memory_wait_s=round(budget.wait_seconds, 3),
+            )
+        history.save()
+
+        for project_dir, count in succeeded.items():
+            self._settle_parameters(project_dir)
+            if not count:
+                continue
+            try:
+                self._run_qc(QC, project_dir)
             except Exception:
-                logger.exception("Unexpected error when processing %s", project_dir)
-                # Optionally, continue to next project or break
+                logger.exception("Unexpected error running QC for %s", project_dir)
+                metrics.add(failures=1)
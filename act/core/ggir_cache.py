@@ -0,0 +1,308 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+
+from act.core.ggir_params import IGNORED_PARAMETERS, parse_ggir_parameters
+from act.utils.cache_files import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+CACHE_DIRNAME = ".ggir-cache"
+# Outputs small enough to rewrite so the session name inside them follows
+# a rename; everything else (RData, PDFs) is hardlinked unchanged.
+_TEXT_SUFFIXES = (".csv", ".txt", ".html", ".json")
+_TEXT_REWRITE_MAX_BYTES = 64 * 1024 ** 2
+_SESSION_PATTERN = re.compile(r"(?P<sub>sub-[^_/\\]+)_(?P<ses>ses-\d+)")
+_CHUNK_BYTES = 8 * 1024 ** 2
+# Entries nobody has restored or stored for this long are pruned.
+DEFAULT_MAX_AGE_SECONDS = 90 * 24 * 60 * 60
+
+
+def ggir_parameters_hash(script_path):
+    """
+    SHA-256 of the GGIR(...) call in an acc_*.R script, ignoring comments,
+    whitespace and the per-run arguments (mode, datadir, ...), so only a real
+    parameter change invalidates cached outputs.
+    """
+    parameters = {
+        name: value
+        for name, value in parse_ggir_parameters(script_path).items()
+        if name not in IGNORED_PARAMETERS
+    }
+    normalized = json.dumps(parameters, sort_keys=True)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def ggir_version(rscript="Rscript", timeout=120):
+    """Installed GGIR package version as reported by R, or None if R cannot say."""
+    try:
+        result = subprocess.run(
+            [rscript, "-e", "cat(as.character(packageVersion('GGIR')))"],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            check=True,
+        )
+    except (OSError, subprocess.SubprocessError) as exc:
+        logger.warning("Unable to read the GGIR version (%s); output cache disabled.", exc)
+        return None
+    version = result.stdout.strip().splitlines()
+    return version[-1].strip() if version else None
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def session_name(relative_path):
+    """("sub-8001", "ses-2") for sub-8001/accel/ses-2/sub-8001_ses-2_accel.csv."""
+    match = _SESSION_PATTERN.search(os.path.basename(relative_path))
+    if match is None:
+        raise ValueError(f"Not a session CSV path: {relative_path}")
+    return match.group("sub"), match.group("ses")
+
+
+def _link_or_copy(source, destination):
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def unshare_tree(path):
+    """
+    Give every hardlinked file under path a private copy. GGIR rewrites its
+    outputs in place, which would otherwise change the cached entry too.
+    """
+    for directory, _, files in os.walk(path):
+        for name in files:
+            file_path = os.path.join(directory, name)
+            if os.lstat(file_path).st_nlink < 2:
+                continue
+            fd, temp_path = tempfile.mkstemp(prefix=".unshare-", dir=directory)
+            os.close(fd)
+            shutil.copy2(file_path, temp_path)
+            os.replace(temp_path, file_path)
+
+
+class GGIROutputCache:
+    """
+    Content-addressed store of per-session GGIR output folders.
+
+    Entries live under <derivatives>/.ggir-cache/<key>/, keyed by the input
+    CSV's SHA-256, the GGIR parameter hash and the GGIR version. Files are
+    hardlinked in and out of the store, so an entry costs directory entries
+    rather than a second copy of the outputs, until the session is rerun or
+    removed and the entry becomes the only owner of its files; prune()
+    bounds what that leaves behind. Restoring into a different session
+    renames the sub-/ses- tokens in paths and text outputs only: RData
+    files and large text outputs keep the old session's name inside them.
+    """
+
+    def __init__(self, derivatives_dir, parameters_hash, version):
+        self.root = os.path.join(derivatives_dir, CACHE_DIRNAME)
+        self.parameters_hash = parameters_hash
+        self.version = version
+
+    def key(self, input_sha256):
+        material = f"{CACHE_VERSION}:{input_sha256}:{self.parameters_hash}:{self.version}"
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _entry_dir(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def lookup(self, key):
+        """Return the entry's metadata dict, or None if it is not cached."""
+        try:
+            with open(os.path.join(self._entry_dir(key), "entry.json"), "r", encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def store(self, key, output_dir, relative_path):
+        """Hardlink output_dir into the cache under key; returns False if already cached."""
+        entry_dir = self._entry_dir(key)
+        if os.path.exists(entry_dir):
+            self._touch(key)
+            return False
+        os.makedirs(os.path.dirname(entry_dir), exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".store-", dir=os.path.dirname(entry_dir))
+        try:
+            shutil.copytree(
+                output_dir, os.path.join(staging, "outputs"), copy_function=_link_or_copy
+            )
+            subject, session = session_name(relative_path)
+            write_json_atomic(
+                os.path.join(staging, "entry.json"),
+                {
+                    "subject": subject,
+                    "session": session,
+                    "parameters_hash": self.parameters_hash,
+                    "ggir_version": self.version,
+                    "stored_at": time.time(),
+                },
+                prefix=".entry-",
+            )
+            os.rename(staging, entry_dir)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            if os.path.exists(entry_dir):
+                # Another worker stored the same outputs first.
+                return False
+            raise
+        return True
+
+    def restore(self, key, output_dir, relative_path):
+        """
+        Replace output_dir with the cached outputs for key, renamed for the
+        session at relative_path. Returns False when key is not cached.
+        """
+        entry = self.lookup(key)
+        if entry is None:
+            return False
+        subject, session = session_name(relative_path)
+        old_token = f"{entry['subject']}_{entry['session']}"
+        new_token = f"{subject}_{session}"
+        folders = {entry["session"]: session, f"output_{entry['session']}": f"output_{session}"}
+
+        def rename_part(part):
+            return folders.get(part, part.replace(old_token, new_token))
+
+        source_root = os.path.join(self._entry_dir(key), "outputs")
+        parent = os.path.dirname(output_dir.rstrip(os.sep))
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".restore-", dir=parent)
+        try:
+            for directory, _, files in os.walk(source_root):
+                relative_dir = os.path.relpath(directory, source_root)
+                parts = [] if relative_dir == os.curdir else relative_dir.split(os.sep)
+                target_dir = os.path.join(staging, *[rename_part(part) for part in parts])
+                os.makedirs(target_dir, exist_ok=True)
+                for name in files:
+                    self._restore_file(
+                        os.path.join(directory, name),
+                        os.path.join(target_dir, rename_part(name)),
+                        old_token,
+                        new_token,
+                    )
+            if os.path.exists(output_dir):
+                shutil.rmtree(output_dir)
+            os.rename(staging, output_dir)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self._touch(key)
+        return True
+
+    def _touch(self, key):
+        """Mark an entry as used; prune() ages entries by entry.json's mtime."""
+        try:
+            os.utime(os.path.join(self._entry_dir(key), "entry.json"))
+        except OSError:
+            pass
+
+    def _entries(self):
+        """(entry_dir, metadata or None, last used) for every entry in the store."""
+        try:
+            prefixes = sorted(os.listdir(self.root))
+        except FileNotFoundError:
+            return []
+        entries = []
+        for prefix in prefixes:
+            prefix_dir = os.path.join(self.root, prefix)
+            if prefix.startswith(".") or not os.path.isdir(prefix_dir):
+                continue
+            for name in sorted(os.listdir(prefix_dir)):
+                # .store-* and .restore-* are another run's work in progress.
+                if name.startswith("."):
+                    continue
+                entry_dir = os.path.join(prefix_dir, name)
+                entry_path = os.path.join(entry_dir, "entry.json")
+                try:
+                    with open(entry_path, "r", encoding="utf-8") as handle:
+                        metadata = json.load(handle)
+                    used_at = os.stat(entry_path).st_mtime
+                except (OSError, json.JSONDecodeError):
+                    metadata, used_at = None, 0.0
+                entries.append((entry_dir, metadata, used_at))
+        return entries
+
+    @staticmethod
+    def _owned_bytes(entry_dir):
+        """Bytes only the cache holds: files no session folder still links to."""
+        total = 0
+        for directory, _, files in os.walk(entry_dir):
+            for name in files:
+                try:
+                    stat = os.lstat(os.path.join(directory, name))
+                except OSError:
+                    continue
+                if stat.st_nlink < 2:
+                    total += stat.st_size
+        return total
+
+    def prune(self, max_bytes=None, max_age_seconds=DEFAULT_MAX_AGE_SECONDS, now=None):
+        """
+        Remove entries no current run can hit, then enforce the caps.
+
+        Entries for another parameter hash or GGIR version (or unreadable
+        ones) always go, as do entries unused for max_age_seconds. If the
+        bytes only the cache holds still exceed max_bytes, the least
+        recently used entries are removed until they fit. None disables a
+        cap. Returns {"removed", "freed_bytes", "kept", "kept_bytes"}.
+        """
+        now = time.time() if now is None else now
+        removed = freed = 0
+        kept = []
+        for entry_dir, metadata, used_at in self._entries():
+            size = self._owned_bytes(entry_dir)
+            stale = (
+                not isinstance(metadata, dict)
+                or metadata.get("parameters_hash") != self.parameters_hash
+                or metadata.get("ggir_version") != self.version
+                or (max_age_seconds is not None and now - used_at > max_age_seconds)
+            )
+            if stale:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                removed += 1
+                freed += size
+            else:
+                kept.append((used_at, entry_dir, size))
+
+        kept.sort()
+        kept_bytes = sum(size for _, _, size in kept)
+        while max_bytes is not None and kept and kept_bytes > max_bytes:
+            _, entry_dir, size = kept.pop(0)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            removed += 1
+            freed += size
+            kept_bytes -= size
+        return {"removed": removed, "freed_bytes": freed, "kept": len(kept), "kept_bytes": kept_bytes}
+
+    @staticmethod
+    def _restore_file(source, destination, old_name, new_name):
+        if (
+            old_name != new_name
+            and source.endswith(_TEXT_SUFFIXES)
+            and os.path.getsize(source) <= _TEXT_REWRITE_MAX_BYTES
+        ):
+            with open(source, "rb") as handle:
+                data = handle.read()
+            old_bytes = old_name.encode("utf-8")
+            if old_bytes in data:
+                with open(destination, "wb") as handle:
+                    handle.write(data.replace(old_bytes, new_name.encode("utf-8")))
+                shutil.copystat(source, destination)
+                return
+        _link_or_copy(source, destination)
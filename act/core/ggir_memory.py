@@ -0,0 +1,183 @@
+import collections
+import contextlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+
+from act.utils.cache_files import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+HISTORY_VERSION = 1
+# Peak RSS per input byte until a GGIR run has been measured on this host;
+# part 1 of a 9-day 100 Hz RAW.csv (~3 GB) peaks at a few GB.
+DEFAULT_BYTES_PER_INPUT_BYTE = 1.5
+# R plus the loaded GGIR namespace, before any data is read.
+MIN_ESTIMATE_BYTES = 512 * 1024 ** 2
+# Headroom on top of an estimate, since peaks vary between runs.
+SAFETY_FACTOR = 1.2
+# Share of physical memory GGIR may use when no budget is given.
+DEFAULT_BUDGET_FRACTION = 0.8
+_EWMA_ALPHA = 0.3
+
+_SIZE_SUFFIXES = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+_SIZE_PATTERN = re.compile(r"^\s*(?P<number>\d+(?:\.\d+)?)\s*(?P<unit>[KMGTkmgt]?)(?:i?[Bb])?\s*$")
+
+
+def parse_size(value):
+    """Parse a byte size such as "48G", "512MiB" or "1000000" into bytes."""
+    match = _SIZE_PATTERN.match(str(value))
+    if not match:
+        raise ValueError(f"Invalid byte size: {value!r}")
+    size = float(match.group("number")) * _SIZE_SUFFIXES[match.group("unit").upper()]
+    if size <= 0:
+        raise ValueError("size must be positive")
+    return int(size)
+
+
+def default_budget():
+    """DEFAULT_BUDGET_FRACTION of physical memory, or None when it cannot be read."""
+    try:
+        total = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, OSError, ValueError):
+        return None
+    return int(total * DEFAULT_BUDGET_FRACTION) if total > 0 else None
+
+
+def wait_with_peak_rss(process):
+    """
+    Wait for a Popen child and return its peak RSS in bytes.
+
+    The rusage from wait4() covers the child and the descendants it reaped,
+    so the `sh -c` wrapper around Rscript still reports R's peak. Returns
+    None where wait4() is unavailable.
+    """
+    if not hasattr(os, "wait4"):
+        process.wait()
+        return None
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    return usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+
+
+class MemoryHistory:
+    """
+    Observed GGIR peak RSS, persisted across runs.
+
+    A session seen before at the same input size is estimated from its own
+    last peak. Anything else uses an exponentially weighted peak-per-input-byte
+    ratio learned from every measured session.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.bytes_per_input_byte = None
+        self.samples = 0
+        self.sessions = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Unable to read GGIR memory history %s (%s).", self.path, exc)
+            return
+        if not isinstance(payload, dict) or payload.get("version") != HISTORY_VERSION:
+            return
+        ratio = payload.get("bytes_per_input_byte")
+        if isinstance(ratio, (int, float)) and ratio > 0:
+            self.bytes_per_input_byte = float(ratio)
+            self.samples = int(payload.get("samples", 1))
+        sessions = payload.get("sessions")
+        if isinstance(sessions, dict):
+            self.sessions = sessions
+
+    def estimate(self, key, input_bytes):
+        """Expected peak RSS in bytes for one GGIR run over input_bytes of RAW.csv."""
+        with self._lock:
+            seen = self.sessions.get(key)
+            if seen and seen.get("input_bytes") == input_bytes and seen.get("peak_rss"):
+                peak = seen["peak_rss"]
+            else:
+                peak = input_bytes * (self.bytes_per_input_byte or DEFAULT_BYTES_PER_INPUT_BYTE)
+        return int(max(MIN_ESTIMATE_BYTES, peak) * SAFETY_FACTOR)
+
+    def observe(self, key, input_bytes, peak_rss):
+        if not peak_rss or input_bytes <= 0:
+            return
+        with self._lock:
+            self.sessions[key] = {"input_bytes": int(input_bytes), "peak_rss": int(peak_rss)}
+            ratio = peak_rss / input_bytes
+            if self.bytes_per_input_byte is None:
+                self.bytes_per_input_byte = ratio
+            else:
+                self.bytes_per_input_byte = (
+                    _EWMA_ALPHA * ratio + (1 - _EWMA_ALPHA) * self.bytes_per_input_byte
+                )
+            self.samples += 1
+
+    def save(self):
+        with self._lock:
+            payload = {
+                "version": HISTORY_VERSION,
+                "bytes_per_input_byte": self.bytes_per_input_byte,
+                "samples": self.samples,
+                "sessions": dict(self.sessions),
+                "updated_at": time.time(),
+            }
+        try:
+            write_json_atomic(self.path, payload, prefix=".ggir-memory-")
+        except OSError as exc:
+            logger.warning("Unable to write GGIR memory history %s (%s).", self.path, exc)
+
+
+class MemoryBudget:
+    """
+    Admit jobs while their estimated peaks fit in limit_bytes.
+
+    Admission is first come, first served so a large session is not starved
+    by smaller ones queued behind it. A job estimated above the whole budget
+    still runs, but only on its own. limit_bytes=None admits everything.
+    """
+
+    def __init__(self, limit_bytes=None, clock=time.monotonic):
+        self.limit = limit_bytes
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._queue = collections.deque()
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.wait_seconds = 0.0
+
+    def _fits(self, nbytes):
+        return self.limit is None or self.in_use == 0 or self.in_use + nbytes <= self.limit
+
+    @contextlib.contextmanager
+    def reserve(self, nbytes):
+        ticket = object()
+        started = self._clock()
+        with self._condition:
+            self._queue.append(ticket)
+            while self._queue[0] is not ticket or not self._fits(nbytes):
+                self._condition.wait()
+            self._queue.popleft()
+            self.in_use += nbytes
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            self.wait_seconds += self._clock() - started
+            # The next ticket may fit as well.
+            self._condition.notify_all()
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.in_use -= nbytes
+                self._condition.notify_all()
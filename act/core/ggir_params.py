@@ -0,0 +1,164 @@
+import json
+import logging
+import os
+import re
+
+from act.utils.cache_files import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+RECORD_FILENAME = "ggir_parameters.json"
+PROJECT_RECORD_FILENAME = ".ggir-parameters.json"
+
+# Earliest GGIR part that reads each argument of the GGIR(...) call. A change
+# reruns from that part onward against the milestones earlier parts left in
+# meta/basic (part 1) and meta/ms2.out ... ms5.out (parts 2-5).
+PARAMETER_PARTS = {
+    # Part 1: raw signal, calibration, epoch metrics
+    "studyname": 1,
+    "desiredtz": 1,
+    "idloc": 1,
+    "print.filename": 1,
+    "do.ENMO": 1,
+    "windowsizes": 1,
+    "imputeTimegaps": 1,
+    # Part 2: non-wear, imputation, day-level summaries
+    "do.report": 2,
+    "epochvalues2csv": 2,
+    "ignorenonwear": 2,
+    "hrs.del.start": 2,
+    "hrs.del.end": 2,
+    "maxdur": 2,
+    # Part 3/4: sleep detection and sleep summaries
+    "loglocation": 3,
+    "colid": 3,
+    "coln1": 3,
+    "sleepwindowType": 3,
+    # Part 5: day segments and activity thresholds
+    "acc.metric": 5,
+    "timewindow": 5,
+    "threshold.lig": 5,
+    "threshold.mod": 5,
+    "threshold.vig": 5,
+    # Part 6 and the visual report
+    "part6CR": 6,
+    "visualreport": 6,
+    "old_visualreport": 6,
+}
+# Arguments the pipeline sets per run rather than per configuration.
+IGNORED_PARAMETERS = frozenset({"mode", "overwrite", "datadir", "outputdir"})
+
+
+def ggir_call_block(text):
+    """Return the GGIR(...) call in an R script's text, comments removed."""
+    start = text.find("GGIR(")
+    if start < 0:
+        raise ValueError("No GGIR( call found")
+    depth = 0
+    end = start
+    for end in range(start + len("GGIR"), len(text)):
+        if text[end] == "(":
+            depth += 1
+        elif text[end] == ")":
+            depth -= 1
+            if depth == 0:
+                break
+    block = text[start:end + 1]
+    return "\n".join(line.split("#", 1)[0] for line in block.splitlines())
+
+
+def parse_ggir_parameters(script_path):
+    """{argument: value} for the GGIR(...) call in script_path, whitespace removed."""
+    with open(script_path, "r", encoding="utf-8") as handle:
+        block = ggir_call_block(handle.read())
+    body = block[len("GGIR("):-1]
+
+    arguments = []
+    depth = 0
+    current = []
+    for char in body:
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        if char == "," and depth == 0:
+            arguments.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    arguments.append("".join(current))
+
+    parameters = {}
+    for argument in arguments:
+        name, separator, value = argument.partition("=")
+        if not separator:
+            continue
+        parameters[name.strip()] = re.sub(r"\s+", "", value)
+    return parameters
+
+
+def first_affected_part(previous, current):
+    """
+    Earliest GGIR part whose parameters differ between two parameter dicts,
+    or None when they match. Unknown arguments count as part 1.
+    """
+    names = (set(previous) | set(current)) - IGNORED_PARAMETERS
+    changed = [name for name in names if previous.get(name) != current.get(name)]
+    if not changed:
+        return None
+    return min(PARAMETER_PARTS.get(name, 1) for name in changed)
+
+
+def read_record(path):
+    """Return a stored {"parameters", "ggir_version"} record, or None."""
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            record = json.load(handle)
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as exc:
+        logger.warning("Unable to read GGIR parameter record %s (%s).", path, exc)
+        return None
+    if not isinstance(record, dict) or not isinstance(record.get("parameters"), dict):
+        return None
+    return record
+
+
+def write_record(path, parameters, version, consistent=True, relinked_from=None):
+    """
+    Store the parameters and GGIR version outputs were produced with. A
+    project record marked consistent=False has sessions still pending a rerun.
+    relinked_from names the session ("sub-8001_ses-2") whose cached outputs
+    were relinked here; their milestones still carry that name.
+    """
+    record = {"parameters": parameters, "ggir_version": version, "consistent": consistent}
+    if relinked_from is not None:
+        record["relinked_from"] = relinked_from
+    write_json_atomic(
+        path,
+        record,
+        prefix=".ggir-parameters-",
+        indent=2,
+        sort_keys=True,
+    )
+
+
+def milestones_present(session_output_dir, part):
+    """
+    True when the milestone folders GGIR part `part` builds on exist under
+    output_<ses>/meta: basic from part 1, then ms2.out ... ms<part-1>.out.
+    """
+    meta = os.path.join(session_output_dir, "meta")
+    required = ["basic"] + [f"ms{earlier}.out" for earlier in range(2, part)]
+    return all(os.path.isdir(os.path.join(meta, name)) for name in required)
+
+
+def start_part(record, parameters, version):
+    """
+    GGIR part a session must rerun from to match the current parameters and
+    version, or None when its outputs are current. A GGIR version change
+    reruns everything.
+    """
+    if version and record.get("ggir_version") and record["ggir_version"] != version:
+        return 1
+    return first_affected_part(record["parameters"], parameters)
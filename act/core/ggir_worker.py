@@ -0,0 +1,300 @@
+"""
+Long-lived R processes that load GGIR once and run one session per request.
+
+Starting Rscript and attaching GGIR costs seconds per session, which adds up
+when a run re-processes a handful of sessions on a pool of workers. An
+RWorkerPool starts `size` copies of ggir_worker.R, health-checks them with a
+ping before reuse, and restarts any worker that crashed, timed out or stopped
+answering. Requests and replies are single tab-separated lines over the
+worker's stdin/stdout (see ggir_worker.R); GGIR's own output on the same
+stream is logged with the session it belongs to.
+"""
+import contextlib
+import itertools
+import logging
+import queue
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = "act/core/ggir_worker.R"
+REPLY_PREFIX = "@@ggir-worker\t"
+# Attaching GGIR from an NFS library on a cold cache can take minutes.
+STARTUP_TIMEOUT = 300
+PING_TIMEOUT = 30
+# Idle workers are pinged before reuse once they have been idle this long.
+HEALTH_CHECK_INTERVAL = 60
+STOP_TIMEOUT = 10
+
+
+class WorkerError(RuntimeError):
+    """An R worker died, timed out or broke protocol."""
+
+
+def reset_peak_rss(pid):
+    """Reset the kernel's peak RSS (VmHWM) of pid; False where that is unsupported."""
+    try:
+        with open(f"/proc/{pid}/clear_refs", "w", encoding="ascii") as handle:
+            handle.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def peak_rss(pid):
+    """Peak RSS (VmHWM) of pid in bytes, or None."""
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+class RWorker:
+    """One ggir_worker.R process and the thread reading its stdout."""
+
+    def __init__(self, name, command, startup_timeout=STARTUP_TIMEOUT):
+        self.name = name
+        self.command = list(command)
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.pid = None
+        self.ggir_version = None
+        self.jobs = 0
+        self.last_used = 0.0
+        self._replies = None
+        self._ids = itertools.count(1)
+        self._log_prefix = f"[{name}] "
+
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        started = time.monotonic()
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=1,
+            universal_newlines=True,
+        )
+        self._replies = queue.Queue()
+        threading.Thread(
+            target=self._read,
+            args=(self.process, self._replies),
+            name=f"{self.name}-stdout",
+            daemon=True,
+        ).start()
+        try:
+            reply = self._next_reply(self.startup_timeout)
+            if reply[0] != "READY":
+                raise WorkerError(f"{self.name} sent {reply[0]} before READY")
+        except WorkerError:
+            self.stop()
+            raise
+        self.pid = int(reply[1]) if len(reply) > 1 and reply[1].isdigit() else self.process.pid
+        self.ggir_version = reply[2] if len(reply) > 2 else None
+        self.jobs = 0
+        self.last_used = time.monotonic()
+        logger.info(
+            "ggir_worker_ready worker=%s pid=%s ggir_version=%s startup_s=%.3f",
+            self.name,
+            self.pid,
+            self.ggir_version,
+            self.last_used - started,
+        )
+
+    def _read(self, process, replies):
+        for line in process.stdout:
+            # GGIR progress output may leave the line open before a reply.
+            output, separator, reply = line.rstrip("\n").partition(REPLY_PREFIX)
+            if output.strip():
+                logger.info("%s%s", self._log_prefix, output)
+            if separator:
+                replies.put(reply.split("\t"))
+        replies.put(None)
+
+    def _next_reply(self, timeout):
+        try:
+            reply = self._replies.get(timeout=timeout)
+        except queue.Empty:
+            raise WorkerError(f"{self.name} did not reply within {timeout}s") from None
+        if reply is None:
+            raise WorkerError(f"{self.name} exited with status {self.process.wait()}")
+        return reply
+
+    def _request(self, kind, *fields, timeout=None):
+        """Send one request and return the fields of its matching reply."""
+        request_id = str(next(self._ids))
+        line = "\t".join([kind, request_id, *(str(field) for field in fields)])
+        if line.count("\n") or len(line.split("\t")) != len(fields) + 2:
+            raise ValueError(f"Request fields may not contain tabs or newlines: {fields}")
+        try:
+            self.process.stdin.write(line + "\n")
+            self.process.stdin.flush()
+        except (OSError, ValueError) as exc:
+            raise WorkerError(f"{self.name} is not accepting requests ({exc})") from exc
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            reply = self._next_reply(remaining)
+            if len(reply) > 1 and reply[1] == request_id:
+                return reply
+            # A late reply to a request that already timed out.
+            logger.debug("ggir_worker_stale_reply worker=%s reply=%s", self.name, reply)
+
+    def ping(self, timeout=PING_TIMEOUT):
+        """True when the worker answers a ping within timeout seconds."""
+        if not self.alive():
+            return False
+        try:
+            return self._request("PING", timeout=timeout)[0] == "PONG"
+        except WorkerError as exc:
+            logger.warning("ggir_worker_unhealthy worker=%s error=%s", self.name, exc)
+            return False
+
+    def run(self, project_dir, deriv_dir, relative_path, start_part=1, timeout=None):
+        """
+        Run GGIR parts start_part..6 for one session CSV.
+
+        Returns {"ok", "message", "r_seconds", "wall_seconds", "peak_rss"};
+        peak_rss covers this job only and is None where the kernel's peak
+        cannot be reset. Raises WorkerError if the worker dies or times out.
+        """
+        measured = self.pid is not None and reset_peak_rss(self.pid)
+        self._log_prefix = f"[{relative_path}] "
+        started = time.monotonic()
+        try:
+            reply = self._request(
+                "RUN", project_dir, deriv_dir, relative_path, int(start_part), timeout=timeout
+            )
+        finally:
+            self._log_prefix = f"[{self.name}] "
+            self.last_used = time.monotonic()
+        self.jobs += 1
+        try:
+            r_seconds = float(reply[3])
+        except (IndexError, ValueError):
+            r_seconds = None
+        return {
+            "ok": len(reply) > 2 and reply[2] == "ok",
+            "message": reply[4] if len(reply) > 4 else "",
+            "r_seconds": r_seconds,
+            "wall_seconds": round(self.last_used - started, 3),
+            "peak_rss": peak_rss(self.pid) if measured else None,
+        }
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        if self.process is None:
+            return
+        process, self.process = self.process, None
+        try:
+            process.stdin.write("QUIT\n")
+            process.stdin.close()
+        except (OSError, ValueError):
+            pass
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+class RWorkerPool:
+    """
+    A fixed set of RWorkers handed out one job at a time.
+
+    Use as a context manager. acquire() yields an idle, healthy worker; a
+    worker that raises WorkerError during a job is restarted before it is
+    handed out again.
+    """
+
+    def __init__(
+        self,
+        size,
+        command=None,
+        startup_timeout=STARTUP_TIMEOUT,
+        health_check_interval=HEALTH_CHECK_INTERVAL,
+        job_timeout=None,
+    ):
+        self.command = list(command or ["Rscript", WORKER_SCRIPT])
+        self.health_check_interval = health_check_interval
+        self.job_timeout = job_timeout
+        self.workers = [
+            RWorker(f"ggir-worker-{index}", self.command, startup_timeout)
+            for index in range(1, max(1, int(size)) + 1)
+        ]
+        self.restarts = 0
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start every worker in parallel; raises WorkerError if any fails to come up."""
+        with ThreadPoolExecutor(max_workers=len(self.workers)) as pool:
+            futures = [pool.submit(worker.start) for worker in self.workers]
+        errors = [future.exception() for future in futures if future.exception() is not None]
+        if errors:
+            self.close()
+            raise WorkerError(f"{len(errors)} of {len(self.workers)} GGIR workers failed to start: {errors[0]}")
+        for worker in self.workers:
+            self._idle.put(worker)
+
+    def close(self):
+        for worker in self.workers:
+            worker.stop()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _restart(self, worker, reason):
+        logger.warning("ggir_worker_restart worker=%s reason=%s", worker.name, reason)
+        worker.stop()
+        with self._lock:
+            self.restarts += 1
+        worker.start()
+
+    @contextlib.contextmanager
+    def acquire(self):
+        worker = self._idle.get()
+        try:
+            if not worker.alive():
+                self._restart(worker, "exited")
+            elif time.monotonic() - worker.last_used >= self.health_check_interval and not worker.ping():
+                self._restart(worker, "no_ping_reply")
+            try:
+                yield worker
+            except WorkerError as exc:
+                self._restart(worker, exc)
+                raise
+        finally:
+            self._idle.put(worker)
+
+    def run(self, project_dir, deriv_dir, relative_path, start_part=1):
+        """RWorker.run() on the next free worker; the result also names the worker."""
+        with self.acquire() as worker:
+            result = worker.run(
+                project_dir, deriv_dir, relative_path, start_part, timeout=self.job_timeout
+            )
+        result["worker"] = worker.name
+        logger.info(
+            "ggir_worker_job worker=%s session=%s ok=%s r_s=%s wall_s=%s peak_rss=%s",
+            worker.name,
+            relative_path,
+            result["ok"],
+            result["r_seconds"],
+            result["wall_seconds"],
+            result["peak_rss"],
+        )
+        return result
@@ -39,6 +39,35 @@ def _daysago_type(value: str) -> int:
     return parsed
 
 
+def _workers_type(value: str) -> int:
+    try:
+        parsed = int(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError("worker count must be an integer") from exc
+
+    if parsed < 1:
+        raise argparse.ArgumentTypeError("worker count must be at least 1")
+    return parsed
+
+
+def _rate_type(value: str) -> int:
+    from act.utils.io_scheduler import parse_rate
+
+    try:
+        return parse_rate(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def _size_type(value: str) -> int:
+    from act.core.ggir_memory import parse_size
+
+    try:
+        return parse_size(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
 def _token_type(value: str) -> str:
     if not value.strip():
         raise argparse.ArgumentTypeError("token must be a non-empty string")
@@ -85,6 +114,73 @@ def build_parser() -> argparse.ArgumentParser:
         required=True,
         help="Target system path profile",
     )
+    parser.add_argument(
+        "--ingest-workers",
+        type=_workers_type,
+        default=1,
+        help="Number of subjects ingested concurrently (default: 1, serial)",
+    )
+    parser.add_argument(
+        "--ggir-workers",
+        type=_workers_type,
+        default=1,
+        help=(
+            "Number of concurrent GGIR R processes; above 1, each session runs as its "
+            "own job (default: 1, one R process per project)"
+        ),
+    )
+    parser.add_argument(
+        "--ggir-memory-budget",
+        type=_size_type,
+        default=None,
+        help=(
+            "RAM the concurrent GGIR sessions may use together, e.g. 48G; sessions wait "
+            "until their estimated peak fits (default: 80%% of physical memory)"
+        ),
+    )
+    parser.add_argument(
+        "--ggir-persistent-workers",
+        action="store_true",
+        help=(
+            "Run GGIR sessions on --ggir-workers long-lived R processes that load GGIR "
+            "once, instead of starting Rscript per session"
+        ),
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help=(
+            "Use the cached REDCap report under res/ instead of calling the API "
+            "(fails if no cached report exists)"
+        ),
+    )
+    parser.add_argument(
+        "--manifest-backend",
+        choices=("json", "sqlite"),
+        default="json",
+        help=(
+            "Manifest storage: json (res/data.json only, default) or sqlite "
+            "(indexed res/manifest.sqlite3 with per-subject commits; data.json is still exported)"
+        ),
+    )
+    parser.add_argument(
+        "--io-max-bytes-per-sec",
+        type=_rate_type,
+        default=None,
+        help=(
+            "Cap copy and verify throughput per mount, e.g. 200M or 1.5GiB/s "
+            "(default: unlimited)"
+        ),
+    )
+    parser.add_argument(
+        "--io-max-concurrent",
+        type=_workers_type,
+        default=None,
+        help=(
+            "Cap concurrent copy/verify operations per mount; waiting subjects are "
+            "served round-robin (default: unlimited)"
+        ),
+    )
     manifest_mode_group = parser.add_mutually_exclusive_group()
     manifest_mode_group.add_argument(
         "--rebuild-manifest-only",
@@ -96,15 +192,78 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Reconcile manifest-only mode (verifies or repairs canonical CSVs and skips GGIR/plotting)",
     )
+    manifest_mode_group.add_argument(
+        "--plan-only",
+        action="store_true",
+        help=(
+            "Dry-run ingest: write res/ingest_plan.json with the copies, renames, bytes "
+            "and estimated duration, without touching the study roots"
+        ),
+    )
+    parser.add_argument(
+        "--verify",
+        choices=("stat", "sample", "full"),
+        default="full",
+        help=(
+            "Reconcile verification tier: stat (size/mtime), sample (fixed-offset "
+            "block hashes), or full (SHA-256, default). Requires --reconcile-manifest-only."
+        ),
+    )
     return parser
 
 
+def _run_mode(args: argparse.Namespace) -> str:
+    if args.plan_only:
+        return "plan"
+    if args.rebuild_manifest_only:
+        return "rebuild"
+    if args.reconcile_manifest_only:
+        return "reconcile"
+    return "full"
+
+
 def main(argv: list[str] | None = None) -> int:
-    from act.utils.group import Group
-    from act.utils.pipe import Pipe
+    from act.utils import metrics
 
     _configure_logging()
-    args = build_parser().parse_args(argv)
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.verify != "full" and not args.reconcile_manifest_only:
+        parser.error("--verify requires --reconcile-manifest-only")
+
+    metrics.start_run(
+        metrics.metrics_path_for(os.getenv("LOG_FILE")),
+        system=args.system,
+        mode=_run_mode(args),
+        daysago=args.daysago,
+        ingest_workers=args.ingest_workers,
+        ggir_workers=args.ggir_workers,
+        ggir_persistent_workers=args.ggir_persistent_workers,
+    )
+    exit_code = 1
+    try:
+        exit_code = _run(args)
+    finally:
+        snapshot = metrics.finish_run(status="ok" if exit_code == 0 else "error")
+        if snapshot is not None:
+            logging.info(
+                "run_metrics status=%s wall_s=%s stages=%s path=%s",
+                snapshot["status"],
+                snapshot["wall_s"],
+                ",".join(
+                    f"{name}:{stage['wall_s']:.1f}s"
+                    for name, stage in snapshot["stages"].items()
+                ),
+                metrics.metrics_path_for(os.getenv("LOG_FILE")),
+            )
+    return exit_code
+
+
+def _run(args: argparse.Namespace) -> int:
+    from act.utils import metrics
+    from act.utils.group import Group
+    from act.utils.pipe import Pipe
+    from act.utils.redcap_client import RedcapError
 
     p = Pipe(
         token=args.token,
@@ -112,30 +271,64 @@ def main(argv: list[str] | None = None) -> int:
         system=args.system,
         rebuild_manifest_only=args.rebuild_manifest_only,
         reconcile_manifest_only=args.reconcile_manifest_only,
+        ingest_workers=args.ingest_workers,
+        verify=args.verify,
+        offline=args.offline,
+        manifest_backend=args.manifest_backend,
+        plan_only=args.plan_only,
+        io_bytes_per_second=args.io_max_bytes_per_sec,
+        io_max_concurrent=args.io_max_concurrent,
+        ggir_workers=args.ggir_workers,
+        ggir_memory_budget=args.ggir_memory_budget,
+        ggir_persistent_workers=args.ggir_persistent_workers,
     )
 
     try:
         result = p.run_pipe()
-    except ValueError as exc:
+    except (ValueError, RedcapError) as exc:
         logging.error("%s", exc)
         return 1
 
+    if args.plan_only:
+        plan = result or {}
+        totals = plan.get("totals", {})
+        estimate = plan.get("estimate", {})
+        logging.info(
+            "ingest_plan subjects=%s changed=%s copies=%s verifies=%s renames=%s missing_sources=%s bytes=%s estimated_s=%s throughput=%s plan=%s",
+            totals.get("subjects", 0),
+            totals.get("subjects_changed", 0),
+            totals.get("copies", 0),
+            totals.get("verifies", 0),
+            totals.get("renames", 0),
+            totals.get("missing_sources", 0),
+            totals.get("bytes_to_transfer", 0),
+            estimate.get("seconds", 0),
+            estimate.get("throughput_source", "default"),
+            plan.get("plan_path"),
+        )
+        return 0
+
     if args.reconcile_manifest_only:
         report = result or {}
         logging.info(
-            "reconcile_summary total=%s repaired=%s mismatched=%s missing_source=%s missing_dest=%s ambiguous_dest=%s",
+            "reconcile_summary total=%s repaired=%s mismatched=%s missing_source=%s missing_dest=%s ambiguous_dest=%s verify=%s elapsed_s=%s bytes_read=%s",
             report.get("total_records", 0),
             report.get("repaired", 0),
             report.get("mismatched", 0),
             report.get("missing_source", 0),
             report.get("missing_dest", 0),
             report.get("ambiguous_dest", 0),
+            report.get("verify", args.verify),
+            report.get("elapsed_seconds", 0),
+            report.get("bytes_read", 0),
         )
         return 0 if not report.get("errors") else 1
 
     if not args.rebuild_manifest_only:
-        Group(args.system).plot_person()
-        Group(args.system).plot_session()
+        with metrics.span("plot", kind="person"):
+            Group(args.system).plot_person()
+        with metrics.span("plot", kind="session"):
+            Group(args.system).plot_session()
     return 0
 
 
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import importlib
+import importlib.util
 import json
 from pathlib import Path
 import sys
+import threading
+import time
 import types
+from urllib.parse import parse_qs
 
 import pytest
 
@@ -33,6 +38,105 @@ except ModuleNotFoundError:
     pass
 
 
+@pytest.fixture
+def real_comparison_utils():
+    """Load the real comparison_utils module, bypassing the import stub above."""
+    module_path = PROJECT_ROOT / "act" / "utils" / "comparison_utils.py"
+    spec = importlib.util.spec_from_file_location(
+        "act_tests_real_comparison_utils", module_path
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+DEFAULT_REDCAP_REPORT_CSV = b"lab_id,boost_id\n1101,8001\n1102,7012\n"
+
+
+class StandInRedcap:
+    """
+    Local HTTP stand-in for the REDCap API.
+
+    Responses are scripted as (status, body, headers, delay_seconds,
+    truncate_to) tuples consumed in order; once the script is exhausted every
+    request gets a 200 with `report_csv`. truncate_to sends only that many
+    body bytes under the full Content-Length. Each request's decoded form
+    fields are appended to `requests`.
+    """
+
+    def __init__(self):
+        self.report_csv = DEFAULT_REDCAP_REPORT_CSV
+        self.script = []
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/redcap/api/"
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    def respond(self, status=200, body=None, headers=None, delay=0.0, truncate_to=None):
+        self.script.append((status, body, headers or {}, delay, truncate_to))
+
+    def _next_response(self, fields):
+        with self._lock:
+            self.requests.append(fields)
+            if self.script:
+                return self.script.pop(0)
+        return 200, None, {}, 0.0, None
+
+    def _handler_class(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                form = parse_qs(self.rfile.read(length).decode("utf-8"))
+                fields = {key: values[0] for key, values in form.items()}
+                status, body, headers, delay, truncate_to = stand_in._next_response(fields)
+                if delay:
+                    time.sleep(delay)
+                if body is None:
+                    body = stand_in.report_csv if status == 200 else b'{"error": "stand-in"}'
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "text/csv")
+                    self.send_header("Content-Length", str(len(body)))
+                    for key, value in headers.items():
+                        self.send_header(key, value)
+                    self.end_headers()
+                    self.wfile.write(body if truncate_to is None else body[:truncate_to])
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if not self._thread.is_alive():
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=5)
+
+
+@pytest.fixture
+def redcap_server():
+    """Run a scripted stand-in REDCap API on localhost for the test."""
+    server = StandInRedcap().start()
+    try:
+        yield server
+    finally:
+        server.stop()
+
+
 @pytest.fixture
 def temp_study_roots(tmp_path: Path) -> dict[str, Path]:
     """Create local-only roots used by filesystem-facing tests."""
@@ -191,3 +295,14 @@ def subject_tree_factory(temp_study_roots: dict[str, Path], accel_filename_facto
         return created
 
     return _factory
+
+
+@pytest.fixture
+def actigraph_raw_factory(tmp_path: Path):
+    """Write small synthetic ActiGraph RAW.csv files (a few minutes by default)."""
+    from act.benchmarks.actigraph_raw import write_raw_csv
+
+    def _factory(name: str = "1101 (2025-03-01)RAW.csv", days: float = 0.005, **kwargs):
+        return write_raw_csv(tmp_path / name, days=days, **kwargs)
+
+    return _factory
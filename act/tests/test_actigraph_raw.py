@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from act.benchmarks.actigraph_raw import HEADER_LINES, actigraph_header, random_nonwear
+from act.utils.copy_engine import copy_file
+
+
+def _read(path):
+    return pd.read_csv(path, skiprows=HEADER_LINES)
+
+
+def test_header_matches_actilife_layout():
+    header = actigraph_header(datetime(2025, 3, 1, 9, 5, 0), 80).splitlines()
+
+    assert len(header) == HEADER_LINES + 1
+    assert "date format M/d/yyyy at 80 Hz" in header[0]
+    assert header[2] == "Start Time 09:05:00"
+    assert header[3] == "Start Date 3/1/2025"
+    assert header[-1] == "Timestamp,Accelerometer X,Accelerometer Y,Accelerometer Z"
+
+
+def test_rows_cover_duration_at_sample_rate(actigraph_raw_factory):
+    result = actigraph_raw_factory(days=120 / 86400, sample_rate=50, block_seconds=45)
+
+    frame = _read(result["path"])
+    assert len(frame) == result["samples"] == 120 * 50
+    assert frame["Timestamp"].iloc[0] == "3/1/2025 10:00:00.000"
+    assert frame["Timestamp"].iloc[1] == "3/1/2025 10:00:00.020"
+    assert frame["Timestamp"].iloc[-1] == "3/1/2025 10:01:59.980"
+    assert frame.iloc[:, 1:].abs().to_numpy().max() <= 8.0
+
+
+def test_nonwear_gap_is_flat_and_carries_calibration_offset(actigraph_raw_factory):
+    result = actigraph_raw_factory(
+        days=1 / 24,
+        sample_rate=30,
+        nonwear=((0.5, 0.25),),
+        calibration_offset=(0.05, -0.02, 0.0),
+    )
+
+    frame = _read(result["path"])
+    values = frame.iloc[:, 1:].to_numpy()
+    gap = values[30 * 1800:30 * 2700]
+    worn = values[: 30 * 1800]
+    assert gap.std(axis=0).max() < 0.013
+    assert worn.std(axis=0).min() > 0.05
+    np.testing.assert_allclose(gap.mean(axis=0), (0.05, -0.02, 1.0), atol=0.002)
+
+
+def test_output_is_deterministic_and_digest_matches(actigraph_raw_factory):
+    first = actigraph_raw_factory("a.csv", seed=3, digest=True)
+    second = actigraph_raw_factory("b.csv", seed=3, digest=True)
+
+    with open(first["path"], "rb") as handle:
+        data = handle.read()
+    assert first["sha256"] == second["sha256"] == hashlib.sha256(data).hexdigest()
+    assert first["bytes"] == len(data)
+
+
+def test_raw_file_survives_copy_engine(actigraph_raw_factory, tmp_path):
+    result = actigraph_raw_factory(digest=True)
+
+    copied = copy_file(result["path"], tmp_path / "sub-8001_ses-1_accel.csv", digest=True)
+
+    assert copied["sha256"] == result["sha256"]
+
+
+def test_random_nonwear_gaps_do_not_overlap():
+    gaps = random_nonwear(7, count=3, seed=5)
+
+    assert len(gaps) == 3
+    ends = [offset + duration for offset, duration in gaps]
+    assert all(end <= next_offset for end, (next_offset, _) in zip(ends, gaps[1:]))
+    assert ends[-1] <= 7 * 24
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+import os
+
+import act.utils.save as save_module
+from act.benchmarks import bench_pipeline, synthetic
+
+
+def test_synthetic_subjects_cover_both_studies_without_same_day_sessions():
+    subjects = synthetic.synthetic_subjects(10, sessions_per_subject=3, seed=1)
+
+    assert [subject["study"] for subject in subjects].count("obs") == 5
+    assert {subject["subject_id"] for subject in subjects if subject["study"] == "int"} == {
+        "8000",
+        "8001",
+        "8002",
+        "8003",
+        "8004",
+    }
+    for subject in subjects:
+        assert len(set(subject["dates"])) == 3
+        assert min(subject["dates"]) >= "2024-08-05"
+
+
+def test_build_tree_writes_rdss_lss_and_matching_manifest(tmp_path):
+    tree = synthetic.build_tree(tmp_path, 6, sessions_per_subject=2, file_bytes=128)
+
+    assert tree["rdss_files"] == 12
+    assert len(os.listdir(tree["rdss_dir"])) == 12
+    manifest = json.loads(open(tree["manifest_path"], encoding="utf-8").read())
+    assert len(manifest) == 6
+    for records in manifest.values():
+        assert [record["run"] for record in records] == [1, 2]
+        for record in records:
+            assert os.path.getsize(record["file_path"]) == record["size"] == 128
+            assert os.path.exists(os.path.join(tree["rdss_dir"], record["filename"]))
+    assert os.path.exists(os.path.join(tree["res_dir"], "redcap_report_43327.csv"))
+
+
+def test_pipeline_stages_run_on_small_tree(tmp_path, monkeypatch, real_comparison_utils):
+    monkeypatch.setattr(save_module, "ID_COMPARISONS", real_comparison_utils.ID_COMPARISONS)
+    monkeypatch.setattr(bench_pipeline, "ID_COMPARISONS", real_comparison_utils.ID_COMPARISONS)
+
+    result = bench_pipeline.run_scale(
+        8,
+        stages=("compare_ids", "save", "discover", "rebuild", "reconcile"),
+        workdir=str(tmp_path),
+        file_bytes=256,
+    )
+
+    stages = result["stages"]
+    assert stages["compare_ids"]["matched_subjects"] == 8
+    assert stages["save"]["sessions"] == 16
+    assert stages["discover"]["subjects"] == 8
+    assert stages["rebuild"]["subjects"] == 8
+    assert stages["reconcile_full"]["errors"] == 0
+    assert stages["reconcile_full"]["bytes_read"] == 16 * 256
+    assert os.listdir(tmp_path) == []
+
+
+def test_find_regressions_compares_latest_matching_run():
+    def run(host, seconds, parameters=None):
+        return {
+            "host": host,
+            "parameters": parameters or {"seed": 0},
+            "scales": [{"subjects": 100, "stages": {"save": {"seconds": seconds}}}],
+        }
+
+    history = [run("vm", 1.0), run("other", 0.1), run("vm", 2.0, {"seed": 1})]
+
+    baseline, regressions = bench_pipeline.find_regressions(run("vm", 1.5), history)
+    assert baseline is history[0]
+    assert regressions == [
+        {"subjects": 100, "stage": "save", "baseline_s": 1.0, "current_s": 1.5, "ratio": 1.5}
+    ]
+
+    _, within_threshold = bench_pipeline.find_regressions(run("vm", 1.2), history)
+    assert within_threshold == []
+    assert bench_pipeline.find_regressions(run("new-host", 9.0), history) == (None, [])
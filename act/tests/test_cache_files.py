@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from act.utils.cache_files import write_json_atomic
+
+
+def test_write_json_atomic_replaces_the_file_and_creates_its_directory(tmp_path):
+    path = tmp_path / "res" / "index.json"
+    write_json_atomic(str(path), {"b": 1, "a": 2}, prefix=".index-", sort_keys=True)
+    assert path.read_text(encoding="utf-8") == '{"a": 2, "b": 1}'
+
+    write_json_atomic(str(path), {"a": 3}, prefix=".index-", indent=2)
+    assert json.loads(path.read_text(encoding="utf-8")) == {"a": 3}
+    assert sorted(p.name for p in path.parent.iterdir()) == ["index.json"]
+
+
+def test_write_json_atomic_keeps_the_old_file_when_serialization_fails(tmp_path):
+    path = tmp_path / "index.json"
+    write_json_atomic(str(path), {"ok": True})
+
+    with pytest.raises(TypeError):
+        write_json_atomic(str(path), {"bad": object()})
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"ok": True}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["index.json"]
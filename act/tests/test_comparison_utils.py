@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from act.benchmarks.bench_compare_ids import build_inputs, legacy_match
+
+
+def test_match_report_to_rdss_matches_legacy_scan(real_comparison_utils):
+    report, rdss = build_inputs(n_files=600, n_subjects=120, seed=7)
+
+    expected = legacy_match(report, rdss)
+    actual = real_comparison_utils.ID_COMPARISONS._match_report_to_rdss(report, rdss)
+
+    assert list(actual.items()) == list(expected.items())
+
+
+def test_match_report_to_rdss_preserves_report_and_file_order(real_comparison_utils):
+    report = pd.DataFrame({"lab_id": [1102, 1101, 1300], "boost_id": [7012, 8001, 8002]})
+    rdss = pd.DataFrame(
+        {
+            "ID": ["1101", "1102", "1101", "9999"],
+            "Date": pd.to_datetime(
+                ["2025-01-03", "2025-01-02", "2025-01-01", "2025-01-04"]
+            ),
+            "filename": [
+                "1101 (2025-01-03)RAW.csv",
+                "1102 (2025-01-02)RAW.csv",
+                "1101 (2025-01-01)RAW.csv",
+                "9999 (2025-01-04)RAW.csv",
+            ],
+        }
+    )
+
+    result = real_comparison_utils.ID_COMPARISONS._match_report_to_rdss(report, rdss)
+
+    assert list(result.keys()) == ["7012", "8001"]
+    assert [row["filename"] for row in result["8001"]] == [
+        "1101 (2025-01-03)RAW.csv",
+        "1101 (2025-01-01)RAW.csv",
+    ]
+    assert result["7012"][0] == {
+        "filename": "1102 (2025-01-02)RAW.csv",
+        "labID": "1102",
+        "date": pd.Timestamp("2025-01-02"),
+    }
+
+
+def test_match_report_to_rdss_handles_empty_inputs(real_comparison_utils):
+    empty_rdss = pd.DataFrame({"ID": [], "Date": [], "filename": []})
+    report = pd.DataFrame({"lab_id": [1101], "boost_id": [8001]})
+
+    assert real_comparison_utils.ID_COMPARISONS._match_report_to_rdss(report, empty_rdss) == {}
+
+
+def _comparisons(module, tmp_path, server, offline=False, token="token"):
+    from act.utils.redcap_client import RedcapClient
+    from act.utils.report_cache import ReportCache
+
+    rdss_dir = tmp_path / "rdss"
+    rdss_dir.mkdir(exist_ok=True)
+    return module.ID_COMPARISONS(
+        rdss_dir=rdss_dir,
+        token=token,
+        report_cache=ReportCache(cache_dir=str(tmp_path / "res")),
+        offline=offline,
+        redcap_client=RedcapClient(url=server.url, backoff_base=0),
+    )
+
+
+def test_report_fetched_once_and_reused_from_disk(real_comparison_utils, redcap_server, tmp_path):
+    calls = redcap_server.requests
+
+    first = _comparisons(real_comparison_utils, tmp_path, redcap_server)
+    first._return_report()
+    first._return_report()
+    report, _ = _comparisons(real_comparison_utils, tmp_path, redcap_server)._return_report()
+
+    assert len(calls) == 1
+    assert report["boost_id"].tolist() == [8001, 7012]
+
+
+def test_report_cache_ignored_for_different_token(real_comparison_utils, redcap_server, tmp_path):
+    calls = redcap_server.requests
+
+    _comparisons(real_comparison_utils, tmp_path, redcap_server, token="a")._return_report()
+    _comparisons(real_comparison_utils, tmp_path, redcap_server, token="b")._return_report()
+
+    assert len(calls) == 2
+
+
+def test_offline_without_cache_raises(real_comparison_utils, redcap_server, tmp_path):
+    calls = redcap_server.requests
+
+    with pytest.raises(ValueError, match="Offline mode"):
+        _comparisons(real_comparison_utils, tmp_path, redcap_server, offline=True)._return_report()
+    assert calls == []
+
+
+def test_offline_serves_stale_cache(real_comparison_utils, redcap_server, tmp_path):
+    calls = redcap_server.requests
+    online = _comparisons(real_comparison_utils, tmp_path, redcap_server)
+    online._return_report()
+    online.report_cache.ttl_seconds = 0
+
+    offline = _comparisons(real_comparison_utils, tmp_path, redcap_server, offline=True)
+    offline.report_cache.ttl_seconds = 0
+    report, _ = offline._return_report()
+
+    assert len(calls) == 1
+    assert report["lab_id"].tolist() == [1101, 1102]
+
+
+def test_corrupted_cache_triggers_refetch(real_comparison_utils, redcap_server, tmp_path):
+    calls = redcap_server.requests
+    online = _comparisons(real_comparison_utils, tmp_path, redcap_server)
+    online._return_report()
+
+    with open(online.report_cache.body_path, "wb") as handle:
+        handle.write(b"lab_id,boost_id\n1101,")
+
+    _comparisons(real_comparison_utils, tmp_path, redcap_server)._return_report()
+
+    assert len(calls) == 2
+
+
+def test_report_parses_only_id_columns_with_inferred_types(
+    real_comparison_utils, redcap_server, tmp_path, capsys
+):
+    redcap_server.report_csv = (
+        b"record_id,lab_id,boost_id,notes\n"
+        b"1,0101,8001,a\n"
+        b"2,1102,07012,b\n"
+        b"3,1102,07012,b\n"
+    )
+
+    report, duplicates = _comparisons(
+        real_comparison_utils, tmp_path, redcap_server
+    )._return_report()
+
+    assert list(report.columns) == ["lab_id", "boost_id"]
+    assert report.to_dict(orient="records") == [{"lab_id": 101, "boost_id": 8001}]
+    assert duplicates["boost_id"].tolist() == [7012, 7012]
+    assert capsys.readouterr().out == ""
+
+
+def test_report_streams_without_cache(real_comparison_utils, redcap_server, tmp_path):
+    from act.utils.redcap_client import RedcapClient
+
+    rdss_dir = tmp_path / "rdss"
+    rdss_dir.mkdir()
+    comparisons = real_comparison_utils.ID_COMPARISONS(
+        rdss_dir=rdss_dir,
+        token="token",
+        redcap_client=RedcapClient(url=redcap_server.url),
+    )
+
+    report, _ = comparisons._return_report()
+
+    assert report["lab_id"].tolist() == [1101, 1102]
+    assert list(tmp_path.iterdir()) == [rdss_dir]
+
+
+def test_unparseable_report_is_not_cached(real_comparison_utils, redcap_server, tmp_path):
+    redcap_server.respond(200, body=b"<html>REDCap is down for maintenance</html>")
+    comparisons = _comparisons(real_comparison_utils, tmp_path, redcap_server)
+
+    with pytest.raises(ValueError, match="not a CSV"):
+        comparisons._return_report()
+
+    assert comparisons.report_cache.cached_path(token="token", allow_stale=True) is None
+    assert [path.name for path in (tmp_path / "res").iterdir()] == []
+
+    report, _ = _comparisons(real_comparison_utils, tmp_path, redcap_server)._return_report()
+    assert report["lab_id"].tolist() == [1101, 1102]
+    assert len(redcap_server.requests) == 2
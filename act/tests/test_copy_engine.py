@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import errno
+import hashlib
+import logging
+import os
+
+import pytest
+
+import act.utils.copy_engine as copy_engine
+from act.utils.digest_index import DigestIndex
+from act.utils.save import Save
+
+
+@pytest.mark.parametrize("strategy", ("auto",) + copy_engine.available_strategies())
+def test_copy_file_strategies_preserve_content(tmp_path, strategy):
+    source_path = tmp_path / "1001 (2025-01-01)RAW.csv"
+    payload = os.urandom(3 * 1024 * 1024 + 17)
+    source_path.write_bytes(payload)
+    destination_path = tmp_path / "out.csv"
+    destination_path.write_bytes(b"stale-and-longer-than-nothing")
+
+    result = copy_engine.copy_file(source_path, destination_path, strategy=strategy)
+
+    assert destination_path.read_bytes() == payload
+    assert result["bytes"] == len(payload)
+    if strategy != "auto":
+        assert result["strategy"] == strategy
+
+
+def test_copy_file_rejects_unknown_strategy(tmp_path):
+    source_path = tmp_path / "source.csv"
+    source_path.write_text("data", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="Unknown copy strategy"):
+        copy_engine.copy_file(source_path, tmp_path / "out.csv", strategy="rsync")
+
+
+def test_copy_file_auto_falls_back_on_cross_device(tmp_path, monkeypatch):
+    source_path = tmp_path / "source.csv"
+    source_path.write_text("cross-device-data", encoding="utf-8")
+
+    def refuse(*_args, **_kwargs):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(copy_engine.os, "copy_file_range", refuse, raising=False)
+    monkeypatch.setattr(copy_engine.os, "sendfile", refuse, raising=False)
+
+    result = copy_engine.copy_file(source_path, tmp_path / "out.csv")
+
+    assert result["strategy"] == "stream"
+    assert (tmp_path / "out.csv").read_text(encoding="utf-8") == "cross-device-data"
+
+
+def test_copy_file_falls_back_when_kernel_copy_returns_zero(tmp_path, monkeypatch):
+    source_path = tmp_path / "source.csv"
+    source_path.write_bytes(b"procfs-like-data")
+    monkeypatch.setattr(copy_engine.os, "copy_file_range", lambda *_args: 0, raising=False)
+    monkeypatch.setattr(copy_engine.os, "sendfile", lambda *_args: 0, raising=False)
+
+    result = copy_engine.copy_file(source_path, tmp_path / "out.csv")
+
+    assert result["strategy"] == "stream"
+    assert (tmp_path / "out.csv").read_bytes() == b"procfs-like-data"
+    with pytest.raises(OSError) as excinfo:
+        copy_engine.copy_file(source_path, tmp_path / "out.csv", strategy="copy_file_range")
+    assert excinfo.value.errno == errno.EOPNOTSUPP
+
+
+def test_copy_file_raises_on_short_kernel_copy(tmp_path, monkeypatch):
+    source_path = tmp_path / "source.csv"
+    source_path.write_bytes(b"x" * 100)
+    calls = []
+
+    def short_copy(*_args):
+        calls.append(1)
+        return 10 if len(calls) == 1 else 0
+
+    monkeypatch.setattr(copy_engine.os, "copy_file_range", short_copy, raising=False)
+
+    with pytest.raises(OSError) as excinfo:
+        copy_engine.copy_file(source_path, tmp_path / "out.csv", strategy="copy_file_range")
+    assert excinfo.value.errno == errno.EIO
+
+
+def test_copy_subject_record_uses_configured_strategy(tmp_path, monkeypatch):
+    save = Save.__new__(Save)
+    save.logger = logging.getLogger("act.utils.save")
+    save.RDSS_DIR = str(tmp_path / "rdss")
+    save.symlink = False
+    save.copy_strategy = "stream"
+
+    source_path = tmp_path / "rdss" / "1001 (2025-01-01)RAW.csv"
+    source_path.parent.mkdir(parents=True)
+    source_path.write_text("raw-bytes", encoding="utf-8")
+    os.utime(source_path, ns=(1_700_000_000_000_000_000, 1_700_000_000_000_000_000))
+    destination_path = tmp_path / "int" / "sub-8001" / "accel" / "ses-1" / "sub-8001_ses-1_accel.csv"
+
+    used = []
+    original_copy_file = copy_engine.copy_file
+
+    def tracking_copy_file(
+        source, destination, strategy="auto", fsync=False, digest=False, throttle=None
+    ):
+        used.append(strategy)
+        return original_copy_file(
+            source, destination, strategy=strategy, fsync=fsync, digest=digest, throttle=throttle
+        )
+
+    monkeypatch.setattr("act.utils.save.copy_file", tracking_copy_file)
+
+    copied = save._copy_subject_record(
+        {
+            "filename": source_path.name,
+            "file_path": str(destination_path),
+            "subject_id": "8001",
+            "run": 1,
+        }
+    )
+
+    assert copied == str(destination_path)
+    assert used == ["stream"]
+    assert destination_path.read_text(encoding="utf-8") == "raw-bytes"
+    assert os.stat(destination_path).st_mtime_ns == os.stat(source_path).st_mtime_ns
+
+
+def test_copy_subject_record_stores_digest_on_record(tmp_path):
+    save = Save.__new__(Save)
+    save.logger = logging.getLogger("act.utils.save")
+    save.RDSS_DIR = str(tmp_path / "rdss")
+    save.symlink = False
+    save.copy_strategy = "stream"
+
+    source_path = tmp_path / "rdss" / "1001 (2025-01-01)RAW.csv"
+    source_path.parent.mkdir(parents=True)
+    source_path.write_bytes(b"raw-bytes")
+    record = {
+        "filename": source_path.name,
+        "file_path": str(tmp_path / "obs" / "sub-7001" / "accel" / "ses-1" / "sub-7001_ses-1_accel.csv"),
+        "subject_id": "7001",
+        "run": 1,
+    }
+
+    save._copy_subject_record(record)
+
+    assert record["sha256"] == hashlib.sha256(b"raw-bytes").hexdigest()
+    assert record["size"] == len(b"raw-bytes")
+
+
+def test_auto_copy_stays_kernel_side_and_hashes_the_copy(tmp_path, monkeypatch):
+    save = Save.__new__(Save)
+    save.logger = logging.getLogger("act.utils.save")
+    save.RDSS_DIR = str(tmp_path / "rdss")
+    save.symlink = False
+    save.digest_index = DigestIndex(str(tmp_path / "digest_index.json"))
+
+    source_path = tmp_path / "rdss" / "1001 (2025-01-01)RAW.csv"
+    source_path.parent.mkdir(parents=True)
+    source_path.write_bytes(b"raw-bytes")
+    strategies = []
+    original_copy_file = copy_engine.copy_file
+
+    def tracking_copy_file(source, destination, **kwargs):
+        result = original_copy_file(source, destination, **kwargs)
+        strategies.append(result["strategy"])
+        return result
+
+    monkeypatch.setattr("act.utils.save.copy_file", tracking_copy_file)
+    record = {
+        "filename": source_path.name,
+        "file_path": str(tmp_path / "obs" / "sub-7001" / "accel" / "ses-1" / "sub-7001_ses-1_accel.csv"),
+        "subject_id": "7001",
+        "run": 1,
+    }
+
+    save._copy_subject_record(record)
+
+    expected = hashlib.sha256(b"raw-bytes").hexdigest()
+    assert strategies == [copy_engine.available_strategies()[0]]
+    assert record["sha256"] == expected
+    assert record["size"] == len(b"raw-bytes")
+    assert save.digest_index.lookup(record["file_path"]) == expected
+    assert save.digest_index.lookup(str(source_path)) == expected
+
+
+def test_copy_file_digest_matches_content(tmp_path):
+    source_path = tmp_path / "source.csv"
+    payload = os.urandom(2 * 1024 * 1024 + 5)
+    source_path.write_bytes(payload)
+
+    result = copy_engine.copy_file(source_path, tmp_path / "out.csv", digest=True)
+
+    assert result["strategy"] == copy_engine.available_strategies()[0]
+    assert result["sha256"] == hashlib.sha256(payload).hexdigest()
+    assert (tmp_path / "out.csv").read_bytes() == payload
+
+    for strategy in copy_engine.available_strategies():
+        kernel = copy_engine.copy_file(
+            source_path, tmp_path / f"{strategy}.csv", strategy=strategy, digest=True
+        )
+        assert kernel["strategy"] == strategy
+        assert kernel["sha256"] == hashlib.sha256(payload).hexdigest()
+        assert (tmp_path / f"{strategy}.csv").read_bytes() == payload
@@ -0,0 +1,433 @@
+from __future__ import annotations
+
+import io
+import os
+import threading
+
+import pytest
+
+import act.core.gg as gg_module
+from act.core import ggir_cache, ggir_params
+from act.core.gg import GG
+from act.core.ggir_memory import MemoryHistory
+from act.utils.digest_index import DigestIndex
+
+
+def _session(root, subject_id, run, with_outputs=False):
+    relative = os.path.join(
+        f"sub-{subject_id}", "accel", f"ses-{run}", f"sub-{subject_id}_ses-{run}_accel.csv"
+    )
+    path = os.path.join(root, relative)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write("accel")
+    if with_outputs:
+        results = os.path.join(
+            root, "derivatives", "GGIR-3.2.6", os.path.dirname(relative), f"output_ses-{run}", "results"
+        )
+        os.makedirs(results, exist_ok=True)
+        open(os.path.join(results, "part5_personsummary_MM_L40M100V400_T5A5.csv"), "w").close()
+    return path, relative
+
+
+class FakeProcess:
+    def __init__(self, command, **kwargs):
+        self.command = command
+        self.stdout = io.StringIO("GGIR done\n")
+        self.returncode = 0
+
+    def wait(self):
+        return 0
+
+
+class FakeQC:
+    runs = []
+
+    def __init__(self, project_type, system):
+        self.project_type = project_type
+
+    def qc(self):
+        FakeQC.runs.append(self.project_type)
+
+
+@pytest.fixture(autouse=True)
+def _fake_peak_rss(monkeypatch):
+    def wait(process):
+        process.wait()
+        return 100 * 1024 ** 2
+
+    monkeypatch.setattr(gg_module, "wait_with_peak_rss", wait)
+    monkeypatch.setattr(gg_module, "ggir_version", lambda: "3.2.6")
+
+
+@pytest.fixture
+def project(tmp_path):
+    int_dir = tmp_path / "act-int-test"
+    obs_dir = tmp_path / "act-obs-test"
+    int_dir.mkdir()
+    obs_dir.mkdir()
+    return str(int_dir), str(obs_dir)
+
+
+def test_work_list_holds_changed_and_unprocessed_sessions(project):
+    int_dir, obs_dir = project
+    done, done_rel = _session(int_dir, "8001", 1, with_outputs=True)
+    renamed, renamed_rel = _session(int_dir, "8001", 2, with_outputs=True)
+    _, missing_rel = _session(int_dir, "8002", 1)
+    obs_path, _ = _session(obs_dir, "7001", 1)
+    matched = {
+        "8001": [{"file_path": done}, {"file_path": renamed}],
+        "8002": [{"file_path": os.path.join(int_dir, missing_rel)}],
+        "7001": [{"file_path": obs_path}],
+    }
+
+    runner = GG(matched, int_dir, obs_dir, "local", changed_sessions=[renamed])
+
+    assert runner.work_list(runner.INTDIR) == sorted([renamed_rel, missing_rel])
+    assert done_rel not in runner.work_list(runner.INTDIR)
+
+
+def test_run_project_passes_work_list_and_skips_up_to_date_project(project, monkeypatch):
+    int_dir, obs_dir = project
+    new_path, new_rel = _session(int_dir, "8001", 1)
+    done_path, _ = _session(obs_dir, "7001", 1, with_outputs=True)
+    commands = []
+
+    def fake_popen(command, **kwargs):
+        work_list = command.split("--work_list ")[1]
+        with open(work_list, encoding="utf-8") as handle:
+            commands.append((command, handle.read().splitlines()))
+        return FakeProcess(command, **kwargs)
+
+    monkeypatch.setattr(gg_module.subprocess, "Popen", fake_popen)
+    FakeQC.runs = []
+    runner = GG(
+        {"8001": [{"file_path": new_path}], "7001": [{"file_path": done_path}]},
+        int_dir,
+        obs_dir,
+        "local",
+        changed_sessions=[new_path],
+    )
+
+    runner._run_project(FakeQC, runner.INTDIR)
+    runner._run_project(FakeQC, runner.OBSDIR)
+
+    assert len(commands) == 1
+    assert f"--project_dir {runner.INTDIR}" in commands[0][0]
+    assert commands[0][1] == [new_rel]
+    assert not os.path.exists(commands[0][0].split("--work_list ")[1])
+    assert FakeQC.runs == ["int"]
+
+
+def test_run_project_without_changed_sessions_processes_everything(project, monkeypatch):
+    int_dir, obs_dir = project
+    commands = []
+
+    def fake_popen(command, **kwargs):
+        commands.append(command)
+        return FakeProcess(command, **kwargs)
+
+    monkeypatch.setattr(gg_module.subprocess, "Popen", fake_popen)
+    runner = GG({}, int_dir, obs_dir, "local")
+
+    runner._run_project(FakeQC, runner.INTDIR)
+
+    assert len(commands) == 1
+    assert "--work_list" not in commands[0]
+
+
+def test_parallel_run_gives_each_session_its_own_process(project, monkeypatch, tmp_path):
+    int_dir, obs_dir = project
+    history_path = tmp_path / "res" / "ggir_memory.json"
+    paths = [_session(int_dir, "8001", run)[0] for run in (1, 2)]
+    _session(obs_dir, "7001", 1, with_outputs=True)
+    obs_new, obs_rel = _session(obs_dir, "7002", 1)
+    with open(obs_new, "w", encoding="utf-8") as handle:
+        handle.write("a much larger recording")
+    started = []
+    lock = threading.Lock()
+
+    def fake_popen(command, **kwargs):
+        with open(command.split("--work_list ")[1], encoding="utf-8") as handle:
+            sessions = handle.read().splitlines()
+        with lock:
+            started.append((command.split("--project_dir ")[1].split()[0], sessions))
+        return FakeProcess(command, **kwargs)
+
+    monkeypatch.setattr(gg_module.subprocess, "Popen", fake_popen)
+    FakeQC.runs = []
+    runner = GG(
+        {"8001": [{"file_path": path} for path in paths]},
+        int_dir,
+        obs_dir,
+        "local",
+        changed_sessions=paths + [obs_new],
+        ggir_workers=3,
+        memory_history_path=str(history_path),
+    )
+    assert runner.all_sessions(runner.OBSDIR) == sorted(
+        [obs_rel, os.path.join("sub-7001", "accel", "ses-1", "sub-7001_ses-1_accel.csv")]
+    )
+
+    runner._run_parallel(FakeQC)
+
+    assert all(len(sessions) == 1 for _, sessions in started)
+    assert sorted(sessions[0] for _, sessions in started) == sorted(
+        [os.path.relpath(path, int_dir) for path in paths] + [obs_rel]
+    )
+    assert {project_dir for project_dir, _ in started} == {runner.INTDIR, runner.OBSDIR}
+    assert sorted(FakeQC.runs) == ["int", "obs"]
+    history = MemoryHistory(str(history_path))
+    assert history.samples == 3
+    assert history.sessions[obs_new] == {"input_bytes": os.path.getsize(obs_new), "peak_rss": 100 * 1024 ** 2}
+
+
+def test_parallel_run_skips_qc_when_every_session_fails(project, monkeypatch, tmp_path):
+    int_dir, obs_dir = project
+    path, _ = _session(int_dir, "8001", 1)
+
+    class FailingProcess(FakeProcess):
+        def __init__(self, command, **kwargs):
+            super().__init__(command, **kwargs)
+            self.returncode = 1
+
+    monkeypatch.setattr(gg_module.subprocess, "Popen", FailingProcess)
+    FakeQC.runs = []
+    runner = GG(
+        {},
+        int_dir,
+        obs_dir,
+        "local",
+        changed_sessions=[path],
+        ggir_workers=2,
+        memory_history_path=str(tmp_path / "ggir_memory.json"),
+    )
+
+    runner._run_parallel(FakeQC)
+
+    assert FakeQC.runs == []
+
+
+def test_renamed_session_outputs_are_relinked_instead_of_recomputed(project, monkeypatch):
+    int_dir, obs_dir = project
+    ses1, ses1_rel = _session(int_dir, "8001", 1, with_outputs=True)
+    digest_a = ggir_cache.file_sha256(ses1)
+    ran = []
+
+    def fake_popen(command, **kwargs):
+        with open(command.split("--work_list ")[1], encoding="utf-8") as handle:
+            ran.append(handle.read().splitlines())
+        return FakeProcess(command, **kwargs)
+
+    monkeypatch.setattr(gg_module.subprocess, "Popen", fake_popen)
+    FakeQC.runs = []
+
+    # Night 1: nothing changed; the existing outputs are seeded into the cache.
+    first = GG({"8001": [{"file_path": ses1, "sha256": digest_a}]}, int_dir, obs_dir, "local", changed_sessions=[])
+    first._run_project(FakeQC, first.INTDIR)
+    assert ran == []
+
+    # Night 2: a backfill moves recording A to ses-2 and copies B into ses-1.
+    ses2, ses2_rel = _session(int_dir, "8001", 2)
+    with open(ses1, "w", encoding="utf-8") as handle:
+        handle.write("recording B")
+    matched = {
+        "8001": [
+            {"file_path": ses1, "sha256": ggir_cache.file_sha256(ses1)},
+            {"file_path": ses2, "sha256": digest_a},
+        ]
+    }
+    second = GG(matched, int_dir, obs_dir, "local", changed_sessions=[ses1, ses2])
+    second._run_project(FakeQC, second.INTDIR)
+
+    assert ran == [[ses1_rel]]
+    assert second._has_ggir_outputs(second.INTDIR, ses2_rel)
+    assert FakeQC.runs == ["int"]
+
+
+def test_input_digests_come_from_and_go_to_the_digest_index(project, monkeypatch, tmp_path):
+    int_dir, obs_dir = project
+    path, relative_path = _session(int_dir, "8001", 1)
+    index_path = str(tmp_path / "res" / "digest_index.json")
+    hashed = []
+    original_sha256 = gg_module.file_sha256
+    monkeypatch.setattr(gg_module, "file_sha256", lambda p: hashed.append(p) or original_sha256(p))
+    matched = {"8001": [{"file_path": path}]}
+
+    first = GG(matched, int_dir, obs_dir, "local", digest_index=DigestIndex(index_path))
+    digest = first._input_digest(first.INTDIR, relative_path)
+    first._save_digest_index()
+    assert hashed == [os.path.abspath(path)]
+
+    # A later run (e.g. the session failed in GGIR and is still queued) reuses it.
+    second = GG(matched, int_dir, obs_dir, "local", digest_index=DigestIndex(index_path))
+    assert second._input_digest(second.INTDIR, relative_path) == digest
+    assert len(hashed) == 1
+
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write(" rewritten")
+    third = GG(matched, int_dir, obs_dir, "local", digest_index=DigestIndex(index_path))
+    assert third._input_digest(third.INTDIR, relative_path) != digest
+    assert len(hashed) == 2
+
+
+def test_staged_rerun_of_a_relinked_session_starts_from_part_one(project, monkeypatch):
+    int_dir, obs_dir = project
+    ses1, _ = _session(int_dir, "8001", 1, with_outputs=True)
+    os.makedirs(
+        os.path.join(int_dir, "derivatives", "GGIR-3.2.6", "sub-8001", "accel", "ses-1", "output_ses-1", "meta", "basic")
+    )
+    digest_a = ggir_cache.file_sha256(ses1)
+    work_lists = []
+
+    def fake_popen(command, **kwargs):
+        with open(command.split("--work_list ")[1], encoding="utf-8") as handle:
+            work_lists.append(handle.read().splitlines())
+        return FakeProcess(command, **kwargs)
+
+    monkeypatch.setattr(gg_module.subprocess, "Popen", fake_popen)
+    GG({"8001": [{"file_path": ses1, "sha256": digest_a}]}, int_dir, obs_dir, "local", changed_sessions=[])._run_project(
+        FakeQC, int_dir
+    )
+
+    # Recording A moves to ses-2 and is relinked from the cache.
+    ses2, ses2_rel = _session(int_dir, "8001", 2)
+    matched = {"8001": [{"file_path": ses2, "sha256": digest_a}]}
+    GG(matched, int_dir, obs_dir, "local", changed_sessions=[ses2])._run_project(FakeQC, int_dir)
+    assert work_lists == []
+    record = ggir_params.read_record(
+        os.path.join(int_dir, "derivatives", "GGIR-3.2.6", "sub-8001", "accel", "ses-2", ggir_params.RECORD_FILENAME)
+    )
+    assert record["relinked_from"] == "sub-8001_ses-1"
+
+    # A part-5 parameter change must not rerun ses-2 on ses-1's milestones.
+    parameters = gg_module.parse_ggir_parameters("act/core/acc_new.R")
+    changed = {**parameters, "threshold.mod": "110"}
+    monkeypatch.setattr(gg_module, "parse_ggir_parameters", lambda script: changed)
+    monkeypatch.setattr(gg_module, "ggir_parameters_hash", lambda script: "changed")
+    GG(matched, int_dir, obs_dir, "local", changed_sessions=[])._run_project(FakeQC, int_dir)
+    assert work_lists == [[ses2_rel]]
+
+
+def test_parameter_change_reruns_only_affected_parts(project, monkeypatch):
+    int_dir, obs_dir = project
+    path, relative_path = _session(int_dir, "8001", 1, with_outputs=True)
+    meta = os.path.join(int_dir, "derivatives", "GGIR-3.2.6", "sub-8001", "accel", "ses-1", "output_ses-1", "meta")
+    for milestone in ("basic", "ms2.out", "ms3.out", "ms4.out"):
+        os.makedirs(os.path.join(meta, milestone))
+    results = os.path.join(os.path.dirname(meta), "results")
+    work_lists = []
+
+    def fake_popen(command, **kwargs):
+        with open(command.split("--work_list ")[1], encoding="utf-8") as handle:
+            work_lists.append(handle.read().splitlines())
+        with open(os.path.join(results, "part5_daysummary_MM_L40M100V400_T5A5.csv"), "w") as handle:
+            handle.write("rerun")
+        return FakeProcess(command, **kwargs)
+
+    monkeypatch.setattr(gg_module.subprocess, "Popen", fake_popen)
+    matched = {"8001": [{"file_path": path}]}
+    parameters = gg_module.parse_ggir_parameters("act/core/acc_new.R")
+
+    # First run records the current parameters as the project baseline.
+    GG(matched, int_dir, obs_dir, "local", changed_sessions=[])._run_project(FakeQC, int_dir)
+    assert work_lists == []
+
+    changed = {**parameters, "threshold.mod": "110"}
+    monkeypatch.setattr(gg_module, "parse_ggir_parameters", lambda script: changed)
+    staged = GG(matched, int_dir, obs_dir, "local", changed_sessions=[])
+    staged._run_project(FakeQC, staged.INTDIR)
+
+    assert work_lists == [[f"{relative_path}\t5"]]
+    project_record = ggir_params.read_record(
+        os.path.join(int_dir, "derivatives", "GGIR-3.2.6", ggir_params.PROJECT_RECORD_FILENAME)
+    )
+    assert project_record["parameters"] == changed
+    assert project_record["consistent"] is True
+
+    GG(matched, int_dir, obs_dir, "local", changed_sessions=[])._run_project(FakeQC, int_dir)
+    assert len(work_lists) == 1
+
+
+class FakeWorkerPool:
+    jobs = []
+
+    def __init__(self, size):
+        self.size = size
+        self.restarts = 0
+        self.closed = False
+
+    def start(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def run(self, project_dir, deriv_dir, relative_path, start_part=1):
+        FakeWorkerPool.jobs.append((project_dir, deriv_dir, relative_path, start_part))
+        return {
+            "ok": True,
+            "message": "",
+            "r_seconds": 1.0,
+            "wall_seconds": 1.01,
+            "peak_rss": 200 * 1024 ** 2,
+            "worker": "ggir-worker-1",
+        }
+
+
+def test_persistent_workers_run_sessions_without_rscript(project, monkeypatch, tmp_path):
+    int_dir, obs_dir = project
+    path, relative_path = _session(int_dir, "8001", 1)
+
+    def no_popen(command, **kwargs):
+        raise AssertionError("Rscript started in persistent worker mode")
+
+    monkeypatch.setattr(gg_module.subprocess, "Popen", no_popen)
+    monkeypatch.setattr(gg_module, "RWorkerPool", FakeWorkerPool)
+    FakeWorkerPool.jobs = []
+    history_path = tmp_path / "ggir_memory.json"
+    runner = GG(
+        {},
+        int_dir,
+        obs_dir,
+        "local",
+        changed_sessions=[path],
+        persistent_workers=True,
+        memory_history_path=str(history_path),
+    )
+
+    runner._run_parallel(FakeQC)
+
+    assert FakeWorkerPool.jobs == [(runner.INTDIR, runner.DERIVATIVES, relative_path, 1)]
+    assert MemoryHistory(str(history_path)).sessions[path]["peak_rss"] == 200 * 1024 ** 2
+
+
+def test_persistent_workers_fall_back_to_rscript_when_they_fail_to_start(project, monkeypatch, tmp_path):
+    int_dir, obs_dir = project
+    path, relative_path = _session(int_dir, "8001", 1)
+    commands = []
+
+    class BrokenPool(FakeWorkerPool):
+        def start(self):
+            raise gg_module.WorkerError("GGIR not installed")
+
+    def fake_popen(command, **kwargs):
+        commands.append(command)
+        return FakeProcess(command, **kwargs)
+
+    monkeypatch.setattr(gg_module.subprocess, "Popen", fake_popen)
+    monkeypatch.setattr(gg_module, "RWorkerPool", BrokenPool)
+    runner = GG(
+        {},
+        int_dir,
+        obs_dir,
+        "local",
+        changed_sessions=[path],
+        persistent_workers=True,
+        memory_history_path=str(tmp_path / "ggir_memory.json"),
+    )
+
+    runner._run_parallel(FakeQC)
+
+    assert len(commands) == 1
+    assert "--work_list" in commands[0]
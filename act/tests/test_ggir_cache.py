@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from act.core import ggir_cache
+from act.core.ggir_cache import GGIROutputCache
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(text)
+
+
+def _ggir_outputs(output_dir, subject, session):
+    results = os.path.join(output_dir, f"output_{session}", "results")
+    _write(
+        os.path.join(results, "part5_personsummary_MM_L40M100V400_T5A5.csv"),
+        f"filename,Nvaliddays\n{subject}_{session}_accel.csv,7\n",
+    )
+    _write(
+        os.path.join(output_dir, f"output_{session}", "meta", "basic", f"meta_{subject}_{session}_accel.csv.RData"),
+        "binary-ish",
+    )
+
+
+def test_parameters_hash_ignores_comments_and_layout(tmp_path):
+    script = tmp_path / "acc.R"
+    script.write_text('x <- 1\nGGIR(\n  mode = 1:6, # all parts\n  windowsizes = c(5, 900)\n)\n', encoding="utf-8")
+    reformatted = tmp_path / "reformatted.R"
+    reformatted.write_text("GGIR(mode=1:6,\n windowsizes=c(5,900))  # trailing\n", encoding="utf-8")
+    changed = tmp_path / "changed.R"
+    changed.write_text("GGIR(mode=1:6, windowsizes=c(5,600))\n", encoding="utf-8")
+
+    digest = ggir_cache.ggir_parameters_hash(script)
+    assert digest == ggir_cache.ggir_parameters_hash(reformatted)
+    assert digest != ggir_cache.ggir_parameters_hash(changed)
+    assert len(ggir_cache.ggir_parameters_hash("act/core/acc_new.R")) == 64
+
+
+def test_key_depends_on_digest_parameters_and_version(tmp_path):
+    cache = GGIROutputCache(str(tmp_path), "params", "3.2.6")
+
+    assert cache.key("a") == GGIROutputCache(str(tmp_path), "params", "3.2.6").key("a")
+    assert cache.key("a") != cache.key("b")
+    assert cache.key("a") != GGIROutputCache(str(tmp_path), "other", "3.2.6").key("a")
+    assert cache.key("a") != GGIROutputCache(str(tmp_path), "params", "3.3.0").key("a")
+
+
+def test_restore_relinks_outputs_under_the_new_session_name(tmp_path):
+    derivatives = tmp_path / "derivatives"
+    ses2 = str(derivatives / "sub-8001" / "accel" / "ses-2")
+    ses3 = str(derivatives / "sub-8001" / "accel" / "ses-3")
+    _ggir_outputs(ses2, "sub-8001", "ses-2")
+    cache = GGIROutputCache(str(derivatives), "params", "3.2.6")
+    key = cache.key("digest")
+
+    assert cache.restore(key, ses3, "sub-8001/accel/ses-3/sub-8001_ses-3_accel.csv") is False
+    assert cache.store(key, ses2, "sub-8001/accel/ses-2/sub-8001_ses-2_accel.csv") is True
+    assert cache.store(key, ses2, "sub-8001/accel/ses-2/sub-8001_ses-2_accel.csv") is False
+
+    _write(os.path.join(ses3, "stale.txt"), "old outputs")
+    assert cache.restore(key, ses3, "sub-8001/accel/ses-3/sub-8001_ses-3_accel.csv") is True
+
+    summary = os.path.join(ses3, "output_ses-3", "results", "part5_personsummary_MM_L40M100V400_T5A5.csv")
+    with open(summary, encoding="utf-8") as handle:
+        assert "sub-8001_ses-3_accel.csv" in handle.read()
+    meta = os.path.join(ses3, "output_ses-3", "meta", "basic", "meta_sub-8001_ses-3_accel.csv.RData")
+    original = os.path.join(ses2, "output_ses-2", "meta", "basic", "meta_sub-8001_ses-2_accel.csv.RData")
+    assert os.path.samefile(meta, original)
+    assert not os.path.exists(os.path.join(ses3, "stale.txt"))
+    assert sorted(os.listdir(os.path.dirname(ses3))) == ["ses-2", "ses-3"]
+
+
+def test_unshare_tree_protects_cached_copies(tmp_path):
+    derivatives = tmp_path / "derivatives"
+    ses1 = str(derivatives / "sub-8001" / "accel" / "ses-1")
+    _ggir_outputs(ses1, "sub-8001", "ses-1")
+    cache = GGIROutputCache(str(derivatives), "params", "3.2.6")
+    cache.store(cache.key("digest"), ses1, "sub-8001/accel/ses-1/sub-8001_ses-1_accel.csv")
+    meta = os.path.join(ses1, "output_ses-1", "meta", "basic", "meta_sub-8001_ses-1_accel.csv.RData")
+    assert os.stat(meta).st_nlink == 2
+
+    ggir_cache.unshare_tree(ses1)
+    with open(meta, "w", encoding="utf-8") as handle:
+        handle.write("recomputed")
+
+    assert os.stat(meta).st_nlink == 1
+    cached = os.path.join(
+        cache._entry_dir(cache.key("digest")),
+        "outputs",
+        "output_ses-1",
+        "meta",
+        "basic",
+        "meta_sub-8001_ses-1_accel.csv.RData",
+    )
+    with open(cached, encoding="utf-8") as handle:
+        assert handle.read() == "binary-ish"
+
+
+def test_session_name_rejects_non_session_paths():
+    assert ggir_cache.session_name("sub-8001/accel/ses-12/sub-8001_ses-12_accel.csv") == ("sub-8001", "ses-12")
+    with pytest.raises(ValueError):
+        ggir_cache.session_name("notes.csv")
+
+
+def test_prune_drops_other_configurations_stale_entries_and_enforces_the_size_cap(tmp_path):
+    derivatives = tmp_path / "derivatives"
+    old_params = GGIROutputCache(str(derivatives), "old-params", "3.2.6")
+    current = GGIROutputCache(str(derivatives), "params", "3.2.6")
+    keys = {}
+    for name, cache in (("old", old_params), ("a", current), ("b", current), ("c", current)):
+        output_dir = str(derivatives / "sub-8001" / "accel" / f"ses-{name}")
+        _ggir_outputs(output_dir, "sub-8001", "ses-1")
+        keys[name] = cache.key(f"digest-{name}")
+        relative_path = "sub-8001/accel/ses-1/sub-8001_ses-1_accel.csv"
+        assert cache.store(keys[name], output_dir, relative_path)
+        # The session is rerun or deleted: the cache now owns the only copy.
+        ggir_cache.shutil.rmtree(output_dir)
+    # Room for the newest entry only.
+    entry_bytes = current._owned_bytes(current._entry_dir(keys["c"]))
+    assert entry_bytes > 0
+    now = 1_000_000_000.0
+    for name, age in (("old", 0), ("a", 100 * 86400), ("b", 20), ("c", 10)):
+        entry_json = os.path.join(current._entry_dir(keys[name]), "entry.json")
+        os.utime(entry_json, (now - age, now - age))
+
+    pruned = current.prune(max_bytes=entry_bytes, now=now)
+
+    assert (pruned["removed"], pruned["kept"], pruned["kept_bytes"]) == (3, 1, entry_bytes)
+    assert pruned["freed_bytes"] > 2 * entry_bytes
+    assert [name for name in keys if current.lookup(keys[name]) is not None] == ["c"]
+    assert current.prune(now=now)["removed"] == 0
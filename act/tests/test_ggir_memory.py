@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from act.core import ggir_memory
+from act.core.ggir_memory import MemoryBudget, MemoryHistory
+
+MIB = 1024 ** 2
+
+
+def test_parse_size_accepts_units():
+    assert ggir_memory.parse_size("48G") == 48 * 1024 ** 3
+    assert ggir_memory.parse_size("512MiB") == 512 * MIB
+    assert ggir_memory.parse_size("1000") == 1000
+    for bad in ("lots", "0", "5G/s"):
+        with pytest.raises(ValueError):
+            ggir_memory.parse_size(bad)
+
+
+def test_history_estimates_from_ratio_then_session_peak(tmp_path):
+    path = str(tmp_path / "res" / "ggir_memory.json")
+    history = MemoryHistory(path)
+    size = 2000 * MIB
+
+    default = history.estimate("/lss/sub-8001_ses-1_accel.csv", size)
+    assert default == int(size * ggir_memory.DEFAULT_BYTES_PER_INPUT_BYTE * ggir_memory.SAFETY_FACTOR)
+    assert history.estimate("/lss/tiny.csv", 1) == int(
+        ggir_memory.MIN_ESTIMATE_BYTES * ggir_memory.SAFETY_FACTOR
+    )
+
+    history.observe("/lss/sub-8001_ses-1_accel.csv", size, 3000 * MIB)
+    history.observe("/lss/sub-8002_ses-1_accel.csv", size, 1000 * MIB)
+    history.save()
+
+    reloaded = MemoryHistory(path)
+    assert reloaded.samples == 2
+    assert reloaded.bytes_per_input_byte == pytest.approx(0.3 * 0.5 + 0.7 * 1.5)
+    assert reloaded.estimate("/lss/sub-8001_ses-1_accel.csv", size) == int(
+        3000 * MIB * ggir_memory.SAFETY_FACTOR
+    )
+    # A changed input size falls back to the learned ratio.
+    assert reloaded.estimate("/lss/sub-8001_ses-1_accel.csv", 2 * size) == int(
+        2 * size * reloaded.bytes_per_input_byte * ggir_memory.SAFETY_FACTOR
+    )
+
+
+def test_history_ignores_unreadable_file(tmp_path):
+    path = tmp_path / "ggir_memory.json"
+    path.write_text("{not json", encoding="utf-8")
+
+    assert MemoryHistory(str(path)).bytes_per_input_byte is None
+
+
+def test_budget_admits_while_estimates_fit_and_runs_oversized_alone():
+    budget = MemoryBudget(limit_bytes=10)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def job(nbytes):
+        with budget.reserve(nbytes):
+            with lock:
+                active.append(nbytes)
+                peak.append(sum(active))
+            time.sleep(0.02)
+            with lock:
+                active.remove(nbytes)
+
+    threads = [threading.Thread(target=job, args=(nbytes,)) for nbytes in (4, 4, 4, 25, 4)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.002)
+    for thread in threads:
+        thread.join()
+
+    assert budget.in_use == 0
+    assert 25 in peak
+    assert all(total <= 10 for total in peak if total != 25)
+    assert budget.peak_in_use == 25
+
+
+def test_unlimited_budget_never_blocks():
+    budget = MemoryBudget()
+    with budget.reserve(10 ** 12):
+        with budget.reserve(10 ** 12):
+            assert budget.in_use == 2 * 10 ** 12
+
+
+def test_wait_with_peak_rss_measures_child():
+    process = subprocess.Popen(
+        [sys.executable, "-c", "block = bytearray(64 * 1024 * 1024); block[::4096] = b'x' * len(block[::4096])"]
+    )
+
+    peak = ggir_memory.wait_with_peak_rss(process)
+
+    assert process.returncode == 0
+    assert peak >= 64 * MIB
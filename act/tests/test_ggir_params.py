@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import os
+
+from act.core import ggir_params
+
+
+def test_parse_acc_new_parameters():
+    parameters = ggir_params.parse_ggir_parameters("act/core/acc_new.R")
+
+    assert parameters["threshold.lig"] == "44.8"
+    assert parameters["timewindow"] == 'c("WW","MM","OO")'
+    assert parameters["windowsizes"] == "c(5,900,3600)"
+    # Commented-out sleep-log arguments are not part of the call.
+    assert "loglocation" not in parameters
+
+
+def test_first_affected_part_picks_earliest_changed_part():
+    current = {"windowsizes": "c(5,900,3600)", "maxdur": "9", "threshold.lig": "44.8", "mode": "1:6"}
+
+    assert ggir_params.first_affected_part(current, dict(current)) is None
+    assert ggir_params.first_affected_part(current, {**current, "mode": "5:6"}) is None
+    assert ggir_params.first_affected_part(current, {**current, "threshold.lig": "40"}) == 5
+    assert ggir_params.first_affected_part(
+        current, {**current, "threshold.lig": "40", "maxdur": "7"}
+    ) == 2
+    assert ggir_params.first_affected_part(current, {**current, "newoption": "TRUE"}) == 1
+
+
+def test_start_part_reruns_everything_after_a_version_change():
+    record = {"parameters": {"threshold.lig": "44.8"}, "ggir_version": "3.2.6"}
+
+    assert ggir_params.start_part(record, {"threshold.lig": "44.8"}, "3.2.6") is None
+    assert ggir_params.start_part(record, {"threshold.lig": "50"}, "3.2.6") == 5
+    assert ggir_params.start_part(record, {"threshold.lig": "44.8"}, "3.3.0") == 1
+
+
+def test_milestones_present_requires_earlier_parts(tmp_path):
+    os.makedirs(tmp_path / "meta" / "basic")
+    os.makedirs(tmp_path / "meta" / "ms2.out")
+
+    assert ggir_params.milestones_present(str(tmp_path), 2)
+    assert ggir_params.milestones_present(str(tmp_path), 3)
+    assert not ggir_params.milestones_present(str(tmp_path), 5)
+
+
+def test_record_roundtrip(tmp_path):
+    path = str(tmp_path / "ggir_parameters.json")
+    assert ggir_params.read_record(path) is None
+
+    ggir_params.write_record(path, {"maxdur": "9"}, "3.2.6", consistent=False)
+
+    assert ggir_params.read_record(path) == {
+        "parameters": {"maxdur": "9"},
+        "ggir_version": "3.2.6",
+        "consistent": False,
+    }
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import textwrap
+
+import pytest
+
+from act.core.ggir_worker import REPLY_PREFIX, RWorker, RWorkerPool, WorkerError
+
+# Speaks the ggir_worker.R protocol without R: "crash" in a session path
+# exits mid-job, "fail" reports a GGIR error.
+FAKE_WORKER = textwrap.dedent(
+    f"""
+    import os, sys
+    PREFIX = {REPLY_PREFIX!r}
+    def reply(*fields):
+        sys.stdout.write(PREFIX + "\\t".join(str(field) for field in fields) + "\\n")
+        sys.stdout.flush()
+    reply("READY", os.getpid(), "3.2.6")
+    for line in sys.stdin:
+        fields = line.rstrip("\\n").split("\\t")
+        if fields[0] == "QUIT":
+            break
+        if fields[0] == "PING":
+            reply("PONG", fields[1])
+        elif fields[0] == "RUN":
+            if "crash" in fields[4]:
+                sys.exit(3)
+            sys.stdout.write("Part " + fields[5] + " of " + fields[4] + " ")
+            if "fail" in fields[4]:
+                reply("DONE", fields[1], "error", "0.010", "GGIR failed")
+            else:
+                reply("DONE", fields[1], "ok", "0.020", "")
+    """
+)
+
+
+@pytest.fixture
+def worker_command(tmp_path):
+    script = tmp_path / "fake_worker.py"
+    script.write_text(FAKE_WORKER, encoding="utf-8")
+    return [sys.executable, str(script)]
+
+
+def test_worker_runs_jobs_and_logs_ggir_output(worker_command, caplog):
+    worker = RWorker("ggir-worker-1", worker_command)
+    worker.start()
+    try:
+        assert worker.ggir_version == "3.2.6"
+        assert worker.ping()
+        with caplog.at_level(logging.INFO, logger="act.core.ggir_worker"):
+            result = worker.run("/data/act-int-test/", "derivatives/GGIR-3.2.6/", "sub-8001/a.csv", 5)
+        assert result["ok"] is True
+        assert result["r_seconds"] == pytest.approx(0.02)
+        assert result["wall_seconds"] >= 0
+        assert result["peak_rss"] is None or result["peak_rss"] > 0
+        assert "[sub-8001/a.csv] Part 5 of sub-8001/a.csv" in caplog.text
+
+        failed = worker.run("/data/", "derivatives/", "sub-8001/fail.csv")
+        assert failed["ok"] is False
+        assert failed["message"] == "GGIR failed"
+        assert worker.jobs == 2
+        with pytest.raises(ValueError):
+            worker.run("/data/", "derivatives/", "sub-8001/bad\tname.csv")
+    finally:
+        worker.stop()
+    assert not worker.alive()
+
+
+def test_pool_restarts_a_worker_that_crashes(worker_command):
+    with RWorkerPool(1, command=worker_command) as pool:
+        first_pid = pool.workers[0].pid
+        with pytest.raises(WorkerError):
+            pool.run("/data/", "derivatives/", "sub-8001/crash.csv")
+        assert pool.restarts == 1
+        assert pool.workers[0].pid != first_pid
+
+        result = pool.run("/data/", "derivatives/", "sub-8001/a.csv")
+        assert result["ok"] is True
+        assert result["worker"] == "ggir-worker-1"
+
+        # A worker found dead while idle is restarted before it is handed out.
+        pool.workers[0].process.kill()
+        pool.workers[0].process.wait()
+        assert pool.run("/data/", "derivatives/", "sub-8001/a.csv")["ok"] is True
+        assert pool.restarts == 2
+
+
+def test_pool_start_fails_when_a_worker_never_becomes_ready(tmp_path):
+    script = tmp_path / "silent.py"
+    script.write_text("import sys\nsys.exit(1)\n", encoding="utf-8")
+
+    pool = RWorkerPool(2, command=[sys.executable, str(script)])
+    with pytest.raises(WorkerError):
+        pool.start()
+    assert all(not worker.alive() for worker in pool.workers)
+
+
+def test_worker_script_sources_acc_new_without_running_main():
+    with open(os.path.join("act", "core", "acc_new.R"), encoding="utf-8") as handle:
+        acc_new = handle.read()
+    with open(os.path.join("act", "core", "ggir_worker.R"), encoding="utf-8") as handle:
+        worker = handle.read()
+
+    assert "run_ggir_session <- function(" in acc_new
+    assert "sys.nframe() == 0L" in acc_new
+    assert '"acc_new.R"' in worker
+    assert REPLY_PREFIX.rstrip("\t") in worker
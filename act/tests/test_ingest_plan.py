@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+
+from act.utils.ingest_plan import (
+    DEFAULT_BYTES_PER_SECOND,
+    ThroughputHistory,
+    estimate_duration,
+)
+from act.utils.save import Save
+
+
+def _make_save(root):
+    save = Save.__new__(Save)
+    save.manifest_path = str(root / "res" / "data.json")
+    save.manifest = {}
+    save.logger = logging.getLogger("act.utils.save")
+    save.INT_DIR = str(root / "int")
+    save.OBS_DIR = str(root / "obs")
+    save.RDSS_DIR = str(root / "rdss")
+    save.symlink = False
+    save.dupes = []
+    save.copy_throughput = ThroughputHistory(str(root / "res" / "copy_throughput.json"))
+    return save
+
+
+def _write(path, contents):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(contents, encoding="utf-8")
+
+
+def _seed(root):
+    """8001 has run 1 on disk and gets an earlier-dated backfill; 7001 is new."""
+    _write(root / "rdss" / "2101 (2025-03-02)RAW.csv", "existing")
+    _write(root / "rdss" / "2101 (2025-03-01)RAW.csv", "backfill-bytes")
+    _write(root / "rdss" / "2201 (2025-03-05)RAW.csv", "new-subject")
+    _write(root / "obs" / "sub-8001" / "accel" / "ses-1" / "sub-8001_ses-1_accel.csv", "existing")
+    manifest = {
+        "8001": [
+            {
+                "filename": "2101 (2025-03-02)RAW.csv",
+                "labID": "2101",
+                "date": "2025-03-02",
+                "run": 1,
+                "study": "obs",
+            }
+        ]
+    }
+    _write(root / "res" / "data.json", json.dumps(manifest, indent=2))
+    return {
+        "8001": [
+            {"filename": "2101 (2025-03-01)RAW.csv", "labID": "2101", "date": "2025-03-01"},
+            {"filename": "2101 (2025-03-02)RAW.csv", "labID": "2101", "date": "2025-03-02"},
+        ],
+        "7001": [
+            {"filename": "2201 (2025-03-05)RAW.csv", "labID": "2201", "date": "2025-03-05"},
+            {"filename": "2201 (2025-03-06)RAW.csv", "labID": "2201", "date": "2025-03-06"},
+        ],
+    }
+
+
+def _tree_snapshot(root):
+    snapshot = {}
+    for study in ("int", "obs"):
+        for dirpath, _, filenames in os.walk(root / study):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                snapshot[path] = open(path, encoding="utf-8").read()
+    return snapshot
+
+
+def test_plan_reports_copies_renames_and_bytes_without_side_effects(tmp_path):
+    save = _make_save(tmp_path)
+    save.matches = _seed(tmp_path)
+    before = _tree_snapshot(tmp_path)
+    manifest_before = (tmp_path / "res" / "data.json").read_bytes()
+
+    plan = save.plan()
+
+    assert _tree_snapshot(tmp_path) == before
+    assert (tmp_path / "res" / "data.json").read_bytes() == manifest_before
+    assert plan["totals"] == {
+        "subjects": 2,
+        "subjects_changed": 2,
+        "subjects_skipped": 0,
+        "copies": 2,
+        "verifies": 0,
+        "renames": 1,
+        "missing_sources": 1,
+        "bytes_to_transfer": len("backfill-bytes") + len("new-subject"),
+        "bytes_to_verify": 0,
+    }
+    by_subject = {entry["subject_id"]: entry for entry in plan["subjects"]}
+    assert by_subject["8001"]["renames"][0]["old_run"] == 1
+    assert by_subject["8001"]["renames"][0]["new_run"] == 2
+    assert [copy["run"] for copy in by_subject["8001"]["copies"]] == [1]
+    assert by_subject["7001"]["copies"][1]["source_bytes"] is None
+    assert plan["estimate"]["throughput_source"] == "default"
+
+    written = json.loads((tmp_path / "res" / "ingest_plan.json").read_text(encoding="utf-8"))
+    assert written["totals"] == plan["totals"]
+    assert plan["plan_path"] == str(tmp_path / "res" / "ingest_plan.json")
+
+
+def test_plan_matches_what_save_then_copies(tmp_path, monkeypatch):
+    save = _make_save(tmp_path)
+    save.matches = _seed(tmp_path)
+    os.remove(tmp_path / "rdss" / "2201 (2025-03-05)RAW.csv")
+    save.matches.pop("7001")
+
+    plan = save.plan()
+    planned = [copy["destination"] for entry in plan["subjects"] for copy in entry["copies"]]
+
+    copied = []
+    original = Save._copy_subject_record
+
+    def recording(self, record):
+        result = original(self, record)
+        copied.append(result)
+        return result
+
+    monkeypatch.setattr(Save, "_copy_subject_record", recording)
+    save.save()
+
+    assert copied == planned
+    assert save.copy_throughput.bytes_per_second > 0
+    assert _make_save(tmp_path).copy_throughput.samples == 1
+
+
+def test_throughput_history_smooths_runs(tmp_path):
+    history = ThroughputHistory(str(tmp_path / "copy_throughput.json"))
+    assert history.save() is None
+
+    history.observe(100, 1.0)
+    assert history.save() == 100
+    history.observe(200, 1.0)
+    assert history.save() == 200
+    assert history.bytes_per_second == 0.3 * 200 + 0.7 * 100
+
+    reloaded = ThroughputHistory(history.path)
+    assert reloaded.bytes_per_second == history.bytes_per_second
+    assert reloaded.samples == 2
+
+
+def test_estimate_duration_uses_default_until_measured():
+    default = estimate_duration(DEFAULT_BYTES_PER_SECOND * 10, metadata_ops=0)
+    assert default["throughput_source"] == "default"
+    assert default["seconds"] == 10.0
+
+    measured = estimate_duration(1000, metadata_ops=200, bytes_per_second=100, streams=2)
+    assert measured["throughput_source"] == "measured"
+    assert measured["seconds"] == 6.0
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+import pytest
+
+import act.utils.copy_engine as copy_engine
+from act.utils.io_scheduler import IOScheduler, parse_rate
+from act.utils.save import Save
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("800000", 800000),
+        ("50M", 50 * 1024 * 1024),
+        ("50MB/s", 50 * 1024 * 1024),
+        ("1.5GiB/s", int(1.5 * 1024 ** 3)),
+        ("64k", 64 * 1024),
+    ],
+)
+def test_parse_rate_accepts_units(value, expected):
+    assert parse_rate(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "fast", "0", "-5M", "10T"])
+def test_parse_rate_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        parse_rate(value)
+
+
+def test_throttle_holds_aggregate_rate_after_burst(tmp_path):
+    clock = FakeClock()
+    scheduler = IOScheduler(
+        bytes_per_second=1024 * 1024, report_interval=None, clock=clock, sleep=clock.sleep
+    )
+    consume = scheduler.throttle(tmp_path / "a.csv")
+
+    for _ in range(4):
+        consume(1024 * 1024)
+
+    # The first second is burst allowance; the remaining 3 MiB are paced.
+    assert sum(clock.slept) == pytest.approx(3.0)
+    assert scheduler.summary()[next(iter(scheduler.summary()))]["bytes"] == 4 * 1024 * 1024
+
+
+def test_throttle_logs_live_throughput(tmp_path, caplog):
+    clock = FakeClock()
+    scheduler = IOScheduler(report_interval=10.0, clock=clock, sleep=clock.sleep)
+    consume = scheduler.throttle(tmp_path / "a.csv")
+
+    with caplog.at_level(logging.INFO, logger="act.utils.io_scheduler"):
+        consume(1024 * 1024)
+        clock.now = 10.0
+        consume(9 * 1024 * 1024)
+
+    assert "io_throughput" in caplog.text
+    assert "rate_mib_s=1.0" in caplog.text
+
+
+def test_slots_are_granted_round_robin_across_subjects(tmp_path):
+    scheduler = IOScheduler(max_concurrent=1)
+    path = tmp_path / "a.csv"
+    order = []
+
+    def waiter(owner):
+        with scheduler.slot(owner, path):
+            order.append(owner)
+
+    def queued():
+        return sum(
+            sum(state.waiting.values()) for state in scheduler._mounts.values()
+        )
+
+    threads = []
+    with scheduler.slot("8001", path):
+        for expected, owner in enumerate(("8001", "8001", "7001"), start=1):
+            thread = threading.Thread(target=waiter, args=(owner,))
+            thread.start()
+            threads.append(thread)
+            deadline = time.monotonic() + 5
+            while queued() < expected and time.monotonic() < deadline:
+                time.sleep(0.005)
+        assert queued() == 3
+    for thread in threads:
+        thread.join(timeout=5)
+
+    # 7001 is served between 8001's two queued copies instead of after both.
+    assert order == ["8001", "7001", "8001"]
+
+
+@pytest.mark.parametrize("strategy", copy_engine.available_strategies())
+def test_copy_file_reports_bytes_to_throttle(tmp_path, strategy):
+    source_path = tmp_path / "source.csv"
+    source_path.write_bytes(b"x" * (3 * 1024 * 1024 + 5))
+    seen = []
+
+    copy_engine.copy_file(
+        source_path, tmp_path / "out.csv", strategy=strategy, throttle=seen.append
+    )
+
+    assert sum(seen) == 3 * 1024 * 1024 + 5
+
+
+def test_save_hashing_is_accounted_to_scheduler(tmp_path):
+    save = Save.__new__(Save)
+    save.logger = logging.getLogger("act.utils.save")
+    save.io_scheduler = IOScheduler(report_interval=None)
+    path = tmp_path / "1001 (2025-01-01)RAW.csv"
+    path.write_bytes(b"y" * 4096)
+
+    save._file_sha256(str(path))
+
+    totals = save.io_scheduler.summary()
+    assert sum(entry["bytes"] for entry in totals.values()) == 4096
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+
+import pytest
+
+from act.utils.manifest_journal import ManifestJournal, journal_path_for
+from act.utils.manifest_store import SQLiteManifestStore
+from act.utils.save import Save
+
+
+class _Crash(BaseException):
+    """Stands in for the process dying mid-run (not caught by the subject rollback)."""
+
+
+def _make_save(root, subject_ids):
+    save = Save.__new__(Save)
+    save.manifest_path = str(root / "res" / "data.json")
+    save.manifest = {}
+    save.logger = logging.getLogger("act.utils.save")
+    save.INT_DIR = str(root / "int")
+    save.OBS_DIR = str(root / "obs")
+    save.RDSS_DIR = str(root / "rdss")
+    save.symlink = False
+    save.dupes = []
+    save.manifest_journal = ManifestJournal(journal_path_for(save.manifest_path))
+
+    save.matches = {}
+    for offset, subject_id in enumerate(subject_ids):
+        lab_id = str(3000 + offset)
+        filename = f"{lab_id} (2025-04-01)RAW.csv"
+        source_path = root / "rdss" / filename
+        source_path.parent.mkdir(parents=True, exist_ok=True)
+        source_path.write_text(f"{subject_id}-payload", encoding="utf-8")
+        save.matches[subject_id] = [
+            {"filename": filename, "labID": lab_id, "date": "2025-04-01"}
+        ]
+    return save
+
+
+def _manifest_bytes(root):
+    return (root / "res" / "data.json").read_bytes().replace(str(root).encode(), b"<root>")
+
+
+def test_journal_path_sits_next_to_manifest():
+    assert journal_path_for("res/data.json") == "res/data.journal.jsonl"
+
+
+def test_replay_ignores_torn_final_line(tmp_path):
+    journal = ManifestJournal(str(tmp_path / "data.journal.jsonl"))
+    journal.append("8001", [{"filename": "a.csv", "run": 1}])
+    journal.append("7001", [{"filename": "b.csv", "run": 1}])
+    journal.append("8001", [{"filename": "a.csv", "run": 1}, {"filename": "c.csv", "run": 2}])
+    with open(journal.path, "a", encoding="utf-8") as handle:
+        handle.write('{"v": 1, "subject_id": "9001", "rec')
+
+    replayed = journal.replay()
+
+    assert list(replayed.keys()) == ["8001", "7001"]
+    assert [record["filename"] for record in replayed["8001"]] == ["a.csv", "c.csv"]
+
+
+def test_replay_repairs_a_torn_tail_across_repeated_crashes(tmp_path):
+    journal = ManifestJournal(str(tmp_path / "data.journal.jsonl"))
+    journal.append("1", [])
+    for subject_id in ("2", "3"):
+        # The previous run died mid-append.
+        with open(journal.path, "a", encoding="utf-8") as handle:
+            handle.write('{"v": 1, "subject_id": "torn", "rec')
+        torn = open(journal.path, "rb").read()
+        journal.replay()
+        assert open(journal.path, "rb").read() == torn
+
+        journal.replay(repair=True)
+        journal.append(subject_id, [])
+
+    assert list(journal.replay()) == ["1", "2", "3"]
+
+
+def test_append_starts_a_new_line_after_an_unterminated_entry(tmp_path):
+    journal = ManifestJournal(str(tmp_path / "data.journal.jsonl"))
+    with open(journal.path, "w", encoding="utf-8") as handle:
+        handle.write('{"v": 1, "subject_id": "1", "records": []}')
+    journal.append("2", [])
+
+    assert list(journal.replay()) == ["1", "2"]
+
+
+def test_replay_rejects_corruption_before_the_tail(tmp_path):
+    journal = ManifestJournal(str(tmp_path / "data.journal.jsonl"))
+    with open(journal.path, "w", encoding="utf-8") as handle:
+        handle.write("not json\n")
+    journal.append("8001", [])
+
+    with pytest.raises(ValueError, match="Corrupt manifest journal"):
+        journal.replay()
+
+
+def test_interrupted_ingest_resumes_from_journal(tmp_path, monkeypatch, caplog):
+    subject_ids = ["8001", "7001", "8002", "7002"]
+
+    reference_root = tmp_path / "reference"
+    _make_save(reference_root, subject_ids).save()
+
+    root = tmp_path / "resumed"
+    original_copy = Save._copy_subject_record
+    copied = []
+
+    def crashing_copy(self, record):
+        if record["subject_id"] == "8002":
+            raise _Crash()
+        copied.append(record["subject_id"])
+        return original_copy(self, record)
+
+    monkeypatch.setattr(Save, "_copy_subject_record", crashing_copy)
+    with pytest.raises(_Crash):
+        _make_save(root, subject_ids).save()
+
+    journal_path = root / "res" / "data.journal.jsonl"
+    assert not (root / "res" / "data.json").exists()
+    assert [json.loads(line)["subject_id"] for line in journal_path.read_text().splitlines()] == [
+        "8001",
+        "7001",
+    ]
+
+    monkeypatch.setattr(
+        Save,
+        "_copy_subject_record",
+        lambda self, record: copied.append(record["subject_id"]) or original_copy(self, record),
+    )
+    with caplog.at_level(logging.INFO):
+        _make_save(root, subject_ids).save()
+
+    assert copied == ["8001", "7001", "8002", "7002"]
+    assert "resume_skip subject=8001" in caplog.text
+    assert "resume_skip subject=7001" in caplog.text
+    assert not journal_path.exists()
+    assert _manifest_bytes(root) == _manifest_bytes(reference_root)
+
+
+def test_failed_store_upsert_leaves_no_journal_entry(tmp_path, monkeypatch):
+    save = _make_save(tmp_path, ["8001"])
+    save.manifest_store = SQLiteManifestStore(str(tmp_path / "res" / "manifest.sqlite3"))
+
+    def locked(subject_id, records):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(save.manifest_store, "upsert_subject", locked)
+    journal_entries = []
+    original_clear = ManifestJournal.clear
+    monkeypatch.setattr(
+        ManifestJournal,
+        "clear",
+        lambda self: journal_entries.append(self.replay()) or original_clear(self),
+    )
+    save.save()
+
+    # The subject was rolled back, so nothing may be resumed from the journal.
+    assert journal_entries == [{}]
+    assert list((tmp_path / "int").rglob("*.csv")) + list((tmp_path / "obs").rglob("*.csv")) == []
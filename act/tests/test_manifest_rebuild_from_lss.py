@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import logging
+import os
+import time
 
 import pytest
 
+from act.utils.lss_index import LSSIndex
 from act.utils.save import Save
 
 
@@ -377,3 +380,90 @@ def test_atomic_manifest_write_preserves_existing_manifest_on_failure(tmp_path,
         )
 
     assert manifest_path.read_text(encoding="utf-8") == original_contents
+
+
+def _age_tree(root, seconds=60):
+    past = time.time() - seconds
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in dirnames + filenames:
+            os.utime(os.path.join(dirpath, name), (past, past))
+        os.utime(dirpath, (past, past))
+
+
+def _seed_lss_tree(tmp_path):
+    for study, subject, sessions in (
+        ("int", "8001", (1, 2)),
+        ("int", "8003", (1,)),
+        ("obs", "7001", (1, 2, 3)),
+    ):
+        for session in sessions:
+            _touch(
+                tmp_path
+                / study
+                / f"sub-{subject}"
+                / "accel"
+                / f"ses-{session}"
+                / f"sub-{subject}_ses-{session}_accel.csv"
+            )
+    _touch(tmp_path / "int" / "sub-8002" / "accel" / "ses-1" / "sub-8002_ses-1_accel.csv")
+    _touch(tmp_path / "int" / "sub-8002" / "accel" / "ses-1" / "sub-8002_ses-1_alt_accel.csv")
+    _touch(tmp_path / "obs" / "sub-7001" / "accel" / "all" / "ses-1" / "link.csv")
+    _age_tree(tmp_path)
+
+
+def test_discover_lss_sessions_index_skips_unchanged_subjects(tmp_path, monkeypatch):
+    _seed_lss_tree(tmp_path)
+    save = _make_save_for_lss(tmp_path)
+    save.lss_index = LSSIndex(str(tmp_path / "res" / "lss_index.json"))
+
+    listed = []
+    original = Save._candidate_session_csvs
+
+    def counting(self, session_dir):
+        listed.append(session_dir)
+        return original(self, session_dir)
+
+    monkeypatch.setattr(Save, "_candidate_session_csvs", counting)
+
+    first = save.discover_lss_sessions()
+    assert len(listed) == 7
+    assert list(first[0].keys()) == ["8001", "8003", "7001"]
+    assert list(first[1].keys()) == ["8002"]
+
+    listed.clear()
+    save.lss_index = LSSIndex(str(tmp_path / "res" / "lss_index.json"))
+    second = save.discover_lss_sessions()
+    assert listed == []
+    assert second == first
+
+    _touch(tmp_path / "obs" / "sub-7001" / "accel" / "ses-4" / "sub-7001_ses-4_accel.csv")
+    os.remove(tmp_path / "int" / "sub-8002" / "accel" / "ses-1" / "sub-8002_ses-1_alt_accel.csv")
+    listed.clear()
+
+    third, conflicts = save.discover_lss_sessions()
+
+    assert sorted(os.path.basename(path) for path in listed) == [
+        "ses-1",
+        "ses-1",
+        "ses-2",
+        "ses-3",
+        "ses-4",
+    ]
+    assert [record["run"] for record in third["7001"]] == [1, 2, 3, 4]
+    assert [record["run"] for record in third["8002"]] == [1]
+    assert conflicts == {}
+
+
+def test_discover_lss_sessions_rescans_inside_racy_window(tmp_path, monkeypatch):
+    _seed_lss_tree(tmp_path)
+    save = _make_save_for_lss(tmp_path)
+    save.lss_index = LSSIndex(str(tmp_path / "res" / "lss_index.json"))
+    save.discover_lss_sessions()
+
+    # A session directory modified just before the cached scan must not be trusted.
+    session_dir = tmp_path / "int" / "sub-8003" / "accel" / "ses-1"
+    state = save.lss_index.subjects(str(tmp_path / "int"))["sub-8003"]
+    os.utime(session_dir, ns=(state["scanned_at_ns"], state["scanned_at_ns"]))
+    state["sessions"]["ses-1"] = state["scanned_at_ns"]
+
+    assert save._cached_lss_subject_state(str(session_dir.parent), state) is None
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import logging
 
+import act.utils.save as save_module
+from act.utils import metrics
+from act.utils.digest_index import DigestIndex
 from act.utils.save import Save
 
 
@@ -190,3 +193,266 @@ def test_apply_two_phase_renames_fails_on_ambiguous_source_session(tmp_path):
         raise AssertionError("Expected ambiguous session failure")
 
     assert "multiple accel csv candidates" in message
+
+
+def test_reconcile_manifest_reuses_persisted_digests(tmp_path, monkeypatch):
+    save = _make_save(tmp_path)
+    index_path = tmp_path / "res" / "digest_index.json"
+    save.digest_index = DigestIndex(str(index_path))
+    source_path = tmp_path / "rdss" / "1201 (2025-03-01)RAW.csv"
+    destination_path = (
+        tmp_path
+        / "int"
+        / "sub-8001"
+        / "accel"
+        / "ses-1"
+        / "sub-8001_ses-1_accel.csv"
+    )
+    _write(source_path, "canonical-data")
+    _write(destination_path, "canonical-data")
+
+    save.manifest = {
+        "8001": [
+            {
+                "filename": source_path.name,
+                "labID": "1201",
+                "date": "2025-03-01",
+                "run": 1,
+                "study": "int",
+                "file_path": str(destination_path),
+            }
+        ]
+    }
+    save._save_manifest(str(save.manifest_path))
+
+    first_report = save.reconcile_manifest()
+    assert first_report["errors"] == []
+    assert index_path.exists()
+
+    rerun = _make_save(tmp_path)
+    rerun.digest_index = DigestIndex(str(index_path))
+    assert len(rerun.digest_index) == 2
+
+    def fail_sha256(*_args, **_kwargs):
+        raise AssertionError("unchanged files must not be rehashed")
+
+    monkeypatch.setattr(save_module.hashlib, "sha256", fail_sha256)
+    second_report = rerun.reconcile_manifest()
+    assert second_report["errors"] == []
+    assert second_report["mismatched"] == 0
+    monkeypatch.undo()
+
+    _write(destination_path, "tampered")
+    third = _make_save(tmp_path)
+    third.digest_index = DigestIndex(str(index_path))
+    third_report = third.reconcile_manifest()
+
+    assert third_report["mismatched"] == 1
+    assert third_report["repaired"] == 1
+    assert destination_path.read_text(encoding="utf-8") == "canonical-data"
+
+
+def test_digest_index_invalidates_on_stat_change(tmp_path):
+    target = tmp_path / "file.csv"
+    _write(target, "original")
+    index = DigestIndex(str(tmp_path / "index.json"))
+    index.update(target, "abc123", target.stat())
+
+    assert index.lookup(target) == "abc123"
+
+    _write(target, "rewritten-with-new-size")
+
+    assert index.lookup(target) is None
+    assert len(index) == 0
+
+
+def test_reconcile_manifest_verifies_against_stored_digest(tmp_path):
+    save = _make_save(tmp_path)
+    source_path = tmp_path / "rdss" / "1201 (2025-03-01)RAW.csv"
+    destination_path = (
+        tmp_path
+        / "int"
+        / "sub-8001"
+        / "accel"
+        / "ses-1"
+        / "sub-8001_ses-1_accel.csv"
+    )
+    _write(source_path, "canonical-data")
+    _write(destination_path, "canonical-data")
+
+    save.manifest = {
+        "8001": [
+            {
+                "filename": source_path.name,
+                "labID": "1201",
+                "date": "2025-03-01",
+                "run": 1,
+                "study": "int",
+                "file_path": str(destination_path),
+            }
+        ]
+    }
+    save._save_manifest(str(save.manifest_path))
+
+    first_report = save.reconcile_manifest()
+    assert first_report["errors"] == []
+
+    stored = save._load_manifest(save.manifest_path)["8001"][0]
+    assert stored["sha256"] == save._file_sha256(str(destination_path))
+    assert stored["size"] == len("canonical-data")
+
+    compared = []
+    original_compare = save._compare_file_identity
+
+    def tracking_compare(source, destination):
+        compared.append((source, destination))
+        return original_compare(source, destination)
+
+    save._compare_file_identity = tracking_compare
+    second_report = save.reconcile_manifest()
+
+    assert second_report["errors"] == []
+    assert second_report["mismatched"] == 0
+    assert compared == []
+
+    _write(destination_path, "corrupted")
+    third_report = save.reconcile_manifest()
+
+    assert third_report["mismatched"] == 1
+    assert third_report["repaired"] == 1
+    assert compared == []
+    assert destination_path.read_text(encoding="utf-8") == "canonical-data"
+
+
+def _seed_tier_manifest(save, tmp_path, count=3, size=256 * 1024):
+    records = []
+    for run in range(1, count + 1):
+        source_path = tmp_path / "rdss" / f"1201 (2025-03-0{run})RAW.csv"
+        destination_path = (
+            tmp_path
+            / "int"
+            / "sub-8001"
+            / "accel"
+            / f"ses-{run}"
+            / f"sub-8001_ses-{run}_accel.csv"
+        )
+        payload = bytes([run]) * size
+        source_path.parent.mkdir(parents=True, exist_ok=True)
+        source_path.write_bytes(payload)
+        destination_path.parent.mkdir(parents=True, exist_ok=True)
+        destination_path.write_bytes(payload)
+        save._copy_file_contents(str(source_path), str(destination_path))
+        save_module.shutil.copystat(source_path, destination_path)
+        records.append(
+            {
+                "filename": source_path.name,
+                "labID": "1201",
+                "date": f"2025-03-0{run}",
+                "run": run,
+                "study": "int",
+                "file_path": str(destination_path),
+            }
+        )
+    save.manifest = {"8001": records}
+    save._save_manifest(str(save.manifest_path))
+    return records
+
+
+def test_reconcile_stat_tier_reads_no_content(tmp_path):
+    save = _make_save(tmp_path)
+    records = _seed_tier_manifest(save, tmp_path)
+
+    report = save.reconcile_manifest(verify="stat")
+
+    assert report["verify"] == "stat"
+    assert report["total_records"] == 3
+    assert report["mismatched"] == 0
+    assert report["bytes_read"] == 0
+    assert "elapsed_seconds" in report
+
+    with open(records[1]["file_path"], "ab") as handle:
+        handle.write(b"extra")
+
+    report = save.reconcile_manifest(verify="stat")
+
+    assert report["mismatched"] == 1
+    assert report["repaired"] == 1
+
+
+def test_reconcile_stat_tier_confirms_mtime_mismatch_by_content(tmp_path, caplog):
+    save = _make_save(tmp_path)
+    records = _seed_tier_manifest(save, tmp_path)
+    # Archives copied with shutil.copy carry the copy time, not the source mtime.
+    for record in records:
+        save_module.os.utime(record["file_path"], ns=(0, 1_000_000_000))
+    with open(records[2]["file_path"], "r+b") as handle:
+        handle.write(b"\xff")
+    save_module.os.utime(records[2]["file_path"], ns=(0, 1_000_000_000))
+
+    with caplog.at_level("WARNING", logger="act.utils.save"):
+        report = save.reconcile_manifest(verify="stat")
+
+    assert report["mismatched"] == 1
+    assert report["repaired"] == 1
+    assert 0 < report["bytes_read"]
+    assert "mtime_match=False" in caplog.text
+    assert "hash_match=False" in caplog.text
+
+    # The verified files now carry the source mtime, so stat reads nothing.
+    report = save.reconcile_manifest(verify="stat")
+    assert report["mismatched"] == 0
+    assert report["bytes_read"] == 0
+
+
+def test_reconcile_sample_tier_detects_sampled_corruption(tmp_path):
+    save = _make_save(tmp_path)
+    records = _seed_tier_manifest(save, tmp_path, size=4 * 1024 * 1024)
+    destination = records[0]["file_path"]
+    stat_before = save_module.os.stat(destination)
+    with open(destination, "r+b") as handle:
+        handle.write(b"\xff")
+    save_module.os.utime(
+        destination, ns=(stat_before.st_atime_ns, stat_before.st_mtime_ns)
+    )
+
+    assert save.reconcile_manifest(verify="stat")["mismatched"] == 0
+
+    report = save.reconcile_manifest(verify="sample")
+
+    assert report["mismatched"] == 1
+    assert report["repaired"] == 1
+    sampled = save_module.SAMPLE_BLOCK_SIZE * save_module.SAMPLE_BLOCK_COUNT
+    # Samples of every file, then the repair's copy and its hash pass.
+    assert 0 < report["bytes_read"] <= 3 * 2 * sampled + 2 * 4 * 1024 * 1024
+
+
+def test_reconcile_parallel_matches_serial(tmp_path):
+    save = _make_save(tmp_path)
+    records = _seed_tier_manifest(save, tmp_path, count=6)
+    with open(records[3]["file_path"], "wb") as handle:
+        handle.write(b"stale")
+
+    serial = save.reconcile_manifest(verify="full", workers=1)
+    with open(records[3]["file_path"], "wb") as handle:
+        handle.write(b"stale")
+    parallel = save.reconcile_manifest(verify="full", workers=4)
+
+    for key in ("total_records", "repaired", "mismatched", "errors"):
+        assert serial[key] == parallel[key]
+    assert parallel["repaired"] == 1
+
+
+def test_reconcile_workers_report_bytes_to_the_reconcile_span(tmp_path):
+    save = _make_save(tmp_path)
+    _seed_tier_manifest(save, tmp_path, count=4)
+
+    recorder = metrics.start_run()
+    try:
+        with metrics.span("reconcile", verify="full"):
+            report = save.reconcile_manifest(verify="full", workers=4)
+    finally:
+        metrics.finish_run()
+
+    counters = recorder.stages()["reconcile"]["counters"]
+    assert report["bytes_read"] > 0
+    assert counters.get("bytes_read") == report["bytes_read"]
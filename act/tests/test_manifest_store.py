@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import json
+import logging
+
+import pytest
+
+from act.utils.manifest_store import SQLiteManifestStore
+from act.utils.save import Save
+
+
+def _make_save(root, backend):
+    save = Save.__new__(Save)
+    save.manifest_path = str(root / "res" / "data.json")
+    save.manifest = {}
+    save.logger = logging.getLogger("act.utils.save")
+    save.INT_DIR = str(root / "int")
+    save.OBS_DIR = str(root / "obs")
+    save.RDSS_DIR = str(root / "rdss")
+    save.symlink = False
+    if backend == "sqlite":
+        save.manifest_store = SQLiteManifestStore(str(root / "res" / "manifest.sqlite3"))
+    return save
+
+
+def _seed_matches(save, root, subject_ids, days):
+    matches = {}
+    for offset, subject_id in enumerate(subject_ids):
+        lab_id = str(3000 + offset)
+        records = []
+        for day in days:
+            filename = f"{lab_id} (2025-04-0{day})RAW.csv"
+            source_path = root / "rdss" / filename
+            source_path.parent.mkdir(parents=True, exist_ok=True)
+            source_path.write_text(f"{subject_id}-{day}", encoding="utf-8")
+            records.append({"filename": filename, "labID": lab_id, "date": f"2025-04-0{day}"})
+        matches[subject_id] = records
+
+    matches = save._determine_run(matches)
+    matches = save._determine_study(matches)
+    return save._determine_location(matches)
+
+
+def _ingest(save, root, subject_ids, days, workers=1):
+    save.ingest_workers = workers
+    save.manifest = save._load_manifest(save.manifest_path)
+    save._run_subject_transactions(_seed_matches(save, root, subject_ids, days))
+    save._save_manifest(save.manifest_path)
+
+
+def _relative_manifest_bytes(root):
+    return (root / "res" / "data.json").read_bytes().replace(str(root).encode(), b"<root>")
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_sqlite_backend_exports_byte_identical_data_json(tmp_path, workers):
+    subject_ids = ["8003", "7001", "8001"]
+    exported = {}
+    for backend in ("json", "sqlite"):
+        root = tmp_path / backend
+        save = _make_save(root, backend)
+        _ingest(save, root, subject_ids, days=(2, 3), workers=workers)
+        _ingest(save, root, subject_ids + ["7002"], days=(1,), workers=workers)
+        exported[backend] = _relative_manifest_bytes(root)
+
+    assert exported["sqlite"] == exported["json"]
+    assert list(json.loads(exported["sqlite"]).keys()) == subject_ids + ["7002"]
+
+
+def test_sqlite_backend_seeds_from_existing_data_json(tmp_path, manifest_factory):
+    payload = {
+        "8001": [{"filename": "1101 (2025-01-01)RAW.csv", "labID": "1101", "date": "2025-01-01", "run": 1}],
+        "7001": [{"filename": "1102 (2025-01-02)RAW.csv", "labID": "1102", "date": "2025-01-02", "run": 1}],
+    }
+    manifest_factory(payload)
+    save = _make_save(tmp_path, "sqlite")
+
+    assert save._load_manifest(save.manifest_path) == payload
+    assert save.manifest_store.load() == payload
+    assert list(save.manifest_store.load().keys()) == ["8001", "7001"]
+
+
+def test_store_indexed_lookups_and_subject_upsert(tmp_path):
+    store = SQLiteManifestStore(str(tmp_path / "manifest.sqlite3"))
+    store.replace_all(
+        {
+            "8001": [
+                {"filename": "1101 (2025-01-01)RAW.csv", "labID": "1101", "date": "2025-01-01", "run": 1},
+                {"filename": "1101 (2025-02-01)RAW.csv", "labID": "1101", "date": "2025-02-01", "run": 2},
+            ],
+            "7001": [{"filename": "1102 (2025-01-01)RAW.csv", "labID": "1102", "date": "2025-01-01", "run": 1}],
+        }
+    )
+
+    assert [subject for subject, _ in store.find_records(lab_id="1101")] == ["8001", "8001"]
+    assert [subject for subject, _ in store.find_records(date="2025-01-01")] == ["8001", "7001"]
+    assert store.find_records(filename="1102 (2025-01-01)RAW.csv")[0][1]["labID"] == "1102"
+
+    store.upsert_subject("8001", [{"filename": "x.csv", "labID": "1101", "date": "2025-03-01", "run": 1}])
+    store.upsert_subject("9001", [])
+
+    assert store.find_records(subject_id="8001") == [
+        ("8001", {"filename": "x.csv", "labID": "1101", "date": "2025-03-01", "run": 1})
+    ]
+    assert list(store.load().keys()) == ["8001", "7001", "9001"]
+
+    plan = store._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT payload FROM records WHERE lab_id = ?", ("1101",)
+    ).fetchall()
+    assert "records_lab_id_idx" in " ".join(str(row) for row in plan)
+
+
+def test_failed_subject_upsert_leaves_store_and_manifest_untouched(tmp_path, monkeypatch):
+    save = _make_save(tmp_path, "sqlite")
+    _ingest(save, tmp_path, ["8001"], days=(1,))
+    before = save.manifest_store.load()
+
+    def fail_upsert(subject_id, records):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(save.manifest_store, "upsert_subject", fail_upsert)
+    save.manifest = save._load_manifest(save.manifest_path)
+    save._run_subject_transactions(_seed_matches(save, tmp_path, ["8001"], days=(2,)))
+
+    assert save.manifest_store.load() == before
+    assert save.manifest == before
+    assert list(tmp_path.glob("*/sub-8001/accel/ses-1/*.csv"))
+    assert not list(tmp_path.glob("*/sub-8001/accel/ses-2/*.csv"))
+
+
+def test_sqlite_backend_reseeds_after_a_json_backend_run(tmp_path):
+    sqlite_save = _make_save(tmp_path, "sqlite")
+    _ingest(sqlite_save, tmp_path, ["8001"], days=(1,))
+    assert sqlite_save.manifest_store.get_meta("data_json_sha256") is not None
+
+    # A cron run on the default json backend adds a subject to data.json only.
+    json_save = _make_save(tmp_path, "json")
+    _ingest(json_save, tmp_path, ["8001", "7001"], days=(1,))
+    after_json_run = json.loads((tmp_path / "res" / "data.json").read_text(encoding="utf-8"))
+
+    rerun = _make_save(tmp_path, "sqlite")
+    _ingest(rerun, tmp_path, ["8001"], days=(1,))
+
+    exported = json.loads((tmp_path / "res" / "data.json").read_text(encoding="utf-8"))
+    assert set(after_json_run) == {"8001", "7001"}
+    assert exported == after_json_run
+    assert rerun.manifest_store.load() == exported
+
+
+def test_sqlite_backend_keeps_store_when_data_json_is_unchanged(tmp_path):
+    save = _make_save(tmp_path, "sqlite")
+    _ingest(save, tmp_path, ["8001"], days=(1,))
+    replaced = []
+    original_replace_all = save.manifest_store.replace_all
+
+    def tracking_replace_all(payload, meta=None):
+        replaced.append(payload)
+        return original_replace_all(payload, meta=meta)
+
+    save.manifest_store.replace_all = tracking_replace_all
+
+    assert list(save._load_manifest(save.manifest_path)) == ["8001"]
+    assert replaced == []
+
+
+def test_plan_reads_data_json_without_creating_the_store(tmp_path, manifest_factory):
+    payload = {
+        "8001": [{"filename": "1101 (2025-01-01)RAW.csv", "labID": "1101", "date": "2025-01-01", "run": 1}],
+    }
+    manifest_factory(payload)
+    save = _make_save(tmp_path, "sqlite")
+    store_path = tmp_path / "res" / "manifest.sqlite3"
+    assert not store_path.exists()
+
+    assert save._load_manifest(save.manifest_path, read_only=True) == payload
+    assert not store_path.exists()
+
+    save.matches = {}
+    save.dupes = []
+    save.plan()
+    assert not store_path.exists()
+
+
+def test_plan_leaves_a_stale_store_untouched(tmp_path):
+    save = _make_save(tmp_path, "sqlite")
+    _ingest(save, tmp_path, ["8001"], days=(1,))
+    json_save = _make_save(tmp_path, "json")
+    _ingest(json_save, tmp_path, ["8001", "7001"], days=(1,))
+    save.manifest_store.close()
+
+    planner = _make_save(tmp_path, "sqlite")
+    stored = planner.manifest_store.load()
+    assert list(planner._load_manifest(planner.manifest_path, read_only=True)) == ["8001", "7001"]
+    assert planner.manifest_store.load() == stored
+    assert list(stored) == ["8001"]
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import contextvars
+import importlib
+import json
+import sys
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from act.utils import metrics
+
+
+class StepClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 1.0
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def _no_active_run():
+    metrics.finish_run()
+    yield
+    metrics.finish_run()
+
+
+def test_metrics_path_for_pairs_with_log_file():
+    assert metrics.metrics_path_for("logs/vosslnx/20250101_020000.log") == (
+        "logs/vosslnx/20250101_020000.metrics.json"
+    )
+    assert metrics.metrics_path_for(None) is None
+
+
+def test_spans_nest_and_aggregate_counters():
+    recorder = metrics.MetricsRecorder(clock=StepClock(), system="local")
+
+    with recorder.span("ingest") as ingest:
+        for subject in ("8001", "7001"):
+            with recorder.span("ingest.subject", subject=subject):
+                metrics.add(bytes_read=10, copies=1)
+        ingest.add(subjects=2)
+
+    snapshot = recorder.snapshot()
+    spans = {(span["name"], span["attributes"].get("subject")): span for span in snapshot["spans"]}
+    parent_id = spans[("ingest", None)]["id"]
+    assert spans[("ingest.subject", "8001")]["parent"] == parent_id
+    assert spans[("ingest.subject", "8001")]["wall_s"] == 1.0
+    assert snapshot["stages"]["ingest.subject"]["count"] == 2
+    assert snapshot["stages"]["ingest.subject"]["counters"] == {"bytes_read": 20, "copies": 2}
+    assert snapshot["stages"]["ingest"]["counters"] == {"subjects": 2}
+    assert snapshot["attributes"] == {"system": "local"}
+
+
+def test_worker_spans_nest_under_dispatching_span():
+    recorder = metrics.MetricsRecorder()
+
+    def work(subject):
+        with recorder.span("ingest.subject", subject=subject):
+            metrics.add(copies=1)
+
+    with recorder.span("ingest"):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for future in [
+                executor.submit(contextvars.copy_context().run, work, subject)
+                for subject in ("1", "2", "3")
+            ]:
+                future.result()
+
+    spans = recorder.snapshot()["spans"]
+    ingest_id = next(span["id"] for span in spans if span["name"] == "ingest")
+    workers = [span for span in spans if span["name"] == "ingest.subject"]
+    assert [span["parent"] for span in workers] == [ingest_id] * 3
+    assert sum(span["counters"]["copies"] for span in workers) == 3
+
+
+def test_span_records_error_and_reraises():
+    recorder = metrics.MetricsRecorder()
+
+    with pytest.raises(KeyError):
+        with recorder.span("compare_ids"):
+            raise KeyError("boom")
+
+    stage = recorder.snapshot()["stages"]["compare_ids"]
+    assert stage["errors"] == 1
+    assert recorder.snapshot()["spans"][0]["error"] == "KeyError"
+
+
+def test_module_span_is_noop_without_active_run():
+    with metrics.span("ingest") as span:
+        span.add(bytes_read=5)
+        metrics.add(copies=1)
+
+    assert metrics.finish_run() is None
+
+
+def test_main_writes_metrics_next_to_log_file(tmp_path, monkeypatch, request):
+    class FakePipe:
+        def __init__(self, **kwargs):
+            pass
+
+        def run_pipe(self):
+            with metrics.span("ingest"):
+                metrics.add(bytes_written=42)
+
+    class FakeGroup:
+        def __init__(self, system):
+            pass
+
+        def plot_person(self):
+            pass
+
+        def plot_session(self):
+            pass
+
+    pipe_mod = types.ModuleType("act.utils.pipe")
+    group_mod = types.ModuleType("act.utils.group")
+    pipe_mod.Pipe = FakePipe
+    group_mod.Group = FakeGroup
+    monkeypatch.setitem(sys.modules, "act.utils.pipe", pipe_mod)
+    monkeypatch.setitem(sys.modules, "act.utils.group", group_mod)
+    if "act.main" not in sys.modules:
+        # Later runpy-based tests expect to execute act.main fresh.
+        request.addfinalizer(lambda: sys.modules.pop("act.main", None))
+    main_mod = importlib.import_module("act.main")
+    monkeypatch.setattr(main_mod, "_configure_logging", lambda: None)
+    log_file = tmp_path / "logs" / "local" / "20250101_020000.log"
+    monkeypatch.setenv("LOG_FILE", str(log_file))
+
+    exit_code = main_mod.main(
+        ["--token", "abc123", "--daysago", "3", "--system", "local"]
+    )
+
+    assert exit_code == 0
+    payload = json.loads(log_file.with_suffix(".metrics.json").read_text(encoding="utf-8"))
+    assert payload["status"] == "ok"
+    assert payload["attributes"]["mode"] == "full"
+    assert payload["stages"]["ingest"]["counters"] == {"bytes_written": 42}
+    assert payload["stages"]["plot"]["count"] == 2
@@ -24,6 +24,8 @@ def test_pipeline_smoke_mocked_dependencies(tmp_path, monkeypatch):
     gg_state = {"init_kwargs": None, "ran": False}
 
     class FakeSave:
+        changed_sessions = ["int/sub-8001/accel/ses-1/sub-8001_ses-1_accel.csv"]
+
         def __init__(self, **kwargs):
             save_state["init_kwargs"] = kwargs
 
@@ -77,8 +79,13 @@ def test_pipeline_smoke_mocked_dependencies(tmp_path, monkeypatch):
 
     assert save_state["init_kwargs"]["symlink"] is False
     assert save_state["init_kwargs"]["token"] == "token"
+    assert save_state["init_kwargs"]["ingest_workers"] == 1
+    assert save_state["init_kwargs"]["manifest_backend"] == "json"
     assert gg_state["ran"] is True
     assert gg_state["init_kwargs"]["matched"] == payload
+    assert gg_state["init_kwargs"]["changed_sessions"] == FakeSave.changed_sessions
+    assert gg_state["init_kwargs"]["ggir_workers"] == 1
+    assert gg_state["init_kwargs"]["memory_budget"] is None
     assert save_state["remove_calls"] == [
         [str(tmp_path / "int"), str(tmp_path / "obs")]
     ]
@@ -185,8 +192,9 @@ def test_pipeline_reconcile_only_skips_ingest_and_ggir(tmp_path, monkeypatch):
             save_state["rebuild_called"] += 1
             return {}
 
-        def reconcile_manifest(self):
+        def reconcile_manifest(self, verify="full"):
             save_state["reconcile_called"] += 1
+            save_state["verify"] = verify
             return {"total_records": 1, "repaired": 0, "errors": []}
 
         @staticmethod
@@ -227,7 +235,11 @@ def test_pipeline_reconcile_only_skips_ingest_and_ggir(tmp_path, monkeypatch):
     }
 
     pipe = pipe_mod.Pipe(
-        token="token", daysago=1, system="local", reconcile_manifest_only=True
+        token="token",
+        daysago=1,
+        system="local",
+        reconcile_manifest_only=True,
+        verify="sample",
     )
     report = pipe.run_pipe()
 
@@ -236,11 +248,91 @@ def test_pipeline_reconcile_only_skips_ingest_and_ggir(tmp_path, monkeypatch):
     assert save_state["save_called"] == 0
     assert save_state["rebuild_called"] == 0
     assert save_state["reconcile_called"] == 1
+    assert save_state["verify"] == "sample"
     assert save_state["remove_calls"] == [
         [str(tmp_path / "int"), str(tmp_path / "obs")]
     ]
 
 
+def test_run_pipe_plan_only_skips_ingest_and_cleanup(tmp_path, monkeypatch):
+    save_state = {
+        "init_kwargs": None,
+        "remove_calls": [],
+        "save_called": 0,
+        "rebuild_called": 0,
+        "reconcile_called": 0,
+    }
+    gg_state = {"ran": False}
+
+    class FakeSave:
+        def __init__(self, **kwargs):
+            save_state["init_kwargs"] = kwargs
+            self.manifest_path = "res/data.json"
+
+        def save(self):
+            save_state["save_called"] += 1
+            return {}
+
+        def rebuild_manifest_payload_from_lss(self):
+            save_state["rebuild_called"] += 1
+            return {}
+
+        def plan(self):
+            save_state["plan_called"] = save_state.get("plan_called", 0) + 1
+            return {"totals": {"copies": 2}}
+
+        def reconcile_manifest(self, verify="full"):
+            save_state["reconcile_called"] += 1
+            save_state["verify"] = verify
+            return {"total_records": 1, "repaired": 0, "errors": []}
+
+        @staticmethod
+        def remove_symlink_directories(study_dirs):
+            save_state["remove_calls"].append(study_dirs)
+
+    class FakeGG:
+        def __init__(self, **kwargs):
+            pass
+
+        def run_gg(self):
+            gg_state["ran"] = True
+
+    code_pkg = _ensure_package(monkeypatch, "code")
+    utils_pkg = _ensure_package(monkeypatch, "act.utils")
+    core_pkg = _ensure_package(monkeypatch, "act.core")
+
+    save_mod = types.ModuleType("act.utils.save")
+    save_mod.Save = FakeSave
+    gg_mod = types.ModuleType("act.core.gg")
+    gg_mod.GG = FakeGG
+
+    utils_pkg.save = save_mod
+    core_pkg.gg = gg_mod
+    code_pkg.utils = utils_pkg
+    code_pkg.core = core_pkg
+
+    _install_module(monkeypatch, "act.utils.save", save_mod)
+    _install_module(monkeypatch, "act.core.gg", gg_mod)
+
+    pipe_mod = importlib.import_module("act.utils.pipe")
+    pipe_mod = importlib.reload(pipe_mod)
+    monkeypatch.chdir(tmp_path)
+    pipe_mod.Pipe._SYSTEM_PATHS["local"] = {
+        "INT_DIR": str(tmp_path / "int"),
+        "OBS_DIR": str(tmp_path / "obs"),
+        "RDSS_DIR": str(tmp_path / "rdss"),
+    }
+
+    pipe = pipe_mod.Pipe(token="token", daysago=1, system="local", plan_only=True)
+    plan = pipe.run_pipe()
+
+    assert plan == {"totals": {"copies": 2}}
+    assert save_state["plan_called"] == 1
+    assert save_state["save_called"] == 0
+    assert save_state["remove_calls"] == []
+    assert gg_state["ran"] is False
+
+
 def test_main_smoke_invokes_pipe_and_group(monkeypatch):
     call_state = {"pipe_args": None, "run_pipe": 0, "group_systems": []}
 
@@ -252,6 +344,16 @@ def test_main_smoke_invokes_pipe_and_group(monkeypatch):
             system,
             rebuild_manifest_only=False,
             reconcile_manifest_only=False,
+            ingest_workers=1,
+            verify="full",
+            offline=False,
+            manifest_backend="json",
+            plan_only=False,
+            io_bytes_per_second=None,
+            io_max_concurrent=None,
+            ggir_workers=1,
+            ggir_memory_budget=None,
+            ggir_persistent_workers=False,
         ):
             call_state["pipe_args"] = {
                 "token": token,
@@ -259,6 +361,16 @@ def test_main_smoke_invokes_pipe_and_group(monkeypatch):
                 "system": system,
                 "rebuild_manifest_only": rebuild_manifest_only,
                 "reconcile_manifest_only": reconcile_manifest_only,
+                "ingest_workers": ingest_workers,
+                "verify": verify,
+                "offline": offline,
+                "manifest_backend": manifest_backend,
+                "plan_only": plan_only,
+                "io_bytes_per_second": io_bytes_per_second,
+                "io_max_concurrent": io_max_concurrent,
+                "ggir_workers": ggir_workers,
+                "ggir_memory_budget": ggir_memory_budget,
+                "ggir_persistent_workers": ggir_persistent_workers,
             }
 
         def run_pipe(self):
@@ -312,6 +424,16 @@ def test_main_smoke_invokes_pipe_and_group(monkeypatch):
         "system": "local",
         "rebuild_manifest_only": False,
         "reconcile_manifest_only": False,
+        "ingest_workers": 1,
+        "verify": "full",
+        "offline": False,
+        "manifest_backend": "json",
+        "plan_only": False,
+        "io_bytes_per_second": None,
+        "io_max_concurrent": None,
+        "ggir_workers": 1,
+        "ggir_memory_budget": None,
+        "ggir_persistent_workers": False,
     }
     assert call_state["run_pipe"] == 1
     assert call_state["group_systems"] == ["local", "person", "local", "session"]
@@ -328,6 +450,16 @@ def test_main_manifest_only_skips_plotting(monkeypatch):
             system,
             rebuild_manifest_only=False,
             reconcile_manifest_only=False,
+            ingest_workers=1,
+            verify="full",
+            offline=False,
+            manifest_backend="json",
+            plan_only=False,
+            io_bytes_per_second=None,
+            io_max_concurrent=None,
+            ggir_workers=1,
+            ggir_memory_budget=None,
+            ggir_persistent_workers=False,
         ):
             call_state["pipe_args"] = {
                 "token": token,
@@ -335,6 +467,16 @@ def test_main_manifest_only_skips_plotting(monkeypatch):
                 "system": system,
                 "rebuild_manifest_only": rebuild_manifest_only,
                 "reconcile_manifest_only": reconcile_manifest_only,
+                "ingest_workers": ingest_workers,
+                "verify": verify,
+                "offline": offline,
+                "manifest_backend": manifest_backend,
+                "plan_only": plan_only,
+                "io_bytes_per_second": io_bytes_per_second,
+                "io_max_concurrent": io_max_concurrent,
+                "ggir_workers": ggir_workers,
+                "ggir_memory_budget": ggir_memory_budget,
+                "ggir_persistent_workers": ggir_persistent_workers,
             }
 
         def run_pipe(self):
@@ -388,6 +530,16 @@ def test_main_manifest_only_skips_plotting(monkeypatch):
         "system": "local",
         "rebuild_manifest_only": True,
         "reconcile_manifest_only": False,
+        "ingest_workers": 1,
+        "verify": "full",
+        "offline": False,
+        "manifest_backend": "json",
+        "plan_only": False,
+        "io_bytes_per_second": None,
+        "io_max_concurrent": None,
+        "ggir_workers": 1,
+        "ggir_memory_budget": None,
+        "ggir_persistent_workers": False,
     }
     assert call_state["run_pipe"] == 1
     assert call_state["group_inits"] == 0
@@ -404,6 +556,16 @@ def test_main_reconcile_only_returns_zero_and_skips_plotting(monkeypatch):
             system,
             rebuild_manifest_only=False,
             reconcile_manifest_only=False,
+            ingest_workers=1,
+            verify="full",
+            offline=False,
+            manifest_backend="json",
+            plan_only=False,
+            io_bytes_per_second=None,
+            io_max_concurrent=None,
+            ggir_workers=1,
+            ggir_memory_budget=None,
+            ggir_persistent_workers=False,
         ):
             call_state["pipe_args"] = {
                 "token": token,
@@ -411,6 +573,16 @@ def test_main_reconcile_only_returns_zero_and_skips_plotting(monkeypatch):
                 "system": system,
                 "rebuild_manifest_only": rebuild_manifest_only,
                 "reconcile_manifest_only": reconcile_manifest_only,
+                "ingest_workers": ingest_workers,
+                "verify": verify,
+                "offline": offline,
+                "manifest_backend": manifest_backend,
+                "plan_only": plan_only,
+                "io_bytes_per_second": io_bytes_per_second,
+                "io_max_concurrent": io_max_concurrent,
+                "ggir_workers": ggir_workers,
+                "ggir_memory_budget": ggir_memory_budget,
+                "ggir_persistent_workers": ggir_persistent_workers,
             }
 
         def run_pipe(self):
@@ -467,6 +639,16 @@ def test_main_reconcile_only_returns_zero_and_skips_plotting(monkeypatch):
         "system": "local",
         "rebuild_manifest_only": False,
         "reconcile_manifest_only": True,
+        "ingest_workers": 1,
+        "verify": "full",
+        "offline": False,
+        "manifest_backend": "json",
+        "plan_only": False,
+        "io_bytes_per_second": None,
+        "io_max_concurrent": None,
+        "ggir_workers": 1,
+        "ggir_memory_budget": None,
+        "ggir_persistent_workers": False,
     }
     assert call_state["run_pipe"] == 1
     assert call_state["group_inits"] == 0
@@ -481,6 +663,16 @@ def test_main_reconcile_only_returns_nonzero_on_failures(monkeypatch):
             system,
             rebuild_manifest_only=False,
             reconcile_manifest_only=False,
+            ingest_workers=1,
+            verify="full",
+            offline=False,
+            manifest_backend="json",
+            plan_only=False,
+            io_bytes_per_second=None,
+            io_max_concurrent=None,
+            ggir_workers=1,
+            ggir_memory_budget=None,
+            ggir_persistent_workers=False,
         ):
             pass
 
@@ -542,6 +734,16 @@ def test_main_manifest_only_returns_nonzero_on_rebuild_error(monkeypatch):
             system,
             rebuild_manifest_only=False,
             reconcile_manifest_only=False,
+            ingest_workers=1,
+            verify="full",
+            offline=False,
+            manifest_backend="json",
+            plan_only=False,
+            io_bytes_per_second=None,
+            io_max_concurrent=None,
+            ggir_workers=1,
+            ggir_memory_budget=None,
+            ggir_persistent_workers=False,
         ):
             pass
 
@@ -656,3 +858,137 @@ def test_parse_args_invalid_invocations(argv):
         parser.parse_args(argv)
 
     assert exc.value.code == 2
+
+
+def test_parse_args_ingest_workers():
+    main_mod = importlib.import_module("act.main")
+    parser = main_mod.build_parser()
+
+    args = parser.parse_args(
+        ["--token", "abc123", "--daysago", "3", "--system", "local"]
+    )
+    assert args.ingest_workers == 1
+
+    args = parser.parse_args(
+        [
+            "--token",
+            "abc123",
+            "--daysago",
+            "3",
+            "--system",
+            "local",
+            "--ingest-workers",
+            "8",
+        ]
+    )
+    assert args.ingest_workers == 8
+
+    with pytest.raises(SystemExit) as exc:
+        parser.parse_args(
+            [
+                "--token",
+                "abc123",
+                "--daysago",
+                "3",
+                "--system",
+                "local",
+                "--ingest-workers",
+                "0",
+            ]
+        )
+    assert exc.value.code == 2
+
+
+def test_parse_args_verify_tier():
+    main_mod = importlib.import_module("act.main")
+    args = main_mod.build_parser().parse_args(
+        [
+            "--token",
+            "abc123",
+            "--daysago",
+            "3",
+            "--system",
+            "local",
+            "--reconcile-manifest-only",
+            "--verify",
+            "stat",
+        ]
+    )
+    assert args.verify == "stat"
+
+
+def test_parse_args_manifest_backend():
+    main_mod = importlib.import_module("act.main")
+    base = ["--token", "abc123", "--daysago", "3", "--system", "local"]
+
+    assert main_mod.build_parser().parse_args(base).manifest_backend == "json"
+    args = main_mod.build_parser().parse_args(base + ["--manifest-backend", "sqlite"])
+    assert args.manifest_backend == "sqlite"
+
+
+def test_parse_args_io_limits():
+    main_mod = importlib.import_module("act.main")
+    base = ["--token", "abc123", "--daysago", "3", "--system", "local"]
+
+    args = main_mod.build_parser().parse_args(base)
+    assert args.io_max_bytes_per_sec is None
+    assert args.io_max_concurrent is None
+
+    args = main_mod.build_parser().parse_args(
+        base + ["--io-max-bytes-per-sec", "200M", "--io-max-concurrent", "2"]
+    )
+    assert args.io_max_bytes_per_sec == 200 * 1024 * 1024
+    assert args.io_max_concurrent == 2
+
+    with pytest.raises(SystemExit):
+        main_mod.build_parser().parse_args(base + ["--io-max-bytes-per-sec", "fast"])
+
+
+def test_parse_args_ggir_workers():
+    main_mod = importlib.import_module("act.main")
+    base = ["--token", "abc123", "--daysago", "3", "--system", "local"]
+
+    assert main_mod.build_parser().parse_args(base).ggir_workers == 1
+    assert main_mod.build_parser().parse_args(base + ["--ggir-workers", "16"]).ggir_workers == 16
+    with pytest.raises(SystemExit):
+        main_mod.build_parser().parse_args(base + ["--ggir-workers", "0"])
+
+    assert main_mod.build_parser().parse_args(base).ggir_memory_budget is None
+    args = main_mod.build_parser().parse_args(base + ["--ggir-memory-budget", "48G"])
+    assert args.ggir_memory_budget == 48 * 1024 ** 3
+    with pytest.raises(SystemExit):
+        main_mod.build_parser().parse_args(base + ["--ggir-memory-budget", "lots"])
+
+    assert main_mod.build_parser().parse_args(base).ggir_persistent_workers is False
+    args = main_mod.build_parser().parse_args(base + ["--ggir-persistent-workers"])
+    assert args.ggir_persistent_workers is True
+
+
+def test_main_rejects_verify_without_reconcile(monkeypatch):
+    class FakePipe:
+        def __init__(self, **kwargs):
+            raise AssertionError("Pipe should not be constructed on usage error")
+
+    pipe_mod = types.ModuleType("act.utils.pipe")
+    group_mod = types.ModuleType("act.utils.group")
+    pipe_mod.Pipe = FakePipe
+    group_mod.Group = object
+    _install_module(monkeypatch, "act.utils.pipe", pipe_mod)
+    _install_module(monkeypatch, "act.utils.group", group_mod)
+    main_mod = importlib.import_module("act.main")
+
+    with pytest.raises(SystemExit) as exc:
+        main_mod.main(
+            [
+                "--token",
+                "abc123",
+                "--daysago",
+                "3",
+                "--system",
+                "local",
+                "--verify",
+                "sample",
+            ]
+        )
+
+    assert exc.value.code == 2
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import logging
+import os
+
+import pytest
+
+import act.utils.rdss_scan as rdss_scan
+from act.utils.save import Save
+
+
+@pytest.fixture(autouse=True)
+def _clear_scan_memo():
+    rdss_scan._memo.clear()
+    yield
+    rdss_scan._memo.clear()
+
+
+def _seed_rdss(rdss_dir, names):
+    rdss_dir.mkdir(parents=True, exist_ok=True)
+    for name in names:
+        (rdss_dir / name).write_text("x", encoding="utf-8")
+
+
+def _backdate(path, seconds=3600):
+    stat_result = os.stat(path)
+    shifted = stat_result.st_mtime_ns - seconds * 1_000_000_000
+    os.utime(path, ns=(shifted, shifted))
+
+
+def test_scan_rdss_dir_parses_and_skips(tmp_path):
+    rdss_dir = tmp_path / "rdss"
+    _seed_rdss(
+        rdss_dir,
+        [
+            "1101 (2025-01-02)RAW.csv",
+            "1100 (2025-01-01)RAW.CSV",
+            "garbage.csv",
+            "notes.txt",
+        ],
+    )
+    (rdss_dir / "subdir.csv").mkdir()
+
+    entries, skipped = rdss_scan.scan_rdss_dir(rdss_dir)
+
+    assert entries == [
+        {"filename": "1100 (2025-01-01)RAW.CSV", "lab_id": "1100", "date": "2025-01-01"},
+        {"filename": "1101 (2025-01-02)RAW.csv", "lab_id": "1101", "date": "2025-01-02"},
+    ]
+    assert skipped == ["garbage.csv"]
+
+
+def test_scan_rdss_dir_serves_unchanged_directory_from_cache(tmp_path, monkeypatch):
+    rdss_dir = tmp_path / "rdss"
+    cache_path = tmp_path / "res" / "rdss_listing.json"
+    _seed_rdss(rdss_dir, ["1101 (2025-01-02)RAW.csv"])
+    _backdate(rdss_dir)
+
+    first, _ = rdss_scan.scan_rdss_dir(rdss_dir, cache_path=str(cache_path))
+    assert cache_path.exists()
+    rdss_scan._memo.clear()
+
+    def fail_scandir(_path):
+        raise AssertionError("unchanged RDSS directory must not be re-enumerated")
+
+    monkeypatch.setattr(rdss_scan.os, "scandir", fail_scandir)
+    second, _ = rdss_scan.scan_rdss_dir(rdss_dir, cache_path=str(cache_path))
+    assert second == first
+    monkeypatch.undo()
+
+    (rdss_dir / "1102 (2025-01-03)RAW.csv").write_text("x", encoding="utf-8")
+    third, _ = rdss_scan.scan_rdss_dir(rdss_dir, cache_path=str(cache_path))
+
+    assert [entry["lab_id"] for entry in third] == ["1101", "1102"]
+
+
+def test_scan_rdss_dir_does_not_trust_racy_listing(tmp_path, monkeypatch):
+    rdss_dir = tmp_path / "rdss"
+    cache_path = tmp_path / "res" / "rdss_listing.json"
+    _seed_rdss(rdss_dir, ["1101 (2025-01-02)RAW.csv"])
+
+    rdss_scan.scan_rdss_dir(rdss_dir, cache_path=str(cache_path))
+    rdss_scan._memo.clear()
+
+    calls = []
+    original_scandir = os.scandir
+
+    def counting_scandir(path):
+        calls.append(path)
+        return original_scandir(path)
+
+    monkeypatch.setattr(rdss_scan.os, "scandir", counting_scandir)
+    rdss_scan.scan_rdss_dir(rdss_dir, cache_path=str(cache_path))
+
+    assert len(calls) == 1
+
+
+def test_list_rdss_metadata_rows_uses_shared_scanner(tmp_path):
+    rdss_dir = tmp_path / "rdss"
+    _seed_rdss(
+        rdss_dir,
+        [
+            "1101 (2025-01-02)RAW.csv",
+            "1100 (2025-01-03)RAW.csv",
+            "1100 (2025-01-01)RAW.csv",
+        ],
+    )
+    save = Save.__new__(Save)
+    save.logger = logging.getLogger("act.utils.save")
+    save.RDSS_DIR = str(rdss_dir)
+    save.rdss_listing_cache_path = str(tmp_path / "res" / "rdss_listing.json")
+
+    rows = save._list_rdss_metadata_rows()
+
+    assert rows == [
+        {"filename": "1100 (2025-01-01)RAW.csv", "labID": "1100", "date": "2025-01-01"},
+        {"filename": "1101 (2025-01-02)RAW.csv", "labID": "1101", "date": "2025-01-02"},
+        {"filename": "1100 (2025-01-03)RAW.csv", "labID": "1100", "date": "2025-01-03"},
+    ]
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from act.utils.redcap_client import (
+    RedcapClient,
+    RedcapHTTPError,
+    RedcapUnavailableError,
+)
+
+
+def _client(server, **kwargs):
+    sleeps = []
+    kwargs.setdefault("backoff_base", 0.5)
+    client = RedcapClient(url=server.url, sleep=sleeps.append, **kwargs)
+    return client, sleeps
+
+
+def test_export_report_posts_form_and_records_stats(redcap_server):
+    client, sleeps = _client(redcap_server)
+    handle = io.BytesIO()
+
+    with client:
+        written = client.export_report_to("secret-token", 43327, handle)
+
+    assert handle.getvalue() == redcap_server.report_csv
+    assert written == len(redcap_server.report_csv)
+    assert redcap_server.requests == [
+        {"token": "secret-token", "content": "report", "report_id": "43327", "format": "csv"}
+    ]
+    assert sleeps == []
+    assert client.stats["requests"] == 1
+    assert client.stats["attempts"] == 1
+    assert client.stats["retries"] == 0
+    assert client.stats["bytes"] == len(redcap_server.report_csv)
+    assert client.stats["last_latency_seconds"] >= 0
+
+
+def test_transient_statuses_are_retried_with_backoff(redcap_server):
+    redcap_server.respond(503)
+    redcap_server.respond(429, headers={"Retry-After": "2"})
+    client, sleeps = _client(redcap_server)
+
+    handle = io.BytesIO()
+
+    client.export_report_to("token", 43327, handle)
+
+    assert handle.getvalue() == redcap_server.report_csv
+    assert len(redcap_server.requests) == 3
+    assert len(sleeps) == 2
+    assert 0.25 <= sleeps[0] <= 0.5
+    assert sleeps[1] == 2.0
+    assert client.stats["retries"] == 2
+
+
+def test_non_retryable_status_raises_immediately(redcap_server):
+    redcap_server.respond(403)
+    client, sleeps = _client(redcap_server)
+
+    with pytest.raises(RedcapHTTPError) as excinfo:
+        client.export_report_to("bad-token", 43327, io.BytesIO())
+
+    assert excinfo.value.status_code == 403
+    assert "bad-token" not in str(excinfo.value)
+    assert len(redcap_server.requests) == 1
+    assert sleeps == []
+    assert client.stats["failures"] == 1
+
+
+def test_exhausted_retries_raise_unavailable(redcap_server):
+    for _ in range(3):
+        redcap_server.respond(502)
+    client, sleeps = _client(redcap_server, max_attempts=3, backoff_max=0.75)
+
+    with pytest.raises(RedcapUnavailableError) as excinfo:
+        client.export_report_to("token", 43327, io.BytesIO())
+
+    assert excinfo.value.attempts == 3
+    assert excinfo.value.status_code == 502
+    assert len(sleeps) == 2
+    assert all(delay <= 0.75 for delay in sleeps)
+
+
+def test_read_timeout_is_retried(redcap_server):
+    redcap_server.respond(200, delay=1.0)
+    client, sleeps = _client(redcap_server, read_timeout=0.2)
+
+    handle = io.BytesIO()
+
+    client.export_report_to("token", 43327, handle)
+
+    assert handle.getvalue() == redcap_server.report_csv
+    assert len(redcap_server.requests) == 2
+    assert len(sleeps) == 1
+
+
+def test_connection_refused_raises_unavailable(redcap_server):
+    url = redcap_server.url
+    redcap_server.stop()
+    client = RedcapClient(url=url, max_attempts=2, connect_timeout=0.5, sleep=lambda _: None)
+
+    with pytest.raises(RedcapUnavailableError) as excinfo:
+        client.export_report_to("token", 43327, io.BytesIO())
+
+    assert excinfo.value.status_code is None
+    assert client.stats["attempts"] == 2
+
+
+def test_download_counts_streamed_bytes_and_retries_a_truncated_body(redcap_server):
+    redcap_server.respond(200, truncate_to=5)
+    client, sleeps = _client(redcap_server)
+    handle = io.BytesIO()
+
+    written = client.export_report_to("token", 43327, handle)
+
+    assert handle.getvalue() == redcap_server.report_csv
+    assert written == client.stats["bytes"] == len(redcap_server.report_csv)
+    assert len(redcap_server.requests) == 2
+    assert len(sleeps) == 1
+    assert client.stats["retries"] == 1
+
+
+def test_download_raises_unavailable_when_every_body_breaks_off(redcap_server):
+    for _ in range(2):
+        redcap_server.respond(200, truncate_to=5)
+    client, _ = _client(redcap_server, max_attempts=2)
+
+    with pytest.raises(RedcapUnavailableError, match="after 2 attempt"):
+        client.export_report_to("token", 43327, io.BytesIO())
+
+    assert client.stats["failures"] == 1
+    assert len(redcap_server.requests) == 2
+
+
+def test_download_shares_one_attempt_budget_across_failure_kinds(redcap_server):
+    redcap_server.respond(503)
+    redcap_server.respond(200, truncate_to=5)
+    redcap_server.respond(503)
+    client, sleeps = _client(redcap_server, max_attempts=3)
+
+    with pytest.raises(RedcapUnavailableError) as excinfo:
+        client.export_report_to("token", 43327, io.BytesIO())
+
+    assert excinfo.value.attempts == 3
+    assert len(redcap_server.requests) == 3
+    assert len(sleeps) == 2
+    assert client.stats["attempts"] == 3
@@ -400,3 +400,91 @@ def test_subject_failure_does_not_mutate_manifest(tmp_path, monkeypatch, caplog)
     assert result == []
     assert save.manifest == original_manifest
     assert "rename_failed" in caplog.text
+
+
+def _seed_parallel_ingest(save, tmp_path, subject_ids):
+    matches = {}
+    for offset, subject_id in enumerate(subject_ids):
+        lab_id = str(3000 + offset)
+        records = []
+        for day in (1, 2):
+            filename = f"{lab_id} (2025-04-0{day})RAW.csv"
+            source_path = tmp_path / "rdss" / filename
+            source_path.parent.mkdir(parents=True, exist_ok=True)
+            source_path.write_text(f"{subject_id}-{day}", encoding="utf-8")
+            records.append(
+                {
+                    "filename": filename,
+                    "labID": lab_id,
+                    "date": f"2025-04-0{day}",
+                }
+            )
+        matches[subject_id] = records
+
+    matches = save._determine_run(matches)
+    matches = save._determine_study(matches)
+    return save._determine_location(matches)
+
+
+def test_parallel_ingest_matches_serial_manifest(tmp_path):
+    subject_ids = ["8003", "7001", "8001", "7002", "8002"]
+    manifests = {}
+
+    for workers in (1, 4):
+        root = tmp_path / f"workers-{workers}"
+        save = _make_save_with_manifest(str(root / "res" / "data.json"))
+        _set_study_roots(save, root)
+        save.ingest_workers = workers
+        save.manifest = {
+            "9001": [
+                {
+                    "filename": "9 (2024-01-01)RAW.csv",
+                    "labID": "9",
+                    "date": "2024-01-01",
+                    "run": 1,
+                }
+            ]
+        }
+
+        matches = _seed_parallel_ingest(save, root, subject_ids)
+        save._run_subject_transactions(matches)
+
+        for subject_id in subject_ids:
+            for record in save.manifest[subject_id]:
+                assert os.path.exists(record["file_path"])
+
+        manifests[workers] = {
+            subject_id: [
+                (record["filename"], record["run"], record.get("study"))
+                for record in records
+            ]
+            for subject_id, records in save.manifest.items()
+        }
+
+    assert list(manifests[4].keys()) == ["9001"] + subject_ids
+    assert list(manifests[4].items()) == list(manifests[1].items())
+
+
+def test_ingest_records_copied_and_renamed_sessions(tmp_path):
+    save = _make_save_with_manifest(str(tmp_path / "res" / "data.json"))
+    _set_study_roots(save, tmp_path)
+    save.changed_sessions = []
+
+    first = _seed_parallel_ingest(save, tmp_path, ["8001"])
+    save._run_subject_transactions(first)
+    assert sorted(save.changed_sessions) == sorted(
+        record["file_path"] for record in save.manifest["8001"]
+    )
+
+    (tmp_path / "rdss" / "3000 (2025-03-31)RAW.csv").write_text("8001-0", encoding="utf-8")
+    backfill = {
+        "8001": [{"filename": "3000 (2025-03-31)RAW.csv", "labID": "3000", "date": "2025-03-31"}]
+    }
+    backfill = save._determine_location(save._determine_study(save._determine_run(backfill)))
+    save.changed_sessions = []
+    save._run_subject_transactions(backfill)
+
+    assert sorted(os.path.relpath(path, save.INT_DIR) for path in save.changed_sessions) == [
+        os.path.join("sub-8001", "accel", f"ses-{run}", f"sub-8001_ses-{run}_accel.csv")
+        for run in (1, 2, 3)
+    ]
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import errno
+import logging
+import os
+
+from act.utils.save import Save
+
+
+def _make_save(tmp_path):
+    save = Save.__new__(Save)
+    save.manifest_path = str(tmp_path / "res" / "data.json")
+    save.manifest = {}
+    save.logger = logging.getLogger("act.utils.save")
+    save.INT_DIR = str(tmp_path / "int")
+    save.OBS_DIR = str(tmp_path / "obs")
+    save.RDSS_DIR = str(tmp_path / "rdss")
+    save.symlink = True
+    return save
+
+
+def _session_csv(accel_dir, session):
+    path = accel_dir / f"ses-{session}" / f"sub-8001_ses-{session}_accel.csv"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"session-{session}", encoding="utf-8")
+    return path
+
+
+def test_reconcile_creates_then_only_touches_changes(tmp_path):
+    save = _make_save(tmp_path)
+    accel_dir = tmp_path / "obs" / "sub-8001" / "accel"
+    first = _session_csv(accel_dir, 1)
+    second = _session_csv(accel_dir, 2)
+
+    counts = save._reconcile_subject_links(str(accel_dir))
+    assert counts == {"created": 2, "removed": 0, "unchanged": 0}
+    link = accel_dir / "all" / "ses-1" / first.name
+    assert os.readlink(link) == str(first)
+    link_inode = os.lstat(link).st_ino
+
+    assert save._reconcile_subject_links(str(accel_dir)) == {
+        "created": 0,
+        "removed": 0,
+        "unchanged": 2,
+    }
+
+    second.unlink()
+    second.parent.rmdir()
+    third = _session_csv(accel_dir, 3)
+    (accel_dir / "all" / "stray.txt").write_text("x", encoding="utf-8")
+
+    counts = save._reconcile_subject_links(str(accel_dir))
+
+    assert counts == {"created": 1, "removed": 2, "unchanged": 1}
+    assert os.lstat(link).st_ino == link_inode
+    assert not (accel_dir / "all" / "ses-2").exists()
+    assert os.readlink(accel_dir / "all" / "ses-3" / third.name) == str(third)
+
+
+def test_reconcile_repoints_links_after_renames(tmp_path):
+    save = _make_save(tmp_path)
+    accel_dir = tmp_path / "obs" / "sub-8001" / "accel"
+    _session_csv(accel_dir, 1)
+    save._reconcile_subject_links(str(accel_dir))
+
+    stale = accel_dir / "all" / "ses-1" / "sub-8001_ses-1_accel.csv"
+    os.unlink(stale)
+    os.symlink(str(tmp_path / "elsewhere.csv"), stale)
+
+    counts = save._reconcile_subject_links(str(accel_dir))
+
+    assert counts == {"created": 1, "removed": 1, "unchanged": 0}
+    assert os.readlink(stale) == str(accel_dir / "ses-1" / "sub-8001_ses-1_accel.csv")
+
+
+def test_reconcile_copies_when_symlinks_unsupported(tmp_path, monkeypatch):
+    save = _make_save(tmp_path)
+    accel_dir = tmp_path / "obs" / "sub-8001" / "accel"
+    source = _session_csv(accel_dir, 1)
+
+    def refuse_symlink(src, dst):
+        raise OSError(errno.EPERM, "symlinks disabled")
+
+    monkeypatch.setattr(os, "symlink", refuse_symlink)
+    save._reconcile_subject_links(str(accel_dir))
+    copied = accel_dir / "all" / "ses-1" / source.name
+    assert not copied.is_symlink()
+    assert copied.read_text(encoding="utf-8") == "session-1"
+
+    assert save._reconcile_subject_links(str(accel_dir))["unchanged"] == 1
+
+    source.write_text("session-1-updated", encoding="utf-8")
+    assert save._reconcile_subject_links(str(accel_dir))["created"] == 1
+    assert copied.read_text(encoding="utf-8") == "session-1-updated"
+
+
+def test_subject_transaction_reconciles_links_once(tmp_path, monkeypatch):
+    save = _make_save(tmp_path)
+    matches = {"8001": []}
+    for day in (1, 2, 3):
+        filename = f"3000 (2025-04-0{day})RAW.csv"
+        source = tmp_path / "rdss" / filename
+        source.parent.mkdir(parents=True, exist_ok=True)
+        source.write_text(f"day-{day}", encoding="utf-8")
+        matches["8001"].append({"filename": filename, "labID": "3000", "date": f"2025-04-0{day}"})
+    matches = save._determine_location(save._determine_study(save._determine_run(matches)))
+
+    calls = []
+    original = Save._reconcile_subject_links
+    monkeypatch.setattr(
+        Save,
+        "_reconcile_subject_links",
+        lambda self, accel_dir: calls.append(accel_dir) or original(self, accel_dir),
+    )
+    save._run_subject_transactions(matches)
+
+    assert len(calls) == 1
+    all_dir = os.path.join(calls[0], "all")
+    assert sorted(os.listdir(all_dir)) == ["ses-1", "ses-2", "ses-3"]
@@ -0,0 +1,39 @@
+"""
+Helpers shared by the JSON indexes, caches and histories kept next to the
+manifest and GGIR outputs.
+"""
+import json
+import os
+import tempfile
+
+# A cached directory listing is only trusted when the directory's mtime is at
+# least this much older than the scan that produced it; otherwise an entry
+# created in the same timestamp tick as the scan (coarse NFS/ext3
+# granularity) could be missed forever.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def write_json_atomic(path, payload, prefix=".json-", **dump_options):
+    """
+    Write payload to path as JSON so readers see the old or the new file, never a partial one.
+
+    The JSON is written to a temp file named prefix* in path's directory
+    (created if missing) and renamed over path. dump_options are passed to
+    json.dump (indent=..., sort_keys=...). On failure the temp file is
+    removed and the error re-raised.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    temp_path = None
+    try:
+        fd, temp_path = tempfile.mkstemp(prefix=prefix, suffix=".json", dir=directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, **dump_options)
+        os.replace(temp_path, path)
+    except BaseException:
+        if temp_path and os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        raise
@@ -1,22 +1,40 @@
 import os
-import sys
 import logging
+import tempfile
 import pandas as pd
-import requests
 from datetime import datetime, timedelta
-from io import StringIO
+from act.utils import metrics
+from act.utils.rdss_scan import scan_rdss_dir
+from act.utils.redcap_client import RedcapClient
 
 logger = logging.getLogger(__name__)
 
+REPORT_ID = 43327
+REPORT_COLUMNS = ["lab_id", "boost_id"]
+
 
 class ID_COMPARISONS:
 
-    def __init__(self, rdss_dir, token, daysago=None) -> None:
+    def __init__(
+        self,
+        rdss_dir,
+        token,
+        daysago=None,
+        listing_cache_path=None,
+        report_cache=None,
+        offline=False,
+        redcap_client=None,
+    ) -> None:
         self.token = token
         self.rdss_dir = os.fspath(rdss_dir) if rdss_dir is not None else None
         if not self.rdss_dir:
             raise ValueError("RDSS directory is required to compare IDs.")
         self.daysago = daysago
+        self.listing_cache_path = listing_cache_path
+        self.report_cache = report_cache
+        self.offline = offline
+        self.redcap_client = redcap_client
+        self._report_frame = None
 
     def compare_ids(self):
         """
@@ -31,27 +49,8 @@ class ID_COMPARISONS:
         # Retrieve the full RDSS file list and duplicate files merged with duplicates from report
         rdss, file_duplicates = self._rdss_file_list(report_duplicates, self.daysago)
 
-        # Initialize the result dictionary for normal (non-duplicate) matches
-        result = {}
-
-        # Iterate over the rows in the cleaned RedCap report
-        for _, row in report.iterrows():
-            boost_id = str(row["boost_id"])
-            lab_id = str(row["lab_id"])
-
-            # Find matching files in the RDSS list
-            rdss_matches = rdss[rdss["ID"] == lab_id]
-            if not rdss_matches.empty:
-                if boost_id not in result:
-                    result[boost_id] = []
-                for _, match_row in rdss_matches.iterrows():
-                    result[boost_id].append(
-                        {
-                            "filename": match_row["filename"],
-                            "labID": lab_id,
-                            "date": match_row["Date"],
-                        }
-                    )
+        # Normal (non-duplicate) matches
+        result = self._match_report_to_rdss(report, rdss)
 
         # Process duplicates into the desired structure.
         duplicates_dict = []
@@ -70,8 +69,50 @@ class ID_COMPARISONS:
         else:
             logger.info("Found no duplicates.")
 
+        metrics.add(
+            report_rows=len(report),
+            rdss_files=len(rdss),
+            matched_subjects=len(result),
+            duplicate_groups=len(duplicates_dict),
+        )
         return {"matches": result, "duplicates": duplicates_dict}
 
+    @staticmethod
+    def _match_report_to_rdss(report, rdss):
+        """
+        Join report rows to RDSS files on lab_id in one merge.
+
+        An inner merge keeps report row order and, within a report row, RDSS
+        row order, so grouping the merged rows by boost_id in order of first
+        appearance reproduces the per-row scan this replaces.
+
+        Returns:
+            dict: boost_id -> list of {"filename", "labID", "date"} dicts
+        """
+        if report.empty or rdss.empty:
+            return {}
+
+        left = pd.DataFrame(
+            {
+                "boost_id": report["boost_id"].astype(str).to_numpy(),
+                "lab_id": report["lab_id"].astype(str).to_numpy(),
+            }
+        )
+        right = rdss[["ID", "filename", "Date"]]
+        merged = left.merge(right, left_on="lab_id", right_on="ID", how="inner", sort=False)
+
+        result = {}
+        for boost_id, filename, lab_id, date_value in zip(
+            merged["boost_id"].tolist(),
+            merged["filename"].tolist(),
+            merged["lab_id"].tolist(),
+            merged["Date"].tolist(),
+        ):
+            result.setdefault(boost_id, []).append(
+                {"filename": filename, "labID": lab_id, "date": date_value}
+            )
+        return result
+
     def _return_report(self):
         """
         pulls the id report from the rdss via redcap api.
@@ -84,19 +125,7 @@ class ID_COMPARISONS:
             df_cleaned: dataframe with duplicates removed and problematic boost_ids excluded
             duplicate_rows: dataframe of duplicate rows
         """
-        url = "https://redcap.icts.uiowa.edu/redcap/api/"
-        data = {
-            "token": self.token,
-            "content": "report",
-            "report_id": 43327,
-            "format": "csv",
-        }
-        r = requests.post(url, data=data)
-        if r.status_code != 200:
-            print(f"error! status code is {r.status_code}")
-            sys.exit(1)
-
-        df = pd.read_csv(StringIO(r.text))
+        df = self._load_report_frame()
 
         # identify boost_ids associated with multiple lab_ids.
         boost_id_counts = df.groupby("boost_id")["lab_id"].nunique()
@@ -108,7 +137,6 @@ class ID_COMPARISONS:
                 ", ".join(map(str, problematic_boost_ids)),
             )
             df = df[~df["boost_id"].isin(problematic_boost_ids)]
-            print(df)
 
         # identify and separate duplicate rows based on any column.
         duplicate_rows = df[df.duplicated(keep=False)]
@@ -119,10 +147,75 @@ class ID_COMPARISONS:
         if df_cleaned.empty:
             logger.warning("no unique rows remain after removing duplicates.")
         else:
-            print(df_cleaned.head(), len(df_cleaned))
+            logger.info("report rows after cleaning: %s", len(df_cleaned))
 
         return df_cleaned, duplicate_rows
 
+    @staticmethod
+    def _read_report_csv(source):
+        """
+        Parse only the ID columns from a report CSV path or handle. Column
+        types are inferred as before (lab_id/boost_id are usually int64), so
+        the duplicate lookup against RDSS IDs behaves as it always has.
+        """
+        return pd.read_csv(source, usecols=REPORT_COLUMNS)[REPORT_COLUMNS]
+
+    def _load_report_frame(self):
+        """
+        Return the lab_id/boost_id report frame, fetching it at most once per instance.
+
+        A fresh on-disk cache entry short-circuits the API call; in offline
+        mode the cached report is used regardless of age and a missing cache
+        is an error. Downloads are streamed to a temp file in chunks, parsed
+        from there and only then committed to the cache, so memory does not
+        scale with the response and a truncated or non-CSV body is never cached.
+        """
+        if self._report_frame is not None:
+            return self._report_frame
+
+        cache = self.report_cache
+        if cache is not None:
+            cached_path = cache.cached_path(token=self.token, allow_stale=self.offline)
+            if cached_path is not None:
+                metrics.add(report_cache_hits=1)
+                self._report_frame = self._read_report_csv(cached_path)
+                return self._report_frame
+
+        if self.offline:
+            location = cache.body_path if cache is not None else "<no cache configured>"
+            raise ValueError(
+                f"Offline mode requested but no usable cached REDCap report at {location}"
+            )
+
+        if self.redcap_client is None:
+            self.redcap_client = RedcapClient()
+        staging_dir = None
+        if cache is not None:
+            staging_dir = cache.cache_dir or "."
+            os.makedirs(staging_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".redcap-report-", suffix=".csv", dir=staging_dir)
+        try:
+            with os.fdopen(fd, "w+b") as handle:
+                self.redcap_client.export_report_to(self.token, REPORT_ID, handle)
+                metrics.add(report_fetches=1)
+                handle.seek(0)
+                try:
+                    frame = self._read_report_csv(handle)
+                except ValueError as exc:
+                    raise ValueError(
+                        f"REDCap report {REPORT_ID} is not a CSV with columns "
+                        f"{', '.join(REPORT_COLUMNS)}: {exc}"
+                    ) from exc
+            # Only a body that parsed is cached, so --offline never reuses a bad one.
+            if cache is not None:
+                cache.store_file(temp_path, token=self.token)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        self._report_frame = frame
+        return frame
+
     def _rdss_file_list(self, duplicates, daysago=None):
         """
         extracts the first string before the space and the date from filenames ending with .csv
@@ -134,27 +227,24 @@ class ID_COMPARISONS:
             df: DataFrame of all file entries
             merged_df: DataFrame of file entries that match duplicate lab_ids from the report
         """
-        extracted_data = []
-
-        # Loop through all files in the rdss_dir folder.
         rdss_dir = self.rdss_dir
         if not os.path.isdir(rdss_dir):
             raise FileNotFoundError(f"RDSS directory not found: {rdss_dir}")
-        for filename in os.listdir(rdss_dir):
-            if filename.endswith(".csv"):
-                try:
-                    base_name = filename.split(" ")[0]  # Extract lab_id
-                    date_part = filename.split("(")[1].split(")")[0]  # Extract date
-                    extracted_data.append(
-                        {"ID": base_name, "Date": date_part, "filename": filename}
-                    )
-                except IndexError:
-                    logger.warning(
-                        "Skipping RDSS file with unexpected format: %s",
-                        filename,
-                    )
-
-        df = pd.DataFrame(extracted_data)
+
+        entries, skipped = scan_rdss_dir(rdss_dir, cache_path=self.listing_cache_path)
+        for filename in skipped:
+            logger.warning(
+                "Skipping RDSS file with unexpected format: %s",
+                filename,
+            )
+
+        df = pd.DataFrame(
+            {
+                "ID": [entry["lab_id"] for entry in entries],
+                "Date": [entry["date"] for entry in entries],
+                "filename": [entry["filename"] for entry in entries],
+            }
+        )
         logger.info("RDSS csv candidates found: %s", len(df))
 
         if not df.empty:
@@ -0,0 +1,245 @@
+import errno
+import hashlib
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+COPY_STRATEGIES = ("auto", "copy_file_range", "sendfile", "stream")
+
+_KERNEL_CHUNK_SIZE = 64 * 1024 * 1024
+# Smaller kernel chunks when throttled so rate limiting stays smooth.
+_THROTTLED_CHUNK_SIZE = 8 * 1024 * 1024
+_STREAM_CHUNK_SIZE = 1024 * 1024
+
+# errnos meaning "this syscall cannot handle this pair of files", as opposed
+# to a genuine I/O failure; on these we fall through to the next strategy.
+_FALLBACK_ERRNOS = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.EBADF,
+    errno.EPERM,
+}
+
+
+class _StrategyUnavailable(Exception):
+    pass
+
+
+def available_strategies():
+    """Return the concrete copy strategies usable on this platform, fastest first."""
+    strategies = []
+    if hasattr(os, "copy_file_range"):
+        strategies.append("copy_file_range")
+    if hasattr(os, "sendfile"):
+        strategies.append("sendfile")
+    strategies.append("stream")
+    return tuple(strategies)
+
+
+def _check_kernel_eof(name, copied, remaining):
+    """
+    Handle a kernel copy call that returned 0 with bytes still to copy.
+
+    At offset 0 this is how procfs/sysfs, some FUSE and some NFS setups
+    refuse the call, so the next strategy gets a go; later it means the
+    source shrank or the filesystem stopped short.
+    """
+    if copied == 0:
+        raise _StrategyUnavailable(f"{name} copied no bytes")
+    raise OSError(
+        errno.EIO, f"{name} stopped after {copied} bytes with {remaining} bytes left"
+    )
+
+
+def _copy_with_copy_file_range(source_fd, destination_fd, remaining, throttle=None):
+    chunk_size = _THROTTLED_CHUNK_SIZE if throttle is not None else _KERNEL_CHUNK_SIZE
+    if not hasattr(os, "copy_file_range"):
+        raise _StrategyUnavailable("copy_file_range")
+
+    copied = 0
+    while remaining > 0:
+        try:
+            written = os.copy_file_range(
+                source_fd, destination_fd, min(remaining, chunk_size)
+            )
+        except OSError as exc:
+            if copied == 0 and exc.errno in _FALLBACK_ERRNOS:
+                raise _StrategyUnavailable(str(exc)) from exc
+            raise
+        if written == 0:
+            _check_kernel_eof("copy_file_range", copied, remaining)
+        copied += written
+        remaining -= written
+        if throttle is not None:
+            throttle(written)
+    return copied
+
+
+def _copy_with_sendfile(source_fd, destination_fd, remaining, throttle=None):
+    chunk_size = _THROTTLED_CHUNK_SIZE if throttle is not None else _KERNEL_CHUNK_SIZE
+    if not hasattr(os, "sendfile"):
+        raise _StrategyUnavailable("sendfile")
+
+    copied = 0
+    while remaining > 0:
+        try:
+            written = os.sendfile(
+                destination_fd, source_fd, None, min(remaining, chunk_size)
+            )
+        except OSError as exc:
+            if copied == 0 and exc.errno in _FALLBACK_ERRNOS:
+                raise _StrategyUnavailable(str(exc)) from exc
+            raise
+        if written == 0:
+            _check_kernel_eof("sendfile", copied, remaining)
+        copied += written
+        remaining -= written
+        if throttle is not None:
+            throttle(written)
+    return copied
+
+
+def _copy_with_stream(source_fd, destination_fd, remaining, digest=None, throttle=None):
+    buffer = bytearray(_STREAM_CHUNK_SIZE)
+    view = memoryview(buffer)
+    copied = 0
+    while True:
+        read = os.readv(source_fd, [buffer])
+        if read == 0:
+            break
+        if digest is not None:
+            digest.update(view[:read])
+        offset = 0
+        while offset < read:
+            offset += os.write(destination_fd, view[offset:read])
+        copied += read
+        if throttle is not None:
+            throttle(read)
+    return copied
+
+
+def _hash_copied(destination_fd, size, digest, throttle=None):
+    """
+    Hash the size bytes a kernel-side copy just wrote, reading them back
+    through the destination descriptor; after a local copy they are still
+    in the page cache.
+    """
+    offset = 0
+    while offset < size:
+        chunk = os.pread(destination_fd, min(_STREAM_CHUNK_SIZE, size - offset), offset)
+        if not chunk:
+            raise OSError(
+                errno.EIO, f"Destination ended after {offset} of {size} bytes while hashing"
+            )
+        digest.update(chunk)
+        offset += len(chunk)
+        if throttle is not None:
+            throttle(len(chunk))
+
+
+_STRATEGY_FUNCS = {
+    "copy_file_range": _copy_with_copy_file_range,
+    "sendfile": _copy_with_sendfile,
+    "stream": _copy_with_stream,
+}
+
+
+def copy_file(
+    source_path,
+    destination_path,
+    strategy="auto",
+    fsync=False,
+    digest=False,
+    throttle=None,
+):
+    """
+    Copy file contents from source_path to destination_path.
+
+    "copy_file_range" keeps the bytes inside the kernel; on NFSv4.2 mounts
+    the client turns it into a server-side COPY so no data crosses the
+    orchestration host at all. "sendfile" is the older in-kernel path and
+    "stream" is a plain read/write loop. "auto" tries them in that order and
+    falls back when a syscall refuses the file pair (cross-device, missing
+    server support, old kernel). Metadata is not copied.
+
+    With digest=True the SHA-256 of the copied bytes is returned as well.
+    "stream" hashes in the same pass that writes them; the kernel-side
+    strategies never expose the bytes to user space, so the destination is
+    read back and hashed right after the copy instead.
+
+    throttle, if given, is called with the byte count after every chunk
+    (e.g. IOScheduler.throttle()) and may block to enforce a rate limit.
+
+    Returns:
+        dict: {"strategy": <strategy actually used>, "bytes": <bytes copied>,
+               "sha256": <hex digest or None>}
+    """
+    if strategy not in COPY_STRATEGIES:
+        raise ValueError(
+            f"Unknown copy strategy: {strategy}. Expected one of {', '.join(COPY_STRATEGIES)}"
+        )
+
+    if strategy == "auto":
+        candidates = available_strategies()
+    else:
+        candidates = (strategy,)
+    hasher = hashlib.sha256() if digest else None
+
+    source_fd = os.open(source_path, os.O_RDONLY)
+    try:
+        # Read access lets a kernel-side copy be hashed through the same fd.
+        destination_fd = os.open(
+            destination_path,
+            (os.O_RDWR if digest else os.O_WRONLY) | os.O_CREAT | os.O_TRUNC,
+            0o644,
+        )
+        try:
+            size = os.fstat(source_fd).st_size
+            for candidate in candidates:
+                try:
+                    if candidate == "stream":
+                        copied = _copy_with_stream(
+                            source_fd, destination_fd, size, digest=hasher, throttle=throttle
+                        )
+                    else:
+                        copied = _STRATEGY_FUNCS[candidate](
+                            source_fd, destination_fd, size, throttle=throttle
+                        )
+                except _StrategyUnavailable as exc:
+                    if strategy != "auto":
+                        raise OSError(
+                            errno.EOPNOTSUPP,
+                            f"copy strategy {candidate} unavailable: {exc}",
+                        ) from exc
+                    logger.debug(
+                        "copy_strategy_fallback strategy=%s source=%s error=%s",
+                        candidate,
+                        source_path,
+                        exc,
+                    )
+                    continue
+
+                if copied < size:
+                    raise OSError(
+                        errno.EIO,
+                        f"Short copy of {source_path}: {copied} of {size} bytes",
+                    )
+                if hasher is not None and candidate != "stream":
+                    _hash_copied(destination_fd, copied, hasher, throttle=throttle)
+                if fsync:
+                    os.fsync(destination_fd)
+                return {
+                    "strategy": candidate,
+                    "bytes": copied,
+                    "sha256": hasher.hexdigest() if hasher is not None else None,
+                }
+        finally:
+            os.close(destination_fd)
+    finally:
+        os.close(source_fd)
+
+    raise OSError(errno.EOPNOTSUPP, f"No copy strategy succeeded for {source_path}")
@@ -0,0 +1,118 @@
+import json
+import logging
+import os
+import threading
+
+from act.utils.cache_files import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+
+class DigestIndex:
+    """
+    Persistent SHA-256 cache keyed by (path, size, mtime_ns, inode).
+
+    A cached digest is only returned while the file's current stat still
+    matches the stat recorded when it was hashed, so any rewrite, truncate,
+    or replace-by-rename invalidates the entry without explicit bookkeeping.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._dirty = False
+        self._load()
+
+    @staticmethod
+    def _key(path):
+        return os.path.abspath(os.fspath(path))
+
+    @staticmethod
+    def _stat_signature(stat_result):
+        return {
+            "size": stat_result.st_size,
+            "mtime_ns": stat_result.st_mtime_ns,
+            "inode": stat_result.st_ino,
+        }
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning(
+                "Unable to load digest index from %s (%s); starting empty.",
+                self.path,
+                exc,
+            )
+            return
+
+        if not isinstance(payload, dict) or payload.get("version") != INDEX_VERSION:
+            logger.warning("Digest index at %s has unexpected format; starting empty.", self.path)
+            return
+
+        entries = payload.get("entries")
+        if isinstance(entries, dict):
+            self._entries = {
+                key: value for key, value in entries.items() if isinstance(value, dict)
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, path, stat_result=None):
+        """Return the cached digest for path, or None if missing or stale."""
+        key = self._key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if stat_result is None:
+            try:
+                stat_result = os.stat(key)
+            except OSError:
+                return None
+
+        signature = self._stat_signature(stat_result)
+        if any(entry.get(field) != value for field, value in signature.items()):
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+                    self._dirty = True
+            return None
+
+        return entry.get("sha256")
+
+    def update(self, path, sha256, stat_result):
+        entry = self._stat_signature(stat_result)
+        entry["sha256"] = sha256
+        with self._lock:
+            self._entries[self._key(path)] = entry
+            self._dirty = True
+
+    def discard(self, path):
+        with self._lock:
+            if self._entries.pop(self._key(path), None) is not None:
+                self._dirty = True
+
+    def save(self):
+        """Atomically persist the index if anything changed since load."""
+        with self._lock:
+            if not self._dirty:
+                return False
+            payload = {"version": INDEX_VERSION, "entries": dict(self._entries)}
+            self._dirty = False
+
+        try:
+            write_json_atomic(self.path, payload, prefix=".digest-index-", sort_keys=True)
+        except Exception:
+            with self._lock:
+                self._dirty = True
+            raise
+        return True
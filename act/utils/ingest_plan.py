@@ -0,0 +1,110 @@
+import json
+import logging
+import threading
+import time
+
+from act.utils.cache_files import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+HISTORY_VERSION = 1
+# Used until a real ingest has been measured on this host.
+DEFAULT_BYTES_PER_SECOND = 50 * 1024 * 1024
+# Per rename (two-phase moves cost two) on an NFS mount.
+DEFAULT_METADATA_OP_SECONDS = 0.005
+_EWMA_ALPHA = 0.3
+
+
+class ThroughputHistory:
+    """
+    Measured RDSS->LSS copy throughput, persisted across runs.
+
+    observe() accumulates bytes and per-copy wall time during a run; save()
+    folds the run's rate into an exponentially weighted average so one
+    unusually fast or slow night does not swing later estimates.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._run_bytes = 0
+        self._run_seconds = 0.0
+        self.bytes_per_second = None
+        self.samples = 0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Unable to read throughput history %s (%s).", self.path, exc)
+            return
+        if not isinstance(payload, dict) or payload.get("version") != HISTORY_VERSION:
+            return
+        rate = payload.get("bytes_per_second")
+        if isinstance(rate, (int, float)) and rate > 0:
+            self.bytes_per_second = float(rate)
+            self.samples = int(payload.get("samples", 1))
+
+    def observe(self, byte_count, seconds):
+        with self._lock:
+            self._run_bytes += int(byte_count)
+            self._run_seconds += max(0.0, float(seconds))
+
+    def save(self):
+        """Fold this run's measured rate into the history; returns the run's rate or None."""
+        with self._lock:
+            run_bytes, run_seconds = self._run_bytes, self._run_seconds
+            self._run_bytes, self._run_seconds = 0, 0.0
+        if run_bytes <= 0 or run_seconds <= 0:
+            return None
+
+        run_rate = run_bytes / run_seconds
+        if self.bytes_per_second is None:
+            self.bytes_per_second = run_rate
+        else:
+            self.bytes_per_second = (
+                _EWMA_ALPHA * run_rate + (1 - _EWMA_ALPHA) * self.bytes_per_second
+            )
+        self.samples += 1
+        try:
+            write_json_atomic(
+                self.path,
+                {
+                    "version": HISTORY_VERSION,
+                    "bytes_per_second": self.bytes_per_second,
+                    "samples": self.samples,
+                    "updated_at": time.time(),
+                },
+            )
+        except OSError as exc:
+            logger.warning("Unable to write throughput history %s (%s).", self.path, exc)
+        return run_rate
+
+
+def estimate_duration(bytes_to_transfer, metadata_ops, bytes_per_second=None, streams=1):
+    """
+    Estimate ingest wall time from measured throughput.
+
+    Copy time assumes `streams` concurrent copies each sustain the measured
+    per-copy rate, which is optimistic once the NFS link saturates.
+    """
+    source = "measured" if bytes_per_second else "default"
+    rate = float(bytes_per_second or DEFAULT_BYTES_PER_SECOND)
+    streams = max(1, int(streams or 1))
+    seconds = bytes_to_transfer / (rate * streams) + metadata_ops * DEFAULT_METADATA_OP_SECONDS
+    return {
+        "bytes_per_second": round(rate, 1),
+        "throughput_source": source,
+        "parallel_streams": streams,
+        "seconds": round(seconds, 1),
+    }
+
+
+def write_plan(path, plan):
+    """Atomically write a plan as indented JSON."""
+    write_json_atomic(path, plan, prefix=".ingest-", indent=2)
+    return path
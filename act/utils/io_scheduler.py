@@ -0,0 +1,215 @@
+import collections
+import contextlib
+import logging
+import os
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPORT_INTERVAL_SECONDS = 30.0
+_BURST_SECONDS = 1.0
+
+_RATE_SUFFIXES = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+_RATE_PATTERN = re.compile(
+    r"^\s*(?P<number>\d+(?:\.\d+)?)\s*(?P<unit>[KMGkmg]?)(?:i?[Bb])?(?:/s)?\s*$"
+)
+
+
+def parse_rate(value):
+    """Parse a byte rate such as "50M", "1.5GiB/s" or "800000" into bytes per second."""
+    match = _RATE_PATTERN.match(str(value))
+    if not match:
+        raise ValueError(f"Invalid byte rate: {value!r}")
+    rate = float(match.group("number")) * _RATE_SUFFIXES[match.group("unit").upper()]
+    if rate <= 0:
+        raise ValueError("rate must be positive")
+    return int(rate)
+
+
+def mount_point(path):
+    """Return the mount point containing path (walking up to an existing ancestor)."""
+    current = os.path.abspath(os.fspath(path))
+    while not os.path.exists(current):
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+    while not os.path.ismount(current):
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+    return current
+
+
+class _MountState:
+    def __init__(self, mount, bytes_per_second, max_concurrent, clock):
+        self.mount = mount
+        self.rate = bytes_per_second
+        self.max_concurrent = max_concurrent
+        # Theoretical time at which every byte accounted so far has been
+        # "paid for" at the configured rate (GCRA form of a token bucket).
+        self.paid_until = clock()
+        self.active = 0
+        # owner -> number of waiting requests; rotation order is the deque.
+        self.waiting = collections.OrderedDict()
+        self.turns = collections.deque()
+        self.window_bytes = 0
+        self.window_started = clock()
+        self.total_bytes = 0
+        self.total_wait_seconds = 0.0
+
+
+class IOScheduler:
+    """
+    Per-mount I/O admission and bandwidth control for copy and verify work.
+
+    Every path is attributed to its mount point. Each mount gets:
+
+    - an optional cap on concurrent operations. Waiters are granted slots
+      round-robin by owner (the subject id), so one subject with many large
+      sessions cannot starve the others;
+    - an optional byte rate (token bucket with a one-second burst). Callers
+      report bytes as they move them and are put to sleep once the mount
+      runs ahead of its budget;
+    - periodic `io_throughput` log lines with the observed rate.
+    """
+
+    def __init__(
+        self,
+        bytes_per_second=None,
+        max_concurrent=None,
+        report_interval=DEFAULT_REPORT_INTERVAL_SECONDS,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        self.bytes_per_second = bytes_per_second
+        self.max_concurrent = max_concurrent
+        self.report_interval = report_interval
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._mounts = {}
+        self._mount_cache = {}
+
+    def _mount_state(self, path):
+        directory = os.path.dirname(os.path.abspath(os.fspath(path)))
+        with self._lock:
+            mount = self._mount_cache.get(directory)
+        if mount is None:
+            mount = mount_point(directory)
+            with self._lock:
+                self._mount_cache[directory] = mount
+        with self._lock:
+            state = self._mounts.get(mount)
+            if state is None:
+                state = _MountState(
+                    mount, self.bytes_per_second, self.max_concurrent, self._clock
+                )
+                self._mounts[mount] = state
+            return state
+
+    def _states(self, paths):
+        states = {}
+        for path in paths:
+            if path:
+                state = self._mount_state(path)
+                states[state.mount] = state
+        # A fixed acquisition order keeps multi-mount slots deadlock free.
+        return [states[mount] for mount in sorted(states)]
+
+    def _acquire(self, state, owner):
+        if not state.max_concurrent:
+            return
+        started = self._clock()
+        with self._cond:
+            state.waiting[owner] = state.waiting.get(owner, 0) + 1
+            if owner not in state.turns:
+                state.turns.append(owner)
+            # Grant slots round-robin: an owner runs only when it is at the head
+            # of the rotation, then rejoins the back if it has more waiters.
+            while not (state.active < state.max_concurrent and state.turns[0] == owner):
+                self._cond.wait()
+            state.active += 1
+            state.waiting[owner] -= 1
+            state.turns.popleft()
+            if state.waiting[owner]:
+                state.turns.append(owner)
+            else:
+                del state.waiting[owner]
+            state.total_wait_seconds += self._clock() - started
+            self._cond.notify_all()
+
+    def _release(self, state):
+        if not state.max_concurrent:
+            return
+        with self._cond:
+            state.active -= 1
+            self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def slot(self, owner, *paths):
+        """Hold one concurrent-operation slot on every mount touched by paths."""
+        acquired = []
+        try:
+            for state in self._states(paths):
+                self._acquire(state, str(owner))
+                acquired.append(state)
+            yield
+        finally:
+            for state in reversed(acquired):
+                self._release(state)
+
+    def throttle(self, *paths):
+        """Return a callable(nbytes) that accounts bytes against each path's mount."""
+        states = self._states(paths)
+
+        def consume(nbytes):
+            for state in states:
+                self._consume(state, nbytes)
+
+        return consume
+
+    def _consume(self, state, nbytes):
+        delay = 0.0
+        report = None
+        with self._lock:
+            now = self._clock()
+            if state.rate:
+                # Concurrent callers each reserve the next stretch of the
+                # schedule, so the aggregate (not per-caller) rate is capped.
+                state.paid_until = max(state.paid_until, now) + nbytes / state.rate
+                delay = state.paid_until - now - _BURST_SECONDS
+            state.window_bytes += nbytes
+            state.total_bytes += nbytes
+            window = now - state.window_started
+            if self.report_interval and window >= self.report_interval:
+                report = (state.window_bytes / window, state.active, sum(state.waiting.values()))
+                state.window_bytes = 0
+                state.window_started = now
+
+        if report is not None:
+            logger.info(
+                "io_throughput mount=%s rate_mib_s=%.1f active=%s queued=%s limit_mib_s=%s",
+                state.mount,
+                report[0] / (1024 * 1024),
+                report[1],
+                report[2],
+                round(state.rate / (1024 * 1024), 1) if state.rate else None,
+            )
+        if delay > 0:
+            self._sleep(delay)
+
+    def summary(self):
+        """Return {mount: {"bytes", "wait_seconds"}} accumulated so far."""
+        with self._lock:
+            return {
+                mount: {
+                    "bytes": state.total_bytes,
+                    "wait_seconds": round(state.total_wait_seconds, 3),
+                }
+                for mount, state in self._mounts.items()
+            }
@@ -0,0 +1,80 @@
+import json
+import logging
+import os
+import threading
+
+from act.utils.cache_files import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+
+class LSSIndex:
+    """
+    Persisted per-subject directory state for LSS session discovery.
+
+    For every sub-* folder under a study root the index keeps the mtime_ns
+    of its accel/ directory and of each ses-* directory, together with the
+    records and conflicts discovery derived from them. Creating, removing
+    or renaming a session folder bumps accel/'s mtime and adding or removing
+    a CSV bumps its session folder's mtime, so a subject whose mtimes all
+    match can reuse its cached result with one stat per directory instead
+    of listing each of them.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._roots = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Unable to read LSS index %s (%s); rescanning.", self.path, exc)
+            return
+
+        if not isinstance(payload, dict) or payload.get("version") != INDEX_VERSION:
+            return
+        roots = payload.get("roots")
+        if isinstance(roots, dict):
+            self._roots = {
+                root: subjects for root, subjects in roots.items() if isinstance(subjects, dict)
+            }
+
+    @staticmethod
+    def _key(study_root):
+        return os.path.abspath(os.fspath(study_root))
+
+    def subjects(self, study_root):
+        """Return a copy of the cached {subject_folder: state} map for a study root."""
+        with self._lock:
+            return dict(self._roots.get(self._key(study_root), {}))
+
+    def replace_root(self, study_root, subjects):
+        key = self._key(study_root)
+        with self._lock:
+            if self._roots.get(key) != subjects:
+                self._roots[key] = subjects
+                self._dirty = True
+
+    def save(self):
+        """Atomically persist the index if anything changed since load."""
+        with self._lock:
+            if not self._dirty:
+                return False
+            payload = {"version": INDEX_VERSION, "roots": dict(self._roots)}
+            self._dirty = False
+
+        try:
+            write_json_atomic(self.path, payload, prefix=".lss-index-")
+        except OSError as exc:
+            logger.warning("Unable to write LSS index %s (%s).", self.path, exc)
+            return False
+        return True
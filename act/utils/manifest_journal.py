@@ -0,0 +1,106 @@
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_VERSION = 1
+
+
+def journal_path_for(manifest_path):
+    """Return the journal path paired with a manifest, e.g. res/data.journal.jsonl."""
+    root, _ = os.path.splitext(manifest_path)
+    return f"{root}.journal.jsonl"
+
+
+class ManifestJournal:
+    """
+    Append-only write-ahead log of committed subject transactions.
+
+    Each line is one JSON object {"v", "subject_id", "records"} holding the
+    subject's full canonical record list after its files were copied and
+    renamed. Lines are fsynced before the transaction is considered
+    committed, so after a crash replay() reconstructs every subject that
+    finished even though the manifest itself was never written. A torn
+    final line (crash mid-append) is ignored, and cut off by replay(repair=True)
+    so later appends start on a line of their own.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, subject_id, records):
+        line = json.dumps(
+            {"v": JOURNAL_VERSION, "subject_id": str(subject_id), "records": records}
+        )
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a+b") as handle:
+                # Never continue a line left unterminated by an earlier crash.
+                size = handle.seek(0, os.SEEK_END)
+                prefix = b""
+                if size:
+                    handle.seek(size - 1)
+                    if handle.read(1) != b"\n":
+                        prefix = b"\n"
+                handle.write(prefix + line.encode("utf-8") + b"\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+
+    def replay(self, repair=False):
+        """
+        Return {subject_id: records} for every journaled subject, in first-commit
+        order; a subject journaled more than once keeps its latest records.
+
+        With repair, a torn final line is truncated away; without it the
+        journal is only read (dry runs).
+        """
+        entries = {}
+        try:
+            with open(self.path, "rb") as handle:
+                data = handle.read()
+        except FileNotFoundError:
+            return entries
+
+        lines = data.decode("utf-8", errors="replace").splitlines(keepends=True)
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                if line_number == len(lines) and not line.endswith("\n"):
+                    logger.warning("Ignoring torn final entry in manifest journal %s.", self.path)
+                    if repair:
+                        self._truncate(data.rfind(b"\n") + 1)
+                    break
+                raise ValueError(
+                    f"Corrupt manifest journal entry at {self.path}:{line_number}"
+                )
+            if (
+                not isinstance(entry, dict)
+                or entry.get("v") != JOURNAL_VERSION
+                or not isinstance(entry.get("records"), list)
+            ):
+                raise ValueError(
+                    f"Unrecognized manifest journal entry at {self.path}:{line_number}"
+                )
+            entries[str(entry.get("subject_id"))] = entry["records"]
+        return entries
+
+    def _truncate(self, size):
+        with self._lock:
+            with open(self.path, "r+b") as handle:
+                handle.truncate(size)
+                handle.flush()
+                os.fsync(handle.fileno())
+
+    def clear(self):
+        """Drop the journal once its subjects are durable in the manifest."""
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
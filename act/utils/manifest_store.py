@@ -0,0 +1,252 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_BACKENDS = ("json", "sqlite")
+SCHEMA_VERSION = 1
+# meta key holding the SHA-256 of the data.json the store last loaded or exported.
+DATA_JSON_FINGERPRINT_KEY = "data_json_sha256"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS subjects (
+    subject_id TEXT PRIMARY KEY,
+    ordinal INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    subject_id TEXT NOT NULL REFERENCES subjects(subject_id),
+    position INTEGER NOT NULL,
+    lab_id TEXT,
+    filename TEXT,
+    date TEXT,
+    run INTEGER,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (subject_id, position)
+);
+-- The primary key already serves subject lookups.
+CREATE INDEX IF NOT EXISTS records_lab_id_idx ON records(lab_id);
+CREATE INDEX IF NOT EXISTS records_filename_idx ON records(filename);
+CREATE INDEX IF NOT EXISTS records_date_idx ON records(date);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class SQLiteManifestStore:
+    """
+    SQLite-backed manifest with one row per record.
+
+    Each record is kept verbatim as a JSON payload (so key order, and
+    therefore the exported data.json bytes, match the JSON backend) with
+    labID, filename, date and run lifted into indexed columns for lookups.
+    Subject insertion order is kept in `subjects.ordinal` because the JSON
+    manifest is an ordered mapping. Every write runs in its own
+    transaction, so a subject is either fully replaced or untouched.
+    Small key/value facts about the store (such as which data.json it was
+    last in sync with) live in `meta`. The database file is only created
+    on first use, so constructing a store never writes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._open_lock = threading.Lock()
+        self._connection = None
+
+    @property
+    def _conn(self):
+        if self._connection is None:
+            with self._open_lock:
+                if self._connection is None:
+                    self._connection = self._open()
+        return self._connection
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        # Opening an up-to-date store only reads it.
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        return conn
+
+    def exists(self):
+        """True when the database file has been created."""
+        return os.path.exists(self.path)
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _transaction(self, work):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    @staticmethod
+    def _record_row(subject_id, position, record):
+        run = record.get("run")
+        try:
+            run = int(run) if run is not None else None
+        except (TypeError, ValueError):
+            run = None
+        date_value = record.get("date")
+        return (
+            subject_id,
+            position,
+            None if record.get("labID") is None else str(record.get("labID")),
+            None if record.get("filename") is None else str(record.get("filename")),
+            None if date_value is None else str(date_value),
+            run,
+            json.dumps(record),
+        )
+
+    @staticmethod
+    def _write_subject(conn, subject_id, records):
+        if conn.execute(
+            "SELECT 1 FROM subjects WHERE subject_id = ?", (subject_id,)
+        ).fetchone() is None:
+            conn.execute(
+                "INSERT INTO subjects (subject_id, ordinal) "
+                "SELECT ?, COALESCE(MAX(ordinal), 0) + 1 FROM subjects",
+                (subject_id,),
+            )
+        conn.execute("DELETE FROM records WHERE subject_id = ?", (subject_id,))
+        conn.executemany(
+            "INSERT INTO records (subject_id, position, lab_id, filename, date, run, payload) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                SQLiteManifestStore._record_row(subject_id, position, record)
+                for position, record in enumerate(records)
+            ],
+        )
+
+    def is_empty(self):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM subjects LIMIT 1").fetchone() is None
+
+    def load(self):
+        """Return the manifest as {subject_id: [record, ...]} in stored order."""
+        with self._lock:
+            subjects = self._conn.execute(
+                "SELECT subject_id FROM subjects ORDER BY ordinal"
+            ).fetchall()
+            rows = self._conn.execute(
+                "SELECT records.subject_id, records.payload FROM records "
+                "JOIN subjects ON subjects.subject_id = records.subject_id "
+                "ORDER BY subjects.ordinal, records.position"
+            ).fetchall()
+
+        payload = {subject_id: [] for (subject_id,) in subjects}
+        for subject_id, record_payload in rows:
+            payload[subject_id].append(json.loads(record_payload))
+        return payload
+
+    def upsert_subject(self, subject_id, records):
+        """Atomically replace one subject's records, appending new subjects last."""
+        self._transaction(
+            lambda conn: self._write_subject(conn, str(subject_id), list(records or []))
+        )
+
+    def replace_all(self, payload, meta=None):
+        """
+        Atomically replace the whole manifest with payload, keeping its order.
+        meta entries, if given, are written in the same transaction.
+        """
+
+        def work(conn):
+            conn.execute("DELETE FROM records")
+            conn.execute("DELETE FROM subjects")
+            for subject_id, records in payload.items():
+                self._write_subject(conn, str(subject_id), list(records or []))
+            self._write_meta(conn, meta or {})
+
+        self._transaction(work)
+
+    @staticmethod
+    def _write_meta(conn, meta):
+        conn.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            [(key, None if value is None else str(value)) for key, value in meta.items()],
+        )
+
+    def get_meta(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        self._transaction(lambda conn: self._write_meta(conn, {key: value}))
+
+    def reorder_subjects(self, subject_ids):
+        """Renumber subject ordinals to follow subject_ids; unknown ids are ignored."""
+
+        def work(conn):
+            known = {
+                row[0] for row in conn.execute("SELECT subject_id FROM subjects").fetchall()
+            }
+            ordered = []
+            seen = set()
+            for subject_id in subject_ids:
+                subject_key = str(subject_id)
+                if subject_key in known and subject_key not in seen:
+                    ordered.append(subject_key)
+                    seen.add(subject_key)
+            remaining = conn.execute(
+                "SELECT subject_id FROM subjects ORDER BY ordinal"
+            ).fetchall()
+            ordered += [row[0] for row in remaining if row[0] not in seen]
+            conn.executemany(
+                "UPDATE subjects SET ordinal = ? WHERE subject_id = ?",
+                [(index, subject_id) for index, subject_id in enumerate(ordered, start=1)],
+            )
+
+        self._transaction(work)
+
+    def find_records(self, subject_id=None, lab_id=None, filename=None, date=None):
+        """
+        Indexed lookup of records matching every given field.
+
+        Returns:
+            list: (subject_id, record) tuples in manifest order
+        """
+        clauses = []
+        params = []
+        for column, value in (
+            ("records.subject_id", subject_id),
+            ("records.lab_id", lab_id),
+            ("records.filename", filename),
+            ("records.date", date),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(str(value))
+
+        query = (
+            "SELECT records.subject_id, records.payload FROM records "
+            "JOIN subjects ON subjects.subject_id = records.subject_id"
+        )
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY subjects.ordinal, records.position"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [(row[0], json.loads(row[1])) for row in rows]
@@ -0,0 +1,228 @@
+import contextlib
+import contextvars
+import datetime
+import itertools
+import logging
+import os
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+from act.utils.cache_files import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+METRICS_VERSION = 1
+
+_current_span = contextvars.ContextVar("act_metrics_span", default=None)
+_active_recorder = None
+_active_lock = threading.Lock()
+
+
+def metrics_path_for(log_file):
+    """Return the metrics path paired with a run log, e.g. logs/x/20250101_0200.metrics.json."""
+    if not log_file:
+        return None
+    root, _ = os.path.splitext(log_file)
+    return f"{root}.metrics.json"
+
+
+def _process_io():
+    """Process-wide I/O and child CPU counters, where the platform exposes them."""
+    snapshot = {}
+    try:
+        with open("/proc/self/io", "r", encoding="ascii") as handle:
+            for line in handle:
+                key, _, value = line.partition(":")
+                if key in ("rchar", "wchar", "read_bytes", "write_bytes"):
+                    snapshot[key] = int(value)
+    except (OSError, ValueError):
+        pass
+    if resource is not None:
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        snapshot["children_cpu_s"] = children.ru_utime + children.ru_stime
+    return snapshot
+
+
+class Span:
+    """One timed stage; counters added while it is current are summed into it."""
+
+    def __init__(self, span_id, parent_id, name, attributes, started):
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.started = started
+        self.wall_s = None
+        self.status = "ok"
+        self.error = None
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def add(self, **counters):
+        with self._lock:
+            for key, value in counters.items():
+                self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self, origin):
+        return {
+            "id": self.span_id,
+            "parent": self.parent_id,
+            "name": self.name,
+            "attributes": dict(self.attributes),
+            "start_offset_s": round(self.started - origin, 6),
+            "wall_s": None if self.wall_s is None else round(self.wall_s, 6),
+            "status": self.status,
+            "error": self.error,
+            "counters": dict(self.counters),
+        }
+
+
+class _NullSpan:
+    def add(self, **counters):
+        pass
+
+    def set(self, **attributes):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class MetricsRecorder:
+    """
+    Structured per-run timing and I/O record.
+
+    span() opens a nested, timed stage; the parent is whichever span is
+    current in the caller's context, so worker threads started with a copied
+    context (see contextvars.copy_context) nest under the span that
+    dispatched them. write() emits every span plus per-stage totals, and the
+    process-wide I/O and child-process CPU deltas for the whole run, as JSON.
+    """
+
+    def __init__(self, path=None, clock=time.perf_counter, **attributes):
+        self.path = path
+        self.attributes = dict(attributes)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._spans = []
+        self._origin = clock()
+        self._started_at = datetime.datetime.now(datetime.timezone.utc)
+        self._process_start = _process_io()
+
+    @contextlib.contextmanager
+    def span(self, name, **attributes):
+        parent = _current_span.get()
+        span = Span(
+            next(self._ids),
+            parent.span_id if isinstance(parent, Span) else None,
+            name,
+            attributes,
+            self._clock(),
+        )
+        with self._lock:
+            self._spans.append(span)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.status = "error"
+            span.error = type(exc).__name__
+            raise
+        finally:
+            span.wall_s = self._clock() - span.started
+            _current_span.reset(token)
+
+    def stages(self):
+        """Per-name totals: count, wall time, errors and summed counters."""
+        totals = {}
+        with self._lock:
+            spans = list(self._spans)
+        for span in spans:
+            stage = totals.setdefault(
+                span.name, {"count": 0, "wall_s": 0.0, "max_wall_s": 0.0, "errors": 0, "counters": {}}
+            )
+            wall = span.wall_s or 0.0
+            stage["count"] += 1
+            stage["wall_s"] = round(stage["wall_s"] + wall, 6)
+            stage["max_wall_s"] = round(max(stage["max_wall_s"], wall), 6)
+            stage["errors"] += int(span.status == "error")
+            for key, value in span.counters.items():
+                stage["counters"][key] = stage["counters"].get(key, 0) + value
+        return totals
+
+    def snapshot(self, status="ok"):
+        finished = _process_io()
+        process = {
+            key: round(finished[key] - self._process_start[key], 6)
+            for key in finished
+            if key in self._process_start
+        }
+        with self._lock:
+            spans = [span.to_dict(self._origin) for span in self._spans]
+        return {
+            "version": METRICS_VERSION,
+            "started_at": self._started_at.isoformat(),
+            "finished_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "status": status,
+            "wall_s": round(self._clock() - self._origin, 6),
+            "attributes": dict(self.attributes),
+            "process": process,
+            "stages": self.stages(),
+            "spans": spans,
+        }
+
+    def write(self, status="ok", path=None):
+        """Atomically write the run's metrics; returns the snapshot."""
+        snapshot = self.snapshot(status=status)
+        path = path or self.path
+        if not path:
+            return snapshot
+
+        try:
+            write_json_atomic(path, snapshot, prefix=".metrics-", indent=2)
+        except OSError as exc:
+            logger.warning("Unable to write run metrics %s (%s).", path, exc)
+        return snapshot
+
+
+def start_run(path=None, **attributes):
+    """Install a new process-wide recorder that span()/add() report to."""
+    global _active_recorder
+    recorder = MetricsRecorder(path=path, **attributes)
+    with _active_lock:
+        _active_recorder = recorder
+    return recorder
+
+
+def finish_run(status="ok"):
+    """Write and uninstall the active recorder; returns its snapshot or None."""
+    global _active_recorder
+    with _active_lock:
+        recorder, _active_recorder = _active_recorder, None
+    if recorder is None:
+        return None
+    return recorder.write(status=status)
+
+
+def span(name, **attributes):
+    """Time a stage under the active recorder; a no-op when no run is being recorded."""
+    recorder = _active_recorder
+    if recorder is None:
+        return contextlib.nullcontext(_NULL_SPAN)
+    return recorder.span(name, **attributes)
+
+
+def add(**counters):
+    """Add counters (bytes_read=..., copies=1, ...) to the current span, if any."""
+    current = _current_span.get()
+    if current is not None:
+        current.add(**counters)
@@ -1,3 +1,4 @@
+from act.utils import metrics
 from act.utils.save import Save
 from act.core.gg import GG
 
@@ -56,6 +57,16 @@ class Pipe:
         system="vosslnx",
         rebuild_manifest_only=False,
         reconcile_manifest_only=False,
+        ingest_workers=1,
+        verify="full",
+        offline=False,
+        manifest_backend="json",
+        plan_only=False,
+        io_bytes_per_second=None,
+        io_max_concurrent=None,
+        ggir_workers=1,
+        ggir_memory_budget=None,
+        ggir_persistent_workers=False,
     ):
         # ensure class attrs are set for everyone (Pipe.INT_DIR etc.)
         type(self).configure(system)
@@ -64,6 +75,16 @@ class Pipe:
         self.system = system
         self.rebuild_manifest_only = rebuild_manifest_only
         self.reconcile_manifest_only = reconcile_manifest_only
+        self.ingest_workers = ingest_workers
+        self.verify = verify
+        self.offline = offline
+        self.manifest_backend = manifest_backend
+        self.plan_only = plan_only
+        self.io_bytes_per_second = io_bytes_per_second
+        self.io_max_concurrent = io_max_concurrent
+        self.ggir_workers = ggir_workers
+        self.ggir_memory_budget = ggir_memory_budget
+        self.ggir_persistent_workers = ggir_persistent_workers
 
     def run_pipe(self):
         save_instance = Save(
@@ -73,21 +94,35 @@ class Pipe:
             token=self.token,
             daysago=self.daysago,
             symlink=False,
+            ingest_workers=self.ingest_workers,
+            offline=self.offline,
+            manifest_backend=self.manifest_backend,
+            io_bytes_per_second=self.io_bytes_per_second,
+            io_max_concurrent=self.io_max_concurrent,
         )
 
+        if self.plan_only:
+            # Read-only: skip the symlink cleanup below as well.
+            with metrics.span("plan"):
+                return save_instance.plan()
+
         try:
             if self.rebuild_manifest_only:
-                rebuilt_payload = save_instance.rebuild_manifest_payload_from_lss()
-                save_instance._atomic_write_manifest(
-                    rebuilt_payload,
-                    save_instance.manifest_path,
-                )
+                with metrics.span("rebuild"):
+                    rebuilt_payload = save_instance.rebuild_manifest_payload_from_lss()
+                    save_instance._atomic_write_manifest(
+                        rebuilt_payload,
+                        save_instance.manifest_path,
+                    )
                 return None
 
             if self.reconcile_manifest_only:
-                return save_instance.reconcile_manifest()
+                with metrics.span("reconcile", verify=self.verify):
+                    return save_instance.reconcile_manifest(verify=self.verify)
 
-            matched = save_instance.save()
+            with metrics.span("ingest", workers=self.ingest_workers) as span:
+                matched = save_instance.save()
+                span.add(subjects=len(matched or {}))
 
             import json
             import pathlib
@@ -102,6 +137,11 @@ class Pipe:
                     intdir=type(self).INT_DIR,
                     obsdir=type(self).OBS_DIR,
                     system=self.system,
+                    changed_sessions=save_instance.changed_sessions,
+                    ggir_workers=self.ggir_workers,
+                    memory_budget=self.ggir_memory_budget,
+                    persistent_workers=self.ggir_persistent_workers,
+                    digest_index=getattr(save_instance, "digest_index", None),
                 ).run_gg()
         finally:
             Save.remove_symlink_directories([type(self).INT_DIR, type(self).OBS_DIR])
@@ -0,0 +1,133 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+from act.utils.cache_files import RACY_WINDOW_NS, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+RDSS_FILENAME_PATTERN = re.compile(
+    r"^(?P<lab_id>\S+)\s*\((?P<date>[^)]+)\).+\.csv$", re.IGNORECASE
+)
+
+_memo = {}
+_memo_lock = threading.Lock()
+
+
+def parse_rdss_filename(filename):
+    """Return {"filename", "lab_id", "date"} for an RDSS drop name, or None."""
+    match = RDSS_FILENAME_PATTERN.match(filename)
+    if not match:
+        return None
+    return {
+        "filename": filename,
+        "lab_id": str(match.group("lab_id")),
+        "date": match.group("date"),
+    }
+
+
+def _enumerate(rdss_dir):
+    entries = []
+    skipped = []
+    with os.scandir(rdss_dir) as iterator:
+        for entry in iterator:
+            name = entry.name
+            if not name.lower().endswith(".csv"):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            parsed = parse_rdss_filename(name)
+            if parsed is None:
+                skipped.append(name)
+                continue
+            entries.append(parsed)
+
+    entries.sort(key=lambda row: row["filename"])
+    skipped.sort()
+    return entries, skipped
+
+
+def _load_cache(cache_path):
+    try:
+        with open(cache_path, "r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as exc:
+        logger.warning("Unable to read RDSS listing cache %s (%s); rescanning.", cache_path, exc)
+        return {}
+
+    if not isinstance(payload, dict) or payload.get("version") != CACHE_VERSION:
+        return {}
+    dirs = payload.get("dirs")
+    return dirs if isinstance(dirs, dict) else {}
+
+
+def _write_cache(cache_path, dirs):
+    try:
+        write_json_atomic(
+            cache_path, {"version": CACHE_VERSION, "dirs": dirs}, prefix=".rdss-listing-"
+        )
+    except OSError as exc:
+        logger.warning("Unable to write RDSS listing cache %s (%s).", cache_path, exc)
+
+
+def scan_rdss_dir(rdss_dir, cache_path=None):
+    """
+    List parseable RDSS drop files with a single os.scandir pass.
+
+    Results are memoized per process and, when cache_path is given, persisted
+    keyed by the directory's mtime_ns: adding, removing or renaming a drop
+    bumps the directory mtime, so an unchanged directory is served from the
+    cache after one stat.
+
+    Returns:
+        tuple: (entries, skipped) where entries is a filename-sorted list of
+        {"filename", "lab_id", "date"} dicts (date is the raw string from the
+        name) and skipped lists *.csv names that did not match the pattern.
+    """
+    rdss_dir = os.path.abspath(os.fspath(rdss_dir))
+    mtime_ns = os.stat(rdss_dir).st_mtime_ns
+
+    with _memo_lock:
+        memoized = _memo.get(rdss_dir)
+    if _reusable(memoized, mtime_ns):
+        return list(memoized["entries"]), list(memoized.get("skipped", []))
+
+    cached_dirs = _load_cache(cache_path) if cache_path else {}
+    listing = cached_dirs.get(rdss_dir)
+    if _reusable(listing, mtime_ns):
+        logger.info("RDSS listing cache hit for %s (%s files).", rdss_dir, len(listing["entries"]))
+    else:
+        scanned_at_ns = time.time_ns()
+        entries, skipped = _enumerate(rdss_dir)
+        listing = {
+            "mtime_ns": mtime_ns,
+            "scanned_at_ns": scanned_at_ns,
+            "entries": entries,
+            "skipped": skipped,
+        }
+        if cache_path:
+            cached_dirs[rdss_dir] = listing
+            _write_cache(cache_path, cached_dirs)
+
+    with _memo_lock:
+        _memo[rdss_dir] = listing
+    return list(listing["entries"]), list(listing.get("skipped", []))
+
+
+def _reusable(listing, mtime_ns):
+    return (
+        isinstance(listing, dict)
+        and isinstance(listing.get("entries"), list)
+        and listing.get("mtime_ns") == mtime_ns
+        and listing.get("scanned_at_ns", 0) - mtime_ns >= RACY_WINDOW_NS
+    )
@@ -0,0 +1,252 @@
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+REDCAP_API_URL = "https://redcap.icts.uiowa.edu/redcap/api/"
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class RedcapError(RuntimeError):
+    """Base class for REDCap API failures the pipeline can handle."""
+
+
+class RedcapHTTPError(RedcapError):
+    """REDCap answered with a non-retryable HTTP status (bad token, bad report id)."""
+
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class RedcapUnavailableError(RedcapError):
+    """REDCap could not be reached, or kept failing, after all retry attempts."""
+
+    def __init__(self, message, attempts, status_code=None):
+        super().__init__(message)
+        self.attempts = attempts
+        self.status_code = status_code
+
+
+class RedcapClient:
+    """
+    Pooled REDCap API client with timeouts, retry/backoff and request stats.
+
+    One requests.Session is kept per client so keep-alive connections (and
+    the TLS handshake) are reused across calls. Connection errors, timeouts
+    and 429/5xx responses are retried with capped exponential backoff and
+    jitter, honouring a numeric Retry-After header; any other non-200
+    status fails immediately. Failures surface as RedcapError subclasses
+    rather than exiting the process.
+    """
+
+    def __init__(
+        self,
+        url=REDCAP_API_URL,
+        connect_timeout=10.0,
+        read_timeout=120.0,
+        max_attempts=5,
+        backoff_base=1.0,
+        backoff_max=30.0,
+        pool_size=4,
+        session=None,
+        sleep=time.sleep,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be >= 1")
+        self.url = url
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "attempts": 0,
+            "retries": 0,
+            "failures": 0,
+            "bytes": 0,
+            "latency_seconds": 0.0,
+            "last_latency_seconds": None,
+        }
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    def _backoff_delay(self, attempt, response=None):
+        retry_after = None
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        delay = min(self.backoff_base * (2 ** (attempt - 1)), self.backoff_max)
+        return delay * random.uniform(0.5, 1.0)
+
+    def _record(self, attempts, latency, size=0, failed=False):
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats["attempts"] += attempts
+            self.stats["retries"] += attempts - 1
+            self.stats["bytes"] += size
+            self.stats["latency_seconds"] += latency
+            self.stats["last_latency_seconds"] = latency
+            if failed:
+                self.stats["failures"] += 1
+
+    def post(self, data, stream=False):
+        """
+        POST form data to the API, retrying transient failures.
+
+        Returns the successful requests.Response. With stream=True the body
+        is left unread for the caller to consume and no bytes are recorded;
+        use download() to have streamed bytes counted and body errors retried.
+        """
+        response, _ = self._request(data, stream=stream)
+        return response
+
+    def download(self, data, handle, chunk_size=1024 * 1024):
+        """
+        POST form data and stream the response body into a binary file handle.
+
+        A body that breaks off mid-read (chunked encoding errors, read
+        timeouts, a short Content-Length) is retried like a failed request:
+        the handle is truncated and the request sent again, drawing on the
+        same max_attempts as connection and status failures. Returns the
+        number of body bytes written.
+        """
+
+        def consume(response):
+            handle.seek(0)
+            handle.truncate()
+            written = 0
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                handle.write(chunk)
+                written += len(chunk)
+            handle.flush()
+            return written
+
+        response, written = self._request(data, stream=True, consume=consume)
+        response.close()
+        return written
+
+    def _request(self, data, stream=False, consume=None):
+        """
+        Send one API request within a single budget of max_attempts.
+
+        consume, if given, reads the body of a 200 response and returns the
+        number of bytes it read; a requests error while it runs uses up an
+        attempt like a dropped connection. Returns (response, consumed bytes).
+        """
+        started = time.perf_counter()
+        last_error = None
+        last_status = None
+
+        for attempt in range(1, self.max_attempts + 1):
+            response = None
+            try:
+                response = self.session.post(
+                    self.url, data=data, timeout=self.timeout, stream=stream
+                )
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                last_error = exc
+                last_status = None
+                logger.warning(
+                    "redcap_request_error attempt=%s/%s error=%s",
+                    attempt,
+                    self.max_attempts,
+                    type(exc).__name__,
+                )
+            else:
+                if response.status_code == 200:
+                    try:
+                        consumed = consume(response) if consume is not None else None
+                    except requests.RequestException as exc:
+                        last_error = exc
+                        last_status = None
+                        logger.warning(
+                            "redcap_body_error attempt=%s/%s error=%s",
+                            attempt,
+                            self.max_attempts,
+                            type(exc).__name__,
+                        )
+                    else:
+                        latency = time.perf_counter() - started
+                        if consume is not None:
+                            size = consumed
+                        else:
+                            size = 0 if stream else len(response.content)
+                        self._record(attempt, latency, size)
+                        logger.info(
+                            "redcap_request content=%s status=200 attempts=%s latency_s=%.3f bytes=%s",
+                            data.get("content"),
+                            attempt,
+                            latency,
+                            size,
+                        )
+                        return response, consumed
+                else:
+                    last_status = response.status_code
+                    last_error = None
+                    if last_status not in RETRYABLE_STATUS_CODES:
+                        response.close()
+                        self._record(attempt, time.perf_counter() - started, failed=True)
+                        raise RedcapHTTPError(
+                            last_status,
+                            f"REDCap API returned HTTP {last_status} for content={data.get('content')}",
+                        )
+                    logger.warning(
+                        "redcap_request_retryable_status attempt=%s/%s status=%s",
+                        attempt,
+                        self.max_attempts,
+                        last_status,
+                    )
+
+            if attempt < self.max_attempts:
+                delay = self._backoff_delay(attempt, response)
+                if response is not None:
+                    response.close()
+                self._sleep(delay)
+            elif response is not None:
+                response.close()
+
+        self._record(self.max_attempts, time.perf_counter() - started, failed=True)
+        reason = f"HTTP {last_status}" if last_status is not None else repr(last_error)
+        raise RedcapUnavailableError(
+            f"REDCap API unavailable after {self.max_attempts} attempt(s): {reason}",
+            attempts=self.max_attempts,
+            status_code=last_status,
+        )
+
+    def export_report_to(self, token, report_id, handle, format="csv"):
+        """Stream a saved report export into handle; returns the bytes written."""
+        return self.download(
+            {
+                "token": token,
+                "content": "report",
+                "report_id": report_id,
+                "format": format,
+            },
+            handle,
+        )
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import logging
+import os
+import time
+
+from act.utils.cache_files import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPORT_TTL_SECONDS = 60 * 60
+CHUNK_SIZE = 1024 * 1024
+
+
+class ReportCache:
+    """
+    On-disk cache for the raw REDCap report CSV.
+
+    The body is stored next to a small metadata file holding the fetch time,
+    the body's SHA-256 and a fingerprint of the token that fetched it. A cached
+    body is served only if its digest still matches (guards against truncated
+    writes) and, unless stale entries are explicitly allowed, if it is younger
+    than the TTL and was fetched with the same token.
+    """
+
+    def __init__(self, cache_dir="res", report_id=43327, ttl_seconds=DEFAULT_REPORT_TTL_SECONDS):
+        self.cache_dir = cache_dir
+        self.report_id = report_id
+        self.ttl_seconds = ttl_seconds
+        self.body_path = os.path.join(cache_dir, f"redcap_report_{report_id}.csv")
+        self.meta_path = os.path.join(cache_dir, f"redcap_report_{report_id}.json")
+
+    @staticmethod
+    def token_fingerprint(token):
+        return hashlib.sha256(str(token or "").encode("utf-8")).hexdigest()[:16]
+
+    def _read_meta(self):
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as handle:
+                meta = json.load(handle)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Unable to read REDCap report cache metadata %s (%s).", self.meta_path, exc)
+            return None
+        return meta if isinstance(meta, dict) else None
+
+    def cached_path(self, token=None, allow_stale=False):
+        """Return the cached report's path if it is usable, otherwise None."""
+        meta = self._read_meta()
+        if meta is None:
+            return None
+
+        age = time.time() - float(meta.get("fetched_at", 0))
+        if not allow_stale:
+            if age > self.ttl_seconds:
+                return None
+            if meta.get("token") != self.token_fingerprint(token):
+                return None
+
+        hasher = hashlib.sha256()
+        try:
+            with open(self.body_path, "rb") as handle:
+                for block in iter(lambda: handle.read(CHUNK_SIZE), b""):
+                    hasher.update(block)
+        except OSError:
+            return None
+
+        if hasher.hexdigest() != meta.get("sha256"):
+            logger.warning("REDCap report cache %s failed its content check; ignoring it.", self.body_path)
+            return None
+
+        logger.info(
+            "Using cached REDCap report %s (age=%ss sha256=%s).",
+            self.report_id,
+            int(age),
+            meta.get("sha256", "")[:12],
+        )
+        return self.body_path
+
+    def store_file(self, path, token=None):
+        """
+        Move an already downloaded and validated report into the cache.
+
+        path must be on the cache's filesystem (e.g. a temp file created in
+        cache_dir) so the move is an atomic rename.
+
+        Returns:
+            str: path of the cached body
+        """
+        hasher = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as handle:
+            for block in iter(lambda: handle.read(CHUNK_SIZE), b""):
+                hasher.update(block)
+                size += len(block)
+        os.replace(path, self.body_path)
+        self._write_meta(hasher.hexdigest(), size, token)
+        return self.body_path
+
+    def _write_meta(self, sha256, size, token):
+        previous = self._read_meta() or {}
+        if previous.get("sha256") and previous.get("sha256") != sha256:
+            logger.info("REDCap report %s content changed since last fetch.", self.report_id)
+
+        meta = {
+            "report_id": self.report_id,
+            "fetched_at": time.time(),
+            "sha256": sha256,
+            "bytes": size,
+            "token": self.token_fingerprint(token),
+        }
+        write_json_atomic(self.meta_path, meta, prefix=".redcap-report-", indent=2)
@@ -1,3 +1,5 @@
+import contextlib
+import contextvars
 import errno
 import hashlib
 import json
@@ -6,12 +8,48 @@ import os
 import re
 import shutil
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
+from act.utils.cache_files import RACY_WINDOW_NS
 from act.utils.comparison_utils import ID_COMPARISONS
+from act.utils.copy_engine import copy_file
+from act.utils.digest_index import DigestIndex
+from act.utils import metrics
+from act.utils.io_scheduler import IOScheduler
+from act.utils.ingest_plan import ThroughputHistory, estimate_duration, write_plan
+from act.utils.lss_index import LSSIndex
+from act.utils.manifest_journal import ManifestJournal, journal_path_for
+from act.utils.manifest_store import (
+    DATA_JSON_FINGERPRINT_KEY,
+    MANIFEST_BACKENDS,
+    SQLiteManifestStore,
+)
+from act.utils.rdss_scan import scan_rdss_dir
+from act.utils.report_cache import ReportCache
+
+VERIFY_TIERS = ("stat", "sample", "full")
+SAMPLE_BLOCK_SIZE = 64 * 1024
+SAMPLE_BLOCK_COUNT = 8
+STAT_MTIME_TOLERANCE_NS = 1_000_000_000
 
 
 class Save:
     logger = logging.getLogger(__name__)
+    ingest_workers = 1
+    copy_strategy = "auto"
+    digest_index = None
+    rdss_listing_cache_path = None
+    reconcile_workers = 8
+    manifest_store = None
+    manifest_journal = None
+    lss_index = None
+    copy_throughput = None
+    io_scheduler = None
+    changed_sessions = None
+    _manifest_lock = threading.Lock()
+    _io_stats = threading.local()
 
     def __init__(
         self,
@@ -22,15 +60,37 @@ class Save:
         daysago=None,
         symlink=True,
         manifest_path="res/data.json",
+        ingest_workers=1,
+        copy_strategy="auto",
+        digest_index_path=None,
+        offline=False,
+        manifest_backend="json",
+        io_bytes_per_second=None,
+        io_max_concurrent=None,
     ):
         if not rdssdir:
             raise ValueError(
                 "RDSS directory is not configured for this system; cannot ingest files."
             )
+        if manifest_backend not in MANIFEST_BACKENDS:
+            raise ValueError(
+                f"Unknown manifest backend: {manifest_backend}. "
+                f"Expected one of {', '.join(MANIFEST_BACKENDS)}"
+            )
 
-        results = ID_COMPARISONS(
-            rdss_dir=rdssdir, token=token, daysago=daysago
-        ).compare_ids()
+        manifest_dir = os.path.dirname(manifest_path) or "."
+        self.rdss_listing_cache_path = os.path.join(manifest_dir, "rdss_listing.json")
+        self.offline = offline
+        self._id_comparisons = ID_COMPARISONS(
+            rdss_dir=rdssdir,
+            token=token,
+            daysago=daysago,
+            listing_cache_path=self.rdss_listing_cache_path,
+            report_cache=ReportCache(cache_dir=manifest_dir),
+            offline=offline,
+        )
+        with metrics.span("compare_ids", daysago=daysago, offline=bool(offline)):
+            results = self._id_comparisons.compare_ids()
         self.matches = results["matches"]
         self.matches.pop("6022, 7143", None)
         self.matches.pop("7178, 8066", None)
@@ -44,11 +104,32 @@ class Save:
         self.symlink = symlink
         self.manifest_path = manifest_path
         self.manifest = {}
+        self.ingest_workers = max(1, int(ingest_workers or 1))
+        self.copy_strategy = copy_strategy
+        self.digest_index = DigestIndex(
+            digest_index_path or os.path.join(manifest_dir, "digest_index.json")
+        )
+        self.manifest_journal = ManifestJournal(journal_path_for(manifest_path))
+        self.lss_index = LSSIndex(os.path.join(manifest_dir, "lss_index.json"))
+        self.copy_throughput = ThroughputHistory(
+            os.path.join(manifest_dir, "copy_throughput.json")
+        )
+        if io_bytes_per_second or io_max_concurrent:
+            self.io_scheduler = IOScheduler(
+                bytes_per_second=io_bytes_per_second,
+                max_concurrent=io_max_concurrent,
+            )
+        if manifest_backend == "sqlite":
+            self.manifest_store = SQLiteManifestStore(
+                os.path.join(manifest_dir, "manifest.sqlite3")
+            )
 
     def save(self):
         self.manifest = self._load_manifest(
             getattr(self, "manifest_path", "res/data.json")
         )
+        resumed = self._replay_manifest_journal()
+        self.changed_sessions = []
 
         # First, process the base matches.
         matches = self._determine_run(matches=self.matches)
@@ -59,12 +140,218 @@ class Save:
         if not len(self.dupes) == 0:
             matches = self._handle_and_merge_duplicates(self.dupes)
 
-        for subject_id, records in matches.items():
-            self._process_subject_transaction(subject_id, records)
+        self._run_subject_transactions(self._skip_resumed_subjects(matches, resumed))
 
         persisted_manifest = self._save_manifest(self.manifest_path)
+        journal = getattr(self, "manifest_journal", None)
+        if journal is not None:
+            journal.clear()
+        self._save_digest_index()
+        throughput = getattr(self, "copy_throughput", None)
+        if throughput is not None:
+            throughput.save()
+        self._log_io_summary()
         return self._prepare_for_json(persisted_manifest)
 
+    def plan(self, plan_path=None):
+        """
+        Dry-run save(): report the copies and renames it would perform.
+
+        Runs the same run/study/location assignment, duplicate merging and
+        rename planning against the manifest (plus any pending journal) and
+        source-file stats only; nothing under the study roots is modified.
+        The plan is written as JSON next to the manifest and returned.
+        """
+        manifest_path = getattr(self, "manifest_path", "res/data.json")
+        self.manifest = self._load_manifest(manifest_path, read_only=True)
+        resumed = self._replay_manifest_journal(persist=False)
+
+        matches = self._determine_run(matches=self.matches)
+        matches = self._determine_study(matches=matches)
+        matches = self._determine_location(matches=matches)
+        if not len(self.dupes) == 0:
+            matches = self._handle_and_merge_duplicates(self.dupes)
+        matches = self._skip_resumed_subjects(matches, resumed)
+
+        subjects = []
+        totals = {
+            "subjects": len(matches),
+            "subjects_changed": 0,
+            "subjects_skipped": 0,
+            "copies": 0,
+            "verifies": 0,
+            "renames": 0,
+            "missing_sources": 0,
+            "bytes_to_transfer": 0,
+            "bytes_to_verify": 0,
+        }
+        for subject_id, records in matches.items():
+            entry = self._plan_subject_entry(str(subject_id), records or [])
+            subjects.append(entry)
+            if entry["action"] == "skip_tie_date":
+                totals["subjects_skipped"] += 1
+                continue
+            if entry["action"] == "apply":
+                totals["subjects_changed"] += 1
+            totals["renames"] += len(entry["renames"])
+            for copy in entry["copies"]:
+                if copy["source_bytes"] is None:
+                    totals["missing_sources"] += 1
+                elif copy["destination_exists"]:
+                    totals["verifies"] += 1
+                    totals["bytes_to_verify"] += copy["source_bytes"]
+                else:
+                    totals["copies"] += 1
+                    totals["bytes_to_transfer"] += copy["source_bytes"]
+
+        throughput = getattr(self, "copy_throughput", None)
+        changed = totals["subjects_changed"]
+        plan = {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "manifest_path": manifest_path,
+            "totals": totals,
+            "estimate": estimate_duration(
+                totals["bytes_to_transfer"] + totals["bytes_to_verify"],
+                metadata_ops=2 * totals["renames"],
+                bytes_per_second=getattr(throughput, "bytes_per_second", None),
+                streams=min(max(1, int(getattr(self, "ingest_workers", 1) or 1)), max(1, changed)),
+            ),
+            "subjects": subjects,
+        }
+
+        plan_path = plan_path or os.path.join(
+            os.path.dirname(manifest_path) or ".", "ingest_plan.json"
+        )
+        plan["plan_path"] = write_plan(plan_path, plan)
+        return plan
+
+    def _plan_subject_entry(self, subject_key, incoming_records):
+        plan = self._plan_subject_transaction(subject_key, incoming_records)
+        if plan is None:
+            return {"subject_id": subject_key, "action": "skip_tie_date", "copies": [], "renames": []}
+
+        copies = []
+        for record_key in sorted(plan["new_keys"], key=lambda key: tuple(str(part) for part in key)):
+            record = plan["canonical_lookup"].get(record_key)
+            if record is None:
+                continue
+            source_path = os.path.join(self.RDSS_DIR, record["filename"])
+            try:
+                source_bytes = os.stat(source_path).st_size
+            except OSError:
+                source_bytes = None
+            copies.append(
+                {
+                    "filename": record["filename"],
+                    "run": record["run"],
+                    "source": source_path,
+                    "destination": record["file_path"],
+                    "source_bytes": source_bytes,
+                    "destination_exists": os.path.exists(record["file_path"]),
+                }
+            )
+        copies.sort(key=lambda copy: copy["run"])
+
+        renames = [
+            {
+                "old_run": move["old_run"],
+                "new_run": move["new_run"],
+                "old_file": move["old_file"],
+                "new_file": move["new_file"],
+            }
+            for move in plan["rename_plan"]["moves"]
+        ]
+        return {
+            "subject_id": subject_key,
+            "study": plan["study"],
+            "action": "apply" if copies or renames else "noop",
+            "copies": copies,
+            "renames": renames,
+        }
+
+    def _replay_manifest_journal(self, persist=True):
+        """
+        Fold subjects committed by an interrupted run back into the manifest.
+
+        With persist=False only the in-memory manifest is updated (dry runs).
+
+        Returns:
+            dict: subject_id -> set of record identity keys restored from the journal
+        """
+        journal = getattr(self, "manifest_journal", None)
+        if journal is None:
+            return {}
+
+        entries = journal.replay(repair=persist)
+        resumed = {}
+        for subject_id, records in entries.items():
+            records = [dict(record) for record in records if isinstance(record, dict)]
+            if persist:
+                self._persist_subject_records(subject_id, records)
+            self.manifest[subject_id] = records
+            resumed[subject_id] = {self._record_identity_key(record) for record in records}
+
+        if resumed:
+            self.logger.info("journal_replay subjects=%s", len(resumed))
+        return resumed
+
+    def _skip_resumed_subjects(self, matches, resumed):
+        if not resumed:
+            return matches
+
+        remaining = {}
+        for subject_id, records in matches.items():
+            subject_key = str(subject_id)
+            journaled_keys = resumed.get(subject_key)
+            if journaled_keys is not None and all(
+                self._record_identity_key(record) in journaled_keys
+                for record in records or []
+                if isinstance(record, dict)
+            ):
+                self.logger.info("resume_skip subject=%s", subject_key)
+                continue
+            remaining[subject_id] = records
+        return remaining
+
+    def _run_subject_transactions(self, matches):
+        workers = max(1, int(getattr(self, "ingest_workers", 1) or 1))
+        if workers == 1 or len(matches) <= 1:
+            for subject_id, records in matches.items():
+                self._process_subject_transaction(subject_id, records)
+            return
+
+        # Subjects own disjoint sub-* trees, so their transactions can run
+        # concurrently; only the shared manifest dict needs serializing.
+        manifest_order = list(self.manifest.keys())
+        self.logger.info(
+            "parallel_ingest subjects=%s workers=%s", len(matches), workers
+        )
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="ingest"
+        ) as executor:
+            # Each worker runs in a copy of this context so its metrics spans
+            # nest under the caller's ingest span.
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self._process_subject_transaction,
+                    subject_id,
+                    records,
+                )
+                for subject_id, records in matches.items()
+            ]
+            for future in futures:
+                future.result()
+
+        # Restore the key order a serial run would have produced so the
+        # persisted manifest does not depend on worker scheduling.
+        ordered_keys = manifest_order + [
+            str(subject_id)
+            for subject_id in matches
+            if str(subject_id) in self.manifest and str(subject_id) not in manifest_order
+        ]
+        self.manifest = {key: self.manifest[key] for key in ordered_keys}
+
     def _normalize_manifest_payload(self, payload):
         if not isinstance(payload, dict):
             self.logger.warning(
@@ -97,9 +384,66 @@ class Save:
 
         return normalized
 
-    def _load_manifest(self, path):
+    def _load_manifest(self, path, read_only=False):
+        """
+        Load the manifest from the SQLite store when one is attached, else data.json.
+
+        With read_only, a store that does not exist yet or is out of step
+        with data.json is left alone and data.json is read instead of
+        seeding the store from it.
+        """
         manifest_path = path or getattr(self, "manifest_path", "res/data.json")
 
+        store = getattr(self, "manifest_store", None)
+        if store is not None and read_only:
+            if not store.exists():
+                return self._load_manifest_json(manifest_path)
+            fingerprint = self._manifest_json_fingerprint(manifest_path)
+            recorded = store.get_meta(DATA_JSON_FINGERPRINT_KEY)
+            if store.is_empty() or (fingerprint is not None and fingerprint != recorded):
+                return self._load_manifest_json(manifest_path)
+            return self._normalize_manifest_payload(store.load())
+
+        if store is not None:
+            fingerprint = self._manifest_json_fingerprint(manifest_path)
+            recorded = store.get_meta(DATA_JSON_FINGERPRINT_KEY)
+            if store.is_empty() or (fingerprint is not None and fingerprint != recorded):
+                # First run on the SQLite backend, or data.json was rewritten
+                # by a run on the json backend since: data.json is newer.
+                if not store.is_empty():
+                    self.logger.warning(
+                        "manifest_store_reseed path=%s reason=data_json_changed",
+                        manifest_path,
+                    )
+                store.replace_all(
+                    self._load_manifest_json(manifest_path),
+                    meta={DATA_JSON_FINGERPRINT_KEY: fingerprint},
+                )
+            return self._normalize_manifest_payload(store.load())
+
+        return self._load_manifest_json(manifest_path)
+
+    @staticmethod
+    def _manifest_json_fingerprint(manifest_path):
+        """SHA-256 of data.json's bytes, or None when it does not exist."""
+        digest = hashlib.sha256()
+        try:
+            with open(manifest_path, "rb") as handle:
+                for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+                    digest.update(chunk)
+        except FileNotFoundError:
+            return None
+        return digest.hexdigest()
+
+    def _record_manifest_export(self, manifest_path):
+        """Remember which data.json the SQLite store was last exported to."""
+        store = getattr(self, "manifest_store", None)
+        if store is not None:
+            store.set_meta(
+                DATA_JSON_FINGERPRINT_KEY, self._manifest_json_fingerprint(manifest_path)
+            )
+
+    def _load_manifest_json(self, manifest_path):
         try:
             with open(manifest_path, "r", encoding="utf-8") as handle:
                 payload = json.load(handle)
@@ -121,12 +465,20 @@ class Save:
 
     def _save_manifest(self, path):
         manifest_path = path or getattr(self, "manifest_path", "res/data.json")
-        payload = self._normalize_manifest_payload(getattr(self, "manifest", {}))
-        payload = self._prepare_for_json(payload)
+        store = getattr(self, "manifest_store", None)
+        if store is not None:
+            # Subjects were upserted as they committed; only the final
+            # ordering is applied here before data.json is exported.
+            store.reorder_subjects(list(getattr(self, "manifest", {}).keys()))
+            payload = store.load()
+        else:
+            payload = self._normalize_manifest_payload(getattr(self, "manifest", {}))
+            payload = self._prepare_for_json(payload)
 
         os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
         with open(manifest_path, "w", encoding="utf-8") as handle:
             json.dump(payload, handle, indent=2)
+        self._record_manifest_export(manifest_path)
 
         return payload
 
@@ -135,6 +487,10 @@ class Save:
         normalized_payload = self._normalize_manifest_payload(payload)
         normalized_payload = self._prepare_for_json(normalized_payload)
 
+        store = getattr(self, "manifest_store", None)
+        if store is not None:
+            store.replace_all(normalized_payload)
+
         manifest_dir = os.path.dirname(manifest_path) or "."
         os.makedirs(manifest_dir, exist_ok=True)
 
@@ -151,6 +507,7 @@ class Save:
                 os.fsync(handle.fileno())
 
             os.replace(temp_path, manifest_path)
+            self._record_manifest_export(manifest_path)
 
             try:
                 dir_fd = os.open(manifest_dir, os.O_DIRECTORY)
@@ -273,14 +630,22 @@ class Save:
         if not token:
             raise ValueError("RedCap token is required to fetch subject mappings")
 
-        rdss_dir = getattr(self, "RDSS_DIR", None) or "."
-        daysago = getattr(self, "daysago", None)
+        comparisons = getattr(self, "_id_comparisons", None)
+        if comparisons is None:
+            rdss_dir = getattr(self, "RDSS_DIR", None) or "."
+            daysago = getattr(self, "daysago", None)
+            manifest_dir = (
+                os.path.dirname(getattr(self, "manifest_path", "res/data.json")) or "."
+            )
+            comparisons = ID_COMPARISONS(
+                rdss_dir=rdss_dir,
+                token=token,
+                daysago=daysago,
+                report_cache=ReportCache(cache_dir=manifest_dir),
+                offline=getattr(self, "offline", False),
+            )
 
-        report_df, _ = ID_COMPARISONS(
-            rdss_dir=rdss_dir,
-            token=token,
-            daysago=daysago,
-        )._return_report()
+        report_df, _ = comparisons._return_report()
         return report_df
 
     def resolve_subject_lab_mapping(self, subject_ids):
@@ -426,11 +791,14 @@ class Save:
         return int(match.group(1))
 
     def _candidate_session_csvs(self, session_dir):
-        if not os.path.isdir(session_dir):
+        try:
+            with os.scandir(session_dir) as iterator:
+                names = [entry.name for entry in iterator]
+        except (FileNotFoundError, NotADirectoryError):
             return []
 
         candidates = []
-        for name in sorted(os.listdir(session_dir)):
+        for name in sorted(names):
             lower_name = name.lower()
             if lower_name.endswith("_accel.csv"):
                 candidates.append(os.path.join(session_dir, name))
@@ -451,12 +819,150 @@ class Save:
         return os.path.getsize(path)
 
     def _file_sha256(self, path):
+        index = getattr(self, "digest_index", None)
+        if index is not None:
+            cached = index.lookup(path, os.stat(path))
+            if cached:
+                return cached
+
         digest = hashlib.sha256()
+        throttle = self._io_throttle(path)
         with open(path, "rb") as handle:
+            before = os.fstat(handle.fileno())
             for chunk in iter(lambda: handle.read(1024 * 1024), b""):
                 digest.update(chunk)
+                if throttle is not None:
+                    throttle(len(chunk))
+        self._count_bytes_read(before.st_size)
+        hexdigest = digest.hexdigest()
+
+        if index is not None:
+            # Only trust the digest if the file did not change while we read it.
+            after = os.stat(path)
+            if (before.st_size, before.st_mtime_ns, before.st_ino) == (
+                after.st_size,
+                after.st_mtime_ns,
+                after.st_ino,
+            ):
+                index.update(path, hexdigest, after)
+        return hexdigest
+
+    def _count_bytes_read(self, count):
+        self._io_stats.bytes_read = getattr(self._io_stats, "bytes_read", 0) + count
+        metrics.add(bytes_read=count)
+
+    def _io_throttle(self, *paths):
+        scheduler = getattr(self, "io_scheduler", None)
+        if scheduler is None:
+            return None
+        return scheduler.throttle(*paths)
+
+    def _io_slot(self, owner, *paths):
+        scheduler = getattr(self, "io_scheduler", None)
+        if scheduler is None:
+            return contextlib.nullcontext()
+        return scheduler.slot(owner, *paths)
+
+    def _log_io_summary(self):
+        scheduler = getattr(self, "io_scheduler", None)
+        if scheduler is None:
+            return
+        for mount, totals in scheduler.summary().items():
+            self.logger.info(
+                "io_summary mount=%s bytes=%s slot_wait_s=%s",
+                mount,
+                totals["bytes"],
+                totals["wait_seconds"],
+            )
+
+    def _compare_file_stat(self, source_path, destination_path):
+        source_stat = os.stat(source_path)
+        destination_stat = os.stat(destination_path)
+        size_match = source_stat.st_size == destination_stat.st_size
+        # Copies go through copystat, so a faithful destination carries the
+        # source mtime; allow a second of slack for coarse NFS timestamps.
+        mtime_match = (
+            abs(source_stat.st_mtime_ns - destination_stat.st_mtime_ns)
+            < STAT_MTIME_TOLERANCE_NS
+        )
+        identity = {
+            "size_match": size_match,
+            "mtime_match": mtime_match,
+            "match": size_match and mtime_match,
+        }
+        if size_match and not mtime_match:
+            # Archives written with shutil.copy never carried the source mtime;
+            # confirm by sampled content before calling this a mismatch.
+            sampled = self._compare_file_samples(source_path, destination_path)
+            identity["hash_match"] = sampled["hash_match"]
+            identity["match"] = sampled["match"]
+            if sampled["match"]:
+                self._sync_destination_mtime(source_stat, destination_path, destination_stat)
+        return identity
+
+    def _sync_destination_mtime(self, source_stat, destination_path, destination_stat):
+        """Give a verified destination the source mtime so later stat passes read nothing."""
+        try:
+            os.utime(
+                destination_path, ns=(destination_stat.st_atime_ns, source_stat.st_mtime_ns)
+            )
+        except OSError as exc:
+            self.logger.warning(
+                "reconcile_mtime_sync_skipped destination=%s error=%s", destination_path, exc
+            )
+            return
+        self.logger.info("reconcile_mtime_synced destination=%s", destination_path)
+
+    def _sample_offsets(self, size):
+        if size <= SAMPLE_BLOCK_SIZE * SAMPLE_BLOCK_COUNT:
+            return [0]
+        last = size - SAMPLE_BLOCK_SIZE
+        step = last // (SAMPLE_BLOCK_COUNT - 1)
+        return [index * step for index in range(SAMPLE_BLOCK_COUNT - 1)] + [last]
+
+    def _file_sample_sha256(self, path, size):
+        digest = hashlib.sha256()
+        throttle = self._io_throttle(path)
+        with open(path, "rb") as handle:
+            if size <= SAMPLE_BLOCK_SIZE * SAMPLE_BLOCK_COUNT:
+                blocks = [handle.read()]
+            else:
+                blocks = []
+                for offset in self._sample_offsets(size):
+                    handle.seek(offset)
+                    blocks.append(handle.read(SAMPLE_BLOCK_SIZE))
+        for data in blocks:
+            digest.update(data)
+            self._count_bytes_read(len(data))
+            if throttle is not None:
+                throttle(len(data))
         return digest.hexdigest()
 
+    def _compare_file_samples(self, source_path, destination_path):
+        source_size = self._file_size(source_path)
+        destination_size = self._file_size(destination_path)
+        size_match = source_size == destination_size
+        hash_match = False
+        if size_match:
+            hash_match = self._file_sample_sha256(
+                source_path, source_size
+            ) == self._file_sample_sha256(destination_path, destination_size)
+
+        return {
+            "size_match": size_match,
+            "hash_match": hash_match,
+            "match": size_match and hash_match,
+        }
+
+    def _save_digest_index(self):
+        index = getattr(self, "digest_index", None)
+        if index is None:
+            return
+        try:
+            index.save()
+        except OSError as exc:
+            self.logger.warning("Unable to persist digest index (%s).", exc)
+
     def _compare_file_identity(self, source_path, destination_path):
         source_size = self._file_size(source_path)
         destination_size = self._file_size(destination_path)
@@ -481,6 +987,7 @@ class Save:
             "missing_source": 0,
             "missing_dest": 0,
             "ambiguous_dest": 0,
+            "bytes_read": 0,
             "errors": [],
         }
 
@@ -488,6 +995,62 @@ class Save:
         report[status] = report.get(status, 0) + 1
         report.setdefault("errors", []).append(message)
 
+    def _copy_file_contents(self, source_path, destination_path, fsync=False):
+        strategy = getattr(self, "copy_strategy", "auto")
+        source_stat = os.stat(source_path)
+        started = time.perf_counter()
+        result = copy_file(
+            source_path,
+            destination_path,
+            strategy=strategy,
+            fsync=fsync,
+            digest=True,
+            throttle=self._io_throttle(source_path, destination_path),
+        )
+        result["source_stat"] = source_stat
+        # A kernel-side copy is hashed by reading the destination back.
+        passes = 1 if result["strategy"] == "stream" else 2
+        self._count_bytes_read(passes * result["bytes"])
+        metrics.add(bytes_written=result["bytes"])
+        throughput = getattr(self, "copy_throughput", None)
+        if throughput is not None:
+            throughput.observe(result["bytes"], time.perf_counter() - started)
+        self.logger.debug(
+            "copy_engine strategy=%s bytes=%s source=%s destination=%s",
+            result["strategy"],
+            result["bytes"],
+            source_path,
+            destination_path,
+        )
+        return result
+
+    def _record_copy_digest(self, copy_result, source_path, destination_path):
+        """
+        Return {"sha256", "size"} for a finished copy and seed the digest
+        index with both sides, so the next reconcile need not re-read them.
+        """
+        sha256 = copy_result["sha256"]
+        index = getattr(self, "digest_index", None)
+        source_stat = copy_result.get("source_stat")
+        if index is not None:
+            try:
+                current_source = os.stat(source_path)
+            except OSError:
+                current_source = None
+            if source_stat is not None and current_source is not None and (
+                source_stat.st_size,
+                source_stat.st_mtime_ns,
+                source_stat.st_ino,
+            ) == (
+                current_source.st_size,
+                current_source.st_mtime_ns,
+                current_source.st_ino,
+            ):
+                index.update(source_path, sha256, current_source)
+            index.update(destination_path, sha256, os.stat(destination_path))
+
+        return {"sha256": sha256, "size": copy_result["bytes"]}
+
     def _replace_file_atomically(self, source_path, destination_path):
         destination_dir = os.path.dirname(destination_path) or "."
         os.makedirs(destination_dir, exist_ok=True)
@@ -499,10 +1062,8 @@ class Save:
                 suffix=".csv",
                 dir=destination_dir,
             )
-            with os.fdopen(fd, "wb") as handle, open(source_path, "rb") as source_handle:
-                shutil.copyfileobj(source_handle, handle)
-                handle.flush()
-                os.fsync(handle.fileno())
+            os.close(fd)
+            copy_result = self._copy_file_contents(source_path, temp_path, fsync=True)
             try:
                 shutil.copystat(source_path, temp_path, follow_symlinks=True)
             except OSError as exc:
@@ -523,170 +1084,384 @@ class Save:
                     pass
             raise
 
-    def reconcile_manifest(self):
+        return self._record_copy_digest(copy_result, source_path, destination_path)
+
+    def _verify_against_record_digest(self, record, destination_path):
+        """Check a destination against the digest stored on its manifest record."""
+        expected_size = record.get("size")
+        size_match = expected_size is None or self._file_size(destination_path) == int(
+            expected_size
+        )
+        hash_match = False
+        if size_match:
+            hash_match = self._file_sha256(destination_path) == record.get("sha256")
+
+        return {
+            "size_match": size_match,
+            "hash_match": hash_match,
+            "match": size_match and hash_match,
+        }
+
+    def reconcile_manifest(self, verify="full", workers=None):
+        if verify not in VERIFY_TIERS:
+            raise ValueError(
+                f"Unknown verify tier: {verify}. Expected one of {', '.join(VERIFY_TIERS)}"
+            )
+
+        started = time.perf_counter()
         manifest = self._load_manifest(getattr(self, "manifest_path", "res/data.json"))
         report = self._new_reconcile_report()
+        report["verify"] = verify
 
+        tasks = []
         for subject_id in sorted(manifest.keys(), key=self._subject_order_key):
             records = manifest.get(subject_id, [])
             for record in sorted(records, key=lambda item: int(item.get("run", 0))):
-                report["total_records"] += 1
-
-                run = int(record.get("run", 0))
-                source_path = os.path.join(self.RDSS_DIR, str(record.get("filename", "")))
-                destination_path = str(record.get("file_path", ""))
-                session_dir = os.path.dirname(destination_path)
-                log_context = (
-                    f"subject={subject_id} run={run} source={source_path} "
-                    f"destination={destination_path}"
-                )
-
-                try:
-                    candidate = self._validate_session_csv_candidate(session_dir)
-                except ValueError as exc:
-                    self.logger.error("reconcile_failed %s error=%s", log_context, exc)
-                    self._record_reconcile_error(
-                        report,
-                        "ambiguous_dest",
-                        f"{log_context} error={exc}",
+                tasks.append((subject_id, record))
+
+        workers = max(1, int(workers or getattr(self, "reconcile_workers", 1) or 1))
+        if workers > 1 and len(tasks) > 1:
+            # Verification is dominated by NFS round trips and reads, so a
+            # thread pool overlaps latency. Each task runs in a copy of this
+            # context so its bytes_read reaches the reconcile span, and the
+            # futures are collected in task order to keep the report ordered.
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="reconcile"
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        contextvars.copy_context().run,
+                        self._scheduled_reconcile_record,
+                        subject_id,
+                        record,
+                        verify,
                     )
-                    continue
+                    for subject_id, record in tasks
+                ]
+                outcomes = [future.result() for future in futures]
+        else:
+            outcomes = [
+                self._scheduled_reconcile_record(subject_id, record, verify)
+                for subject_id, record in tasks
+            ]
+
+        backfilled = 0
+        repaired_accel_dirs = {}
+        for outcome in outcomes:
+            report["total_records"] += 1
+            report["bytes_read"] += outcome["bytes_read"]
+            backfilled += int(outcome["backfilled"])
+            if outcome["mismatched"]:
+                report["mismatched"] += 1
 
-                if not os.path.exists(source_path):
-                    self.logger.error("reconcile_failed %s error=missing_source", log_context)
-                    self._record_reconcile_error(
-                        report,
-                        "missing_source",
-                        f"{log_context} error=missing_source",
+            status = outcome["status"]
+            if status == "repaired":
+                report["repaired"] += 1
+                if self.symlink:
+                    repaired_accel_dirs.setdefault(
+                        os.path.dirname(os.path.dirname(outcome["destination_path"]))
                     )
-                    continue
+            elif status == "repair_failed":
+                report.setdefault("errors", []).append(outcome["message"])
+            elif status != "ok":
+                self._record_reconcile_error(report, status, outcome["message"])
 
-                if not destination_path or not os.path.exists(destination_path):
-                    self.logger.error("reconcile_failed %s error=missing_dest", log_context)
-                    self._record_reconcile_error(
-                        report,
-                        "missing_dest",
-                        f"{log_context} error=missing_dest",
-                    )
-                    continue
+        for accel_dir in repaired_accel_dirs:
+            self._reconcile_subject_links(accel_dir)
 
-                if candidate != destination_path:
-                    self.logger.error(
-                        "reconcile_failed %s error=missing_dest candidate=%s",
-                        log_context,
-                        candidate,
-                    )
-                    self._record_reconcile_error(
-                        report,
-                        "missing_dest",
-                        f"{log_context} error=missing_dest candidate={candidate}",
-                    )
-                    continue
+        if backfilled:
+            self._atomic_write_manifest(manifest, getattr(self, "manifest_path", None))
+            self.logger.info("reconcile_digests_recorded count=%s", backfilled)
 
-                identity = self._compare_file_identity(source_path, destination_path)
-                if identity["match"]:
-                    self.logger.info("reconcile_ok %s", log_context)
-                    continue
+        self._save_digest_index()
+        self._log_io_summary()
+        report["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        return report
 
-                report["mismatched"] += 1
+    def _scheduled_reconcile_record(self, subject_id, record, verify):
+        with self._io_slot(
+            subject_id,
+            os.path.join(self.RDSS_DIR, str(record.get("filename", ""))),
+            str(record.get("file_path", "")),
+        ):
+            return self._reconcile_record(subject_id, record, verify)
+
+    def _reconcile_record(self, subject_id, record, verify):
+        self._io_stats.bytes_read = 0
+        outcome = {
+            "status": "ok",
+            "message": None,
+            "mismatched": False,
+            "backfilled": False,
+            "bytes_read": 0,
+            "destination_path": None,
+        }
+
+        run = int(record.get("run", 0))
+        source_path = os.path.join(self.RDSS_DIR, str(record.get("filename", "")))
+        destination_path = str(record.get("file_path", ""))
+        outcome["destination_path"] = destination_path
+        session_dir = os.path.dirname(destination_path)
+        log_context = (
+            f"subject={subject_id} run={run} source={source_path} "
+            f"destination={destination_path}"
+        )
+
+        def fail(status, detail):
+            self.logger.error("reconcile_failed %s %s", log_context, detail)
+            outcome["status"] = status
+            outcome["message"] = f"{log_context} {detail}"
+            outcome["bytes_read"] = self._io_stats.bytes_read
+            return outcome
+
+        try:
+            candidate = self._validate_session_csv_candidate(session_dir)
+        except ValueError as exc:
+            return fail("ambiguous_dest", f"error={exc}")
+
+        if not os.path.exists(source_path):
+            return fail("missing_source", "error=missing_source")
+
+        if not destination_path or not os.path.exists(destination_path):
+            return fail("missing_dest", "error=missing_dest")
+
+        if candidate != destination_path:
+            return fail("missing_dest", f"error=missing_dest candidate={candidate}")
+
+        if verify == "stat":
+            identity = self._compare_file_stat(source_path, destination_path)
+        elif verify == "sample":
+            identity = self._compare_file_samples(source_path, destination_path)
+        elif record.get("sha256"):
+            identity = self._verify_against_record_digest(record, destination_path)
+        else:
+            identity = self._compare_file_identity(source_path, destination_path)
+            if identity["match"]:
+                # Source and destination agree, so the cached digest
+                # is authoritative; store it for cheaper future runs.
+                record["sha256"] = self._file_sha256(destination_path)
+                record["size"] = self._file_size(destination_path)
+                outcome["backfilled"] = True
+
+        if identity["match"]:
+            self.logger.info("reconcile_ok %s", log_context)
+            outcome["bytes_read"] = self._io_stats.bytes_read
+            return outcome
+
+        outcome["mismatched"] = True
+        self.logger.warning(
+            "reconcile_mismatch %s %s",
+            log_context,
+            " ".join(f"{key}={value}" for key, value in identity.items() if key != "match"),
+        )
+
+        try:
+            digest_fields = self._replace_file_atomically(source_path, destination_path)
+        except Exception as exc:
+            self.logger.error("reconcile_failed %s error=%s", log_context, exc)
+            outcome["status"] = "repair_failed"
+            outcome["message"] = f"{log_context} error={exc}"
+            outcome["bytes_read"] = self._io_stats.bytes_read
+            return outcome
+
+        if digest_fields:
+            if record.get("sha256") and record["sha256"] != digest_fields["sha256"]:
                 self.logger.warning(
-                    "reconcile_mismatch %s size_match=%s hash_match=%s",
+                    "reconcile_source_digest_changed %s stored=%s current=%s",
                     log_context,
-                    identity["size_match"],
-                    identity["hash_match"],
+                    record["sha256"],
+                    digest_fields["sha256"],
                 )
+            record.update(digest_fields)
+            outcome["backfilled"] = True
 
-                try:
-                    self._replace_file_atomically(source_path, destination_path)
-                except Exception as exc:
-                    self.logger.error("reconcile_failed %s error=%s", log_context, exc)
-                    report.setdefault("errors", []).append(
-                        f"{log_context} error={exc}"
-                    )
-                    continue
+        self.logger.info("reconcile_repaired %s", log_context)
+        outcome["status"] = "repaired"
+        outcome["bytes_read"] = self._io_stats.bytes_read
+        return outcome
 
-                report["repaired"] += 1
-                if self.symlink:
-                    self._refresh_subject_symlinks(destination_path)
-                self.logger.info("reconcile_repaired %s", log_context)
+    def discover_lss_sessions(self):
+        """
+        Find canonical session CSVs under both study roots.
 
-        return report
+        Each study root is scanned on its own thread with os.scandir, using
+        the directory-entry type to avoid a stat per entry. When an LSSIndex
+        is attached, subjects whose accel/ and ses-* mtimes are unchanged
+        since the last scan reuse their cached result.
+
+        Returns:
+            tuple: (discovered, conflicts) keyed by subject_id
+        """
+        roots = [
+            (study, study_root)
+            for study, study_root in (("int", self.INT_DIR), ("obs", self.OBS_DIR))
+            if study_root and os.path.isdir(study_root)
+        ]
+
+        if len(roots) > 1:
+            with ThreadPoolExecutor(
+                max_workers=len(roots), thread_name_prefix="discover"
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        contextvars.copy_context().run,
+                        self._scan_lss_study_root,
+                        study,
+                        study_root,
+                    )
+                    for study, study_root in roots
+                ]
+                scanned = [future.result() for future in futures]
+        else:
+            scanned = [self._scan_lss_study_root(*root) for root in roots]
 
-    def discover_lss_sessions(self):
         discovered = {}
         conflicts = {}
+        for subject_results in scanned:
+            for subject_id, records, messages in subject_results:
+                if records:
+                    discovered.setdefault(subject_id, []).extend(
+                        dict(record) for record in records
+                    )
+                if messages:
+                    conflicts.setdefault(subject_id, []).extend(messages)
 
-        for study, study_root in (("int", self.INT_DIR), ("obs", self.OBS_DIR)):
-            if not study_root or not os.path.isdir(study_root):
-                continue
+        for subject_id in discovered:
+            discovered[subject_id].sort(key=lambda record: record["run"])
 
-            for subject_folder in sorted(os.listdir(study_root)):
-                if not subject_folder.startswith("sub-"):
-                    continue
+        index = getattr(self, "lss_index", None)
+        if index is not None:
+            index.save()
 
-                subject_id = subject_folder[len("sub-"):]
-                accel_root = os.path.join(study_root, subject_folder, "accel")
-                if not os.path.isdir(accel_root):
-                    continue
+        return discovered, conflicts
 
-                for session_folder in sorted(os.listdir(accel_root)):
-                    run = self._session_run_from_folder(session_folder)
-                    if run is None:
-                        continue
+    def _scan_lss_study_root(self, study, study_root):
+        index = getattr(self, "lss_index", None)
+        cached_subjects = index.subjects(study_root) if index is not None else {}
 
-                    session_dir = os.path.join(accel_root, session_folder)
-                    if not os.path.isdir(session_dir):
-                        continue
+        with os.scandir(study_root) as iterator:
+            subject_folders = sorted(
+                entry.name
+                for entry in iterator
+                if entry.name.startswith("sub-") and entry.is_dir()
+            )
 
-                    try:
-                        csv_path = self._validate_session_csv_candidate(session_dir)
-                    except ValueError as exc:
-                        conflict_message = str(exc)
-                        conflicts.setdefault(subject_id, []).append(conflict_message)
-                        continue
+        results = []
+        subject_states = {}
+        reused = 0
+        for subject_folder in subject_folders:
+            accel_root = os.path.join(study_root, subject_folder, "accel")
+            state = self._cached_lss_subject_state(
+                accel_root, cached_subjects.get(subject_folder)
+            )
+            if state is None:
+                state = self._scan_lss_subject(study, subject_folder, accel_root)
+            else:
+                reused += 1
+            if state is None:
+                continue
+            subject_states[subject_folder] = state
+            results.append((subject_folder[len("sub-"):], state["records"], state["conflicts"]))
 
-                    if csv_path is None:
-                        continue
+        if index is not None:
+            index.replace_root(study_root, subject_states)
+            self.logger.info(
+                "lss_discovery study=%s subjects=%s reused=%s",
+                study,
+                len(subject_folders),
+                reused,
+            )
+        return results
 
-                    discovered.setdefault(subject_id, []).append(
-                        {
-                            "subject_id": subject_id,
-                            "study": study,
-                            "run": run,
-                            "file_path": csv_path,
-                            "filename": os.path.basename(csv_path),
-                        }
-                    )
+    def _cached_lss_subject_state(self, accel_root, state):
+        if not isinstance(state, dict):
+            return None
 
-        for subject_id in discovered:
-            discovered[subject_id].sort(key=lambda record: record["run"])
+        scanned_at_ns = state.get("scanned_at_ns", 0)
+        tracked = [(accel_root, state.get("accel_mtime_ns"))]
+        tracked.extend(
+            (os.path.join(accel_root, name), mtime_ns)
+            for name, mtime_ns in (state.get("sessions") or {}).items()
+        )
+        for path, mtime_ns in tracked:
+            try:
+                current = os.stat(path).st_mtime_ns
+            except OSError:
+                return None
+            if current != mtime_ns or scanned_at_ns - current < RACY_WINDOW_NS:
+                return None
+        return state
 
-        return discovered, conflicts
+    def _scan_lss_subject(self, study, subject_folder, accel_root):
+        scanned_at_ns = time.time_ns()
+        try:
+            accel_mtime_ns = os.stat(accel_root).st_mtime_ns
+            with os.scandir(accel_root) as iterator:
+                session_entries = sorted(
+                    (entry for entry in iterator if entry.is_dir()),
+                    key=lambda entry: entry.name,
+                )
+        except (FileNotFoundError, NotADirectoryError):
+            return None
 
-    def _list_rdss_metadata_rows(self):
-        rdss_dir = getattr(self, "RDSS_DIR", None)
-        if not rdss_dir or not os.path.isdir(rdss_dir):
-            return []
+        subject_id = subject_folder[len("sub-"):]
+        records = []
+        conflicts = []
+        sessions = {}
+        for entry in session_entries:
+            run = self._session_run_from_folder(entry.name)
+            if run is None:
+                continue
 
-        rows = []
-        pattern = re.compile(r"^(?P<lab_id>\S+)\s*\((?P<date>[^)]+)\).+\.csv$", re.IGNORECASE)
+            try:
+                sessions[entry.name] = entry.stat().st_mtime_ns
+            except OSError:
+                continue
 
-        for filename in sorted(os.listdir(rdss_dir)):
-            if not filename.lower().endswith(".csv"):
+            try:
+                csv_path = self._validate_session_csv_candidate(entry.path)
+            except ValueError as exc:
+                conflicts.append(str(exc))
                 continue
 
-            match = pattern.match(filename)
-            if not match:
+            if csv_path is None:
                 continue
 
-            rows.append(
+            records.append(
                 {
-                    "filename": filename,
-                    "labID": str(match.group("lab_id")),
-                    "date": self._normalize_record_date_value(match.group("date")),
+                    "subject_id": subject_id,
+                    "study": study,
+                    "run": run,
+                    "file_path": csv_path,
+                    "filename": os.path.basename(csv_path),
                 }
             )
 
+        return {
+            "scanned_at_ns": scanned_at_ns,
+            "accel_mtime_ns": accel_mtime_ns,
+            "sessions": sessions,
+            "records": records,
+            "conflicts": conflicts,
+        }
+
+    def _list_rdss_metadata_rows(self):
+        rdss_dir = getattr(self, "RDSS_DIR", None)
+        if not rdss_dir or not os.path.isdir(rdss_dir):
+            return []
+
+        entries, _ = scan_rdss_dir(
+            rdss_dir, cache_path=getattr(self, "rdss_listing_cache_path", None)
+        )
+        rows = [
+            {
+                "filename": entry["filename"],
+                "labID": entry["lab_id"],
+                "date": self._normalize_record_date_value(entry["date"]),
+            }
+            for entry in entries
+        ]
+
         rows.sort(
             key=lambda row: (
                 self._normalize_record_date_value(row.get("date")) or "",
@@ -817,6 +1592,12 @@ class Save:
         destination_dir = os.path.dirname(destination_path)
         os.makedirs(destination_dir, exist_ok=True)
 
+        with self._io_slot(subject_id, source_path, destination_path):
+            return self._copy_or_verify_record(
+                record, source_path, destination_path, log_context
+            )
+
+    def _copy_or_verify_record(self, record, source_path, destination_path, log_context):
         if os.path.exists(destination_path):
             identity = self._compare_file_identity(source_path, destination_path)
             if not identity["match"]:
@@ -825,15 +1606,18 @@ class Save:
                     f"{log_context} size_match={identity['size_match']} "
                     f"hash_match={identity['hash_match']}"
                 )
+            if identity["hash_match"]:
+                record["sha256"] = self._file_sha256(destination_path)
+                record["size"] = self._file_size(destination_path)
             self.logger.info("skip_existing %s", log_context)
-            if self.symlink:
-                self._refresh_subject_symlinks(destination_path)
             return None
 
-        shutil.copy2(source_path, destination_path)
+        copy_result = self._copy_file_contents(source_path, destination_path)
+        shutil.copystat(source_path, destination_path)
+        record.update(
+            self._record_copy_digest(copy_result, source_path, destination_path)
+        )
         self.logger.info("copied %s", log_context)
-        if self.symlink:
-            self._refresh_subject_symlinks(destination_path)
         return destination_path
 
     def _rollback_rename_plan(self, rename_plan):
@@ -860,15 +1644,22 @@ class Save:
         if inverse_moves:
             self._apply_two_phase_renames(inverse_plan)
 
-    def _process_subject_transaction(self, subject_id, incoming_records):
-        subject_key = str(subject_id)
-        incoming_records = incoming_records or []
-        existing_records = [dict(record) for record in self.manifest.get(subject_key, [])]
+    def _plan_subject_transaction(self, subject_key, incoming_records):
+        """
+        Work out a subject's canonical records, new files and renames without I/O.
+
+        Returns None when merged records share a date (the subject is skipped),
+        otherwise a dict with study, existing_records, canonical_records,
+        canonical_lookup, new_keys and rename_plan.
+        """
+        with self._manifest_lock:
+            existing_records = [
+                dict(record) for record in self.manifest.get(subject_key, [])
+            ]
         merged_records = self._reindex_subject_records(existing_records, incoming_records)
 
         if self._detect_same_date_conflict(merged_records):
-            self.logger.warning("skip_tie_date subject=%s", subject_key)
-            return []
+            return None
 
         merged_records.sort(key=self._subject_sort_key)
         subject_study = self._infer_subject_study(subject_key, incoming_records)
@@ -895,14 +1686,6 @@ class Save:
             for record in incoming_records
             if isinstance(record, dict)
         }
-        new_keys = incoming_keys - existing_keys
-
-        old_dates = [
-            self._normalize_record_date_value(record.get("date"))
-            for record in existing_records
-            if isinstance(record, dict)
-        ]
-        new_dates = [key[1] for key in new_keys if key[1] is not None]
 
         rename_plan = self._plan_subject_renames(
             subject_id=subject_key,
@@ -910,6 +1693,41 @@ class Save:
             old_records=existing_records,
             new_records=canonical_records,
         )
+        return {
+            "study": subject_study,
+            "existing_records": existing_records,
+            "canonical_records": canonical_records,
+            "canonical_lookup": canonical_lookup,
+            "new_keys": incoming_keys - existing_keys,
+            "rename_plan": rename_plan,
+        }
+
+    def _process_subject_transaction(self, subject_id, incoming_records):
+        with metrics.span("ingest.subject", subject=str(subject_id)) as span:
+            return self._apply_subject_transaction(span, subject_id, incoming_records)
+
+    def _apply_subject_transaction(self, span, subject_id, incoming_records):
+        subject_key = str(subject_id)
+        incoming_records = incoming_records or []
+        plan = self._plan_subject_transaction(subject_key, incoming_records)
+        if plan is None:
+            self.logger.warning("skip_tie_date subject=%s", subject_key)
+            span.set(outcome="skip_tie_date")
+            return []
+
+        subject_study = plan["study"]
+        existing_records = plan["existing_records"]
+        canonical_records = plan["canonical_records"]
+        canonical_lookup = plan["canonical_lookup"]
+        new_keys = plan["new_keys"]
+        rename_plan = plan["rename_plan"]
+
+        old_dates = [
+            self._normalize_record_date_value(record.get("date"))
+            for record in existing_records
+            if isinstance(record, dict)
+        ]
+        new_dates = [key[1] for key in new_keys if key[1] is not None]
 
         self._log_subject_file_plan(
             subject_id=subject_key,
@@ -941,7 +1759,21 @@ class Save:
                 if copied_path:
                     copied_paths.append(copied_path)
 
-            self.manifest[subject_key] = canonical_records
+            if self.symlink and (new_keys or rename_plan["moves"]):
+                session_dir, _ = self._subject_session_paths(subject_key, subject_study, 1)
+                self._reconcile_subject_links(os.path.dirname(session_dir))
+
+            with self._manifest_lock:
+                self._persist_subject_records(subject_key, canonical_records)
+                # Journal only what is committed, so a failed upsert that
+                # rolls the subject back leaves no entry to resume from.
+                self._journal_subject_records(subject_key, canonical_records)
+                self.manifest[subject_key] = canonical_records
+                if self.changed_sessions is not None:
+                    self.changed_sessions.extend(copied_paths)
+                    self.changed_sessions.extend(
+                        move["new_file"] for move in rename_plan["moves"]
+                    )
 
             committed_records = []
             for record in incoming_records:
@@ -950,9 +1782,12 @@ class Save:
                     committed_records.append(dict(mapped))
 
             committed_records.sort(key=self._subject_sort_key)
+            span.add(copies=len(copied_paths), renames=len(rename_plan["moves"]))
+            span.set(outcome="committed")
             return committed_records
         except Exception as exc:
             self.logger.warning("rename_failed subject=%s error=%s", subject_key, exc)
+            span.set(outcome="rolled_back")
 
             for copied_path in copied_paths:
                 try:
@@ -973,6 +1808,24 @@ class Save:
 
             return []
 
+    def _json_ready_records(self, subject_key, records):
+        payload = self._prepare_for_json(
+            {subject_key: [dict(record) for record in records]}
+        )
+        return payload[subject_key]
+
+    def _journal_subject_records(self, subject_key, records):
+        journal = getattr(self, "manifest_journal", None)
+        if journal is None:
+            return
+        journal.append(subject_key, self._json_ready_records(subject_key, records))
+
+    def _persist_subject_records(self, subject_key, records):
+        store = getattr(self, "manifest_store", None)
+        if store is None:
+            return
+        store.upsert_subject(subject_key, self._json_ready_records(subject_key, records))
+
     def _plan_subject_renames(self, subject_id, study, old_records, new_records):
         old_by_key = {
             self._record_identity_key(record): record
@@ -1242,46 +2095,98 @@ class Save:
         Args:
             csv_path (str): Absolute path to the CSV that was just copied or confirmed.
         """
-        session_dir = os.path.dirname(csv_path)
-        subject_accel_dir = os.path.dirname(session_dir)
+        self._reconcile_subject_links(os.path.dirname(os.path.dirname(csv_path)))
+
+    def _desired_subject_links(self, subject_accel_dir):
+        desired = {}
+        pending = [(subject_accel_dir, "")]
+        while pending:
+            directory, rel_dir = pending.pop()
+            with os.scandir(directory) as iterator:
+                for entry in iterator:
+                    rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if not rel_dir and entry.name == "all":
+                            continue
+                        pending.append((entry.path, rel_path))
+                    elif entry.name.lower().endswith(".csv"):
+                        desired[rel_path] = entry.path
+        return desired
+
+    def _existing_subject_links(self, all_dir):
+        existing = {}
+        stale_dirs = []
+        pending = [(all_dir, "")]
+        while pending:
+            directory, rel_dir = pending.pop()
+            stale_dirs.append(directory)
+            with os.scandir(directory) as iterator:
+                for entry in iterator:
+                    rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, rel_path))
+                    else:
+                        existing[rel_path] = entry
+        return existing, stale_dirs
+
+    def _subject_link_is_current(self, entry, source_path):
+        if entry.is_symlink():
+            try:
+                return os.readlink(entry.path) == source_path
+            except OSError:
+                return False
+        # Copy fallback on filesystems without symlinks: current if unchanged.
+        try:
+            link_stat = entry.stat(follow_symlinks=False)
+            source_stat = os.stat(source_path)
+        except OSError:
+            return False
+        return (
+            link_stat.st_size == source_stat.st_size
+            and link_stat.st_mtime_ns == source_stat.st_mtime_ns
+        )
 
-        if not os.path.isdir(subject_accel_dir):
-            return
+    def _reconcile_subject_links(self, subject_accel_dir):
+        """
+        Bring sub-*/accel/all in line with the CSVs under the subject's accel tree.
 
-        csv_records = []
-        for root, dirs, files in os.walk(subject_accel_dir):
-            dirs[:] = [d for d in dirs if d != "all"]
+        Only entries that are missing, stale (wrong target, or a changed copy
+        when symlinks are unsupported) or orphaned are touched; an up-to-date
+        link farm costs one directory scan per side.
 
-            for name in files:
-                if not name.lower().endswith(".csv"):
-                    continue
-                full_path = os.path.join(root, name)
-                rel_path = os.path.relpath(full_path, subject_accel_dir)
-                csv_records.append((full_path, rel_path))
+        Returns:
+            dict: {"created", "removed", "unchanged"} counts
+        """
+        counts = {"created": 0, "removed": 0, "unchanged": 0}
+        if not os.path.isdir(subject_accel_dir):
+            return counts
 
+        desired = self._desired_subject_links(subject_accel_dir)
         all_dir = os.path.join(subject_accel_dir, "all")
-        if os.path.exists(all_dir):
-            shutil.rmtree(all_dir)
-
+        if os.path.islink(all_dir) or (os.path.lexists(all_dir) and not os.path.isdir(all_dir)):
+            os.unlink(all_dir)
         os.makedirs(all_dir, exist_ok=True)
 
+        existing, existing_dirs = self._existing_subject_links(all_dir)
+        for rel_path, entry in existing.items():
+            source_path = desired.get(rel_path)
+            if source_path is not None and self._subject_link_is_current(entry, source_path):
+                counts["unchanged"] += 1
+                desired.pop(rel_path)
+                continue
+            os.unlink(entry.path)
+            counts["removed"] += 1
+
         use_symlinks = True
-        for src, rel_path in csv_records:
-            rel_dir = os.path.dirname(rel_path)
-            target_dir = (
-                all_dir if rel_dir in ("", ".") else os.path.join(all_dir, rel_dir)
-            )
-            os.makedirs(target_dir, exist_ok=True)
-            link_path = os.path.join(target_dir, os.path.basename(rel_path))
+        for rel_path, src in sorted(desired.items()):
+            link_path = os.path.join(all_dir, rel_path)
+            os.makedirs(os.path.dirname(link_path), exist_ok=True)
+            counts["created"] += 1
 
             if use_symlinks:
                 try:
                     os.symlink(src, link_path)
                     continue
-                except FileExistsError:
-                    os.unlink(link_path)
-                    os.symlink(src, link_path)
-                    continue
                 except OSError as exc:
                     if exc.errno not in (errno.EOPNOTSUPP, errno.EPERM, errno.EACCES):
                         raise
@@ -1291,10 +2196,25 @@ class Save:
                         subject_accel_dir,
                     )
 
-            if os.path.exists(link_path):
-                os.unlink(link_path)
             shutil.copy2(src, link_path)
 
+        # Drop sub-directories of accel/all left empty by removals, deepest first.
+        for directory in sorted(existing_dirs[1:], key=len, reverse=True):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass
+
+        if counts["created"] or counts["removed"]:
+            self.logger.info(
+                "symlink_reconcile dir=%s created=%s removed=%s unchanged=%s",
+                subject_accel_dir,
+                counts["created"],
+                counts["removed"],
+                counts["unchanged"],
+            )
+        return counts
+
     def _determine_run(self, matches):
         """
         Adds a 'run' key to the matches dictionary based on the chronological order of entries for each boost_id.